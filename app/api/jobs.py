@@ -1,28 +1,146 @@
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime, timezone
+from typing import List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import get_db
-from app.schemas.job import JobCreate, JobUpdate, JobResponse
+from app.schemas.cache import CacheStats
+from app.schemas.job import (
+    ExportTask,
+    JobBulkRequest,
+    JobBulkResponse,
+    JobChanges,
+    JobCreate,
+    JobFacets,
+    JobFilters,
+    JobPage,
+    JobStats,
+    JobUpdate,
+    Suggestion,
+    JobResponse,
+)
 from app.services.job_service import (
+    bulk_write,
     create_job,
-    get_jobs,
+    get_jobs_json,
+    get_jobs_page_json,
+    get_jobs_version,
     get_job,
-    get_saved_jobs,
+    get_job_cache_stats,
+    get_job_stats,
+    get_job_version,
+    get_tech_facets,
+    search_jobs_json,
+    stream_jobs,
+    suggest_values,
     update_job,
     delete_job,
+    get_changes_json,
+)
+from app.services.change_feed import decode_change_token
+from app.services.export_service import (
+    EXPORT_MEDIA_TYPES,
+    export_filename,
+    iter_export,
+    parse_columns,
+)
+from app.services.export_tasks import (
+    ExportQueueFull,
+    export_file,
+    get_export,
+    start_export,
 )
-from app.services.export_service import generate_csv, generate_json
+from app.services.job_stream import job_stream
+from app.utils.etag import etag_matches, make_etag
+from app.utils.export_store import ExportNotFound, ExportRecord
 
 jobs_router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
+DEFAULT_PAGE_SIZE = 50
+
+
+def job_filters(
+    job_status: Optional[List[str]] = Query(
+        None,
+        alias="status",
+        description="Repeatable; matches any of the given statuses",
+    ),
+    work_model: Optional[str] = Query(None),
+    company: Optional[str] = Query(None, description="Exact company name"),
+    date_from: Optional[date] = Query(None, description="date_applied >= (inclusive)"),
+    date_to: Optional[date] = Query(None, description="date_applied <= (inclusive)"),
+    salary_min: Optional[int] = Query(
+        None, ge=0, description="Annualized salary range reaches at least this"
+    ),
+    salary_max: Optional[int] = Query(
+        None, ge=0, description="Annualized salary range starts at or below this"
+    ),
+    tech: Optional[List[str]] = Query(
+        None, description="Repeatable; jobs whose tech_stack includes these"
+    ),
+    tech_match: Literal["any", "all"] = Query(
+        "any", description="Whether a job needs any or all of the tech values"
+    ),
+) -> JobFilters:
+    return JobFilters(
+        status=job_status,
+        work_model=work_model,
+        company=company,
+        date_from=date_from,
+        date_to=date_to,
+        tech=tech,
+        tech_match=tech_match,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+
+
+def _query_shape(request: Request) -> str:
+    """Canonical query string, so each filter/page/format combination gets its own ETag."""
+    return "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
 
-@jobs_router.get("/", response_model=List[JobResponse])
-async def list_jobs(db: AsyncSession = Depends(get_db)):
-    return await get_jobs(db)
+@jobs_router.get("/", response_model=Union[List[JobResponse], JobPage])
+async def list_jobs(
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=500, description="Page size; enables cursor pagination"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from the previous page"
+    ),
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    version = await get_jobs_version(db)
+    etag = make_etag(version, _query_shape(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    # The service serializes rows straight to JSON bytes, bypassing
+    # response_model validation; response_model still documents the shape.
+    # Without limit/cursor keep returning the full list for existing clients.
+    if limit is None and cursor is None:
+        content = await get_jobs_json(db, filters, version=version)
+    else:
+        try:
+            content = await get_jobs_page_json(
+                db, limit or DEFAULT_PAGE_SIZE, cursor, filters, version=version
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            )
+    return Response(
+        content=content, media_type="application/json", headers={"ETag": etag}
+    )
 
 
 @jobs_router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -31,35 +149,277 @@ async def create_job_endpoint(job: JobCreate, db: AsyncSession = Depends(get_db)
     return {"id": created_job.id}
 
 
-@jobs_router.get("/export")
-async def export_jobs(
-    format: Optional[str] = Query(None, description="Export format: csv or json"),
+@jobs_router.post("/bulk", response_model=JobBulkResponse)
+async def bulk_jobs_endpoint(request: JobBulkRequest, db: AsyncSession = Depends(get_db)):
+    total = len(request.create) + len(request.update) + len(request.delete)
+    if total > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bulk request may contain at most {settings.BULK_MAX_ITEMS} items.",
+        )
+    return await bulk_write(db, request)
+
+
+@jobs_router.get("/search", response_model=JobPage)
+async def search_jobs(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Words to find in title, company or notes"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    cursor: Optional[str] = Query(
+        None, description="Opaque next_cursor from the previous page"
+    ),
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    """Full-text search, best match first. Accepts the same filters as GET /api/jobs."""
+    etag = make_etag(await get_jobs_version(db), _query_shape(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    try:
+        content = await search_jobs_json(db, q, limit, cursor, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return Response(
+        content=content, media_type="application/json", headers={"ETag": etag}
+    )
+
+
+@jobs_router.get("/facets", response_model=JobFacets)
+async def job_facets(
+    request: Request,
+    response: Response,
+    limit: int = Query(20, ge=1, le=200, description="Number of technologies to return"),
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    """Job counts per technology, most used first, over the jobs matching filters."""
+    version = await get_jobs_version(db)
+    etag = make_etag(version, _query_shape(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    return await get_tech_facets(db, limit, filters, version=version)
+
+
+@jobs_router.get("/changes", response_model=JobChanges)
+async def job_changes(
+    since: Optional[str] = Query(
+        None, description="next_token from the previous call; omit for a full sync"
+    ),
+    limit: int = Query(500, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
 ):
-    if not format or format not in ("csv", "json"):
+    """Jobs created, updated or deleted since the token, for incremental sync."""
+    try:
+        content = await get_changes_json(db, since, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return Response(content=content, media_type="application/json")
+
+
+@jobs_router.get("/stream")
+async def job_events(
+    since: Optional[str] = Query(
+        None, description="Changes feed token to start after, e.g. a next_token"
+    ),
+    last_event_id: Optional[str] = Header(
+        None, description="Sent by EventSource when it reconnects; wins over since"
+    ),
+):
+    """Server-Sent Events for job writes: job-created, job-updated and job-deleted."""
+    token = last_event_id or since
+    try:
+        position = decode_change_token(token) if token else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return StreamingResponse(
+        job_stream.events(position),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@jobs_router.get("/stats", response_model=JobStats)
+async def job_stats(
+    request: Request,
+    response: Response,
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    """Dashboard counts by status, work model and week applied, computed in SQL."""
+    version = await get_jobs_version(db)
+    etag = make_etag(version, _query_shape(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    return await get_job_stats(db, filters, version=version)
+
+
+@jobs_router.get("/suggest", response_model=List[Suggestion])
+async def suggest(
+    field: Literal["company", "title"] = Query(..., description="Field to complete"),
+    prefix: str = Query("", max_length=200, description="Case-insensitive value prefix"),
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+):
+    """Type-ahead for company and title inputs, served from an in-memory index."""
+    return await suggest_values(db, field, prefix, limit)
+
+
+def _export_columns(format: Optional[str], columns: Optional[str], filters: JobFilters) -> List[str]:
+    """Validate export parameters; returns the selected columns."""
+    if not format or format not in EXPORT_MEDIA_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Format is required and must be 'csv' or 'json'.",
+            detail="Format is required and must be 'csv', 'json' or 'ndjson'.",
         )
-    jobs = await get_saved_jobs(db)
-    today = date.today().isoformat()
-    filename = f"saved-jobs-{today}.{format}"
-    if format == "csv":
-        content = generate_csv(jobs)
-        media_type = "text/csv; charset=utf-8"
-    else:
-        content = generate_json(jobs)
-        media_type = "application/json"
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    try:
+        selected = parse_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not filters.status:
+        # Without an explicit status the export keeps its original "Saved" scope
+        filters.status = ["Saved"]
+    return selected
+
+
+def _export_task(record: ExportRecord) -> ExportTask:
+    return ExportTask(
+        id=record.id,
+        status=record.status,
+        format=record.format,
+        created_at=datetime.fromtimestamp(record.created_at, timezone.utc),
+        finished_at=(
+            datetime.fromtimestamp(record.finished_at, timezone.utc)
+            if record.finished_at is not None
+            else None
+        ),
+        rows=record.rows,
+        size=record.size,
+        error=record.error,
+        download_url=(
+            f"{jobs_router.prefix}/exports/{record.id}/download"
+            if record.status == "done"
+            else None
+        ),
     )
 
 
+async def _load_export_or_404(export_id: str) -> ExportRecord:
+    try:
+        return await get_export(export_id)
+    except ExportNotFound:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+
+
+@jobs_router.post(
+    "/exports", response_model=ExportTask, status_code=status.HTTP_202_ACCEPTED
+)
+async def create_export_endpoint(
+    response: Response,
+    format: Optional[str] = Query(
+        None, description="Export format: csv, json or ndjson"
+    ),
+    columns: Optional[str] = Query(
+        None, description="Comma-separated columns to include (default: all)"
+    ),
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    """Start a background export (same parameters as GET /export) and return its status.
+
+    An identical request made while no job has changed returns the same export.
+    """
+    selected = _export_columns(format, columns, filters)
+    try:
+        record = await start_export(db, format, selected, filters)
+    except ExportQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many exports in progress; try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+    response.headers["Location"] = f"{jobs_router.prefix}/exports/{record.id}"
+    if record.status == "done":
+        response.status_code = status.HTTP_200_OK
+    return _export_task(record)
+
+
+@jobs_router.get("/exports/{export_id}", response_model=ExportTask)
+async def get_export_endpoint(export_id: str):
+    return _export_task(await _load_export_or_404(export_id))
+
+
+@jobs_router.get("/exports/{export_id}/download")
+async def download_export(export_id: str):
+    record = await _load_export_or_404(export_id)
+    if record.status != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Export is {record.status}"
+        )
+    path = export_file(record)
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    return FileResponse(
+        path, media_type=EXPORT_MEDIA_TYPES[record.format], filename=record.filename
+    )
+
+
+@jobs_router.get("/export")
+async def export_jobs(
+    request: Request,
+    format: Optional[str] = Query(
+        None, description="Export format: csv, json or ndjson"
+    ),
+    columns: Optional[str] = Query(
+        None, description="Comma-separated columns to include (default: all)"
+    ),
+    filters: JobFilters = Depends(job_filters),
+    db: AsyncSession = Depends(get_db),
+):
+    selected = _export_columns(format, columns, filters)
+
+    etag = make_etag(await get_jobs_version(db), _query_shape(request))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+
+    filename = export_filename(format, filters)
+    return StreamingResponse(
+        iter_export(format, stream_jobs(db, selected, filters), selected),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "ETag": etag,
+        },
+    )
+
+
+@jobs_router.get("/cache/stats", response_model=CacheStats)
+async def job_cache_stats():
+    return get_job_cache_stats()
+
+
 @jobs_router.get("/{job_id}", response_model=JobResponse)
-async def get_job_endpoint(job_id: int, db: AsyncSession = Depends(get_db)):
-    job = await get_job(db, job_id)
+async def get_job_endpoint(
+    job_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    version = await get_job_version(db, job_id)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    etag = make_etag(version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+
+    # Keyed on the version so the body always matches the ETag sent with it
+    job = await get_job(db, job_id, version=version)
     if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
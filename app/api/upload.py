@@ -1,12 +1,62 @@
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from http import HTTPStatus
 
-from app.utils.file_upload import get_upload_path, save_upload_file
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_db
+from app.schemas.upload import UploadSessionCreate, UploadSessionResponse
+from app.services.upload_service import (
+    cancel_upload_session,
+    create_upload_session,
+    finalize_upload_session,
+    get_upload_session,
+    store_upload,
+)
+from app.utils.file_upload import SavedUpload, UploadTooLargeError, get_upload_path
+from app.utils.upload_sessions import (
+    UploadSession,
+    UploadSessionError,
+    UploadSessionNotFound,
+    parse_content_range,
+    write_chunk,
+)
 
 upload_router = APIRouter(prefix="/api", tags=["upload"])
 
 
+def _upload_response(saved: SavedUpload) -> dict:
+    return {
+        "url": f"/uploads/{saved.filename}",
+        "size": saved.size,
+        "sha256": saved.sha256,
+        "deduplicated": saved.deduplicated,
+    }
+
+
+def _session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        id=session.id,
+        filename=session.filename,
+        size=session.size,
+        offset=session.offset,
+        received=list(session.received),
+        complete=session.complete,
+    )
+
+
+async def _load_session_or_404(session_id: str) -> UploadSession:
+    try:
+        return await get_upload_session(session_id)
+    except UploadSessionNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found",
+        )
+
+
 @upload_router.post("/upload", response_model=dict)
-async def upload_file(file: UploadFile = File(...)):
+async def upload_file(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
     if file.size == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -14,11 +64,75 @@ async def upload_file(file: UploadFile = File(...)):
         )
 
     try:
-        upload_dir = get_upload_path()
-        filename = save_upload_file(file, str(upload_dir))
-        return {"url": f"/uploads/{filename}"}
+        saved = await store_upload(db, file, max_size=settings.UPLOAD_MAX_BYTES)
+        return _upload_response(saved)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload file: {str(e)}",
         )
+
+
+@upload_router.post(
+    "/upload/sessions",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_upload_session_endpoint(request: UploadSessionCreate):
+    """Start a resumable upload of `size` bytes."""
+    if request.size > settings.RESUMABLE_UPLOAD_MAX_BYTES:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=str(UploadTooLargeError(settings.RESUMABLE_UPLOAD_MAX_BYTES)),
+        )
+    session = await create_upload_session(request.filename, request.size)
+    return _session_response(session)
+
+
+@upload_router.get("/upload/sessions/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session_endpoint(session_id: str):
+    """Report which byte ranges have been received."""
+    return _session_response(await _load_session_or_404(session_id))
+
+
+@upload_router.put("/upload/sessions/{session_id}", response_model=UploadSessionResponse)
+async def put_upload_chunk(session_id: str, request: Request):
+    """Store the request body as the byte range named by its Content-Range header.
+
+    Ranges may arrive in any order, in parallel, and be retried.
+    """
+    session = await _load_session_or_404(session_id)
+    try:
+        start, end = parse_content_range(request.headers.get("content-range"), session.size)
+        await write_chunk(get_upload_path(), session, start, end, request.stream())
+    except UploadSessionError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return _session_response(await _load_session_or_404(session_id))
+
+
+@upload_router.post("/upload/sessions/{session_id}/complete", response_model=dict)
+async def complete_upload_session(session_id: str, db: AsyncSession = Depends(get_db)):
+    """Assemble a fully received session into UPLOAD_DIR."""
+    try:
+        saved = await finalize_upload_session(db, session_id)
+    except UploadSessionNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Upload session not found",
+        )
+    except UploadSessionError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return _upload_response(saved)
+
+
+@upload_router.delete(
+    "/upload/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT
+)
+async def cancel_upload_session_endpoint(session_id: str):
+    await _load_session_or_404(session_id)
+    await cancel_upload_session(session_id)
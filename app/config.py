@@ -11,6 +11,77 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = Field(default=None, validation_alias="DATABASE_URL")
     DB_PATH: str = Field(default="jobs.db", validation_alias="DB_PATH")
     UPLOAD_DIR: str = Field(default="uploads", validation_alias="UPLOAD_DIR")
+    UPLOAD_MAX_BYTES: int = Field(
+        default=25 * 1024 * 1024, validation_alias="UPLOAD_MAX_BYTES"
+    )
+    RESUMABLE_UPLOAD_MAX_BYTES: int = Field(
+        default=1024 * 1024 * 1024, validation_alias="RESUMABLE_UPLOAD_MAX_BYTES"
+    )
+    UPLOAD_CONTENT_ADDRESSED: bool = Field(
+        default=False, validation_alias="UPLOAD_CONTENT_ADDRESSED"
+    )
+    UPLOAD_GC_GRACE_SECONDS: float = Field(
+        default=24 * 60 * 60, validation_alias="UPLOAD_GC_GRACE_SECONDS"
+    )
+    # 0 disables the in-process sweeper; scripts/gc_uploads.py still works
+    UPLOAD_GC_INTERVAL_SECONDS: float = Field(
+        default=0, validation_alias="UPLOAD_GC_INTERVAL_SECONDS"
+    )
+    COMPRESSION_MINIMUM_SIZE: int = Field(
+        default=1024, validation_alias="COMPRESSION_MINIMUM_SIZE"
+    )
+    # Maximum creates + updates + deletes accepted by one /api/jobs/bulk call
+    BULK_MAX_ITEMS: int = Field(default=1000, validation_alias="BULK_MAX_ITEMS")
+    # 0 for any of these disables the in-process job cache
+    JOB_CACHE_MAX_ENTRIES: int = Field(
+        default=1024, validation_alias="JOB_CACHE_MAX_ENTRIES"
+    )
+    # Budget for cached response bodies; a full-list body over it isn't cached
+    JOB_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024, validation_alias="JOB_CACHE_MAX_BYTES"
+    )
+    JOB_CACHE_TTL_SECONDS: float = Field(
+        default=30.0, validation_alias="JOB_CACHE_TTL_SECONDS"
+    )
+    # Directory for the Unix-socket bus that broadcasts job changes between
+    # worker processes; set it when running more than one uvicorn worker.
+    INVALIDATION_BUS_DIR: Optional[str] = Field(
+        default=None, validation_alias="INVALIDATION_BUS_DIR"
+    )
+    # Autocomplete indexes are rebuilt from the database in the background once
+    # this old, which bounds drift from writes the change bus didn't deliver
+    SUGGEST_REFRESH_SECONDS: float = Field(
+        default=300.0, validation_alias="SUGGEST_REFRESH_SECONDS"
+    )
+
+    # Frames buffered per /api/jobs/stream client; one that falls further
+    # behind is disconnected and catches up by reconnecting with Last-Event-ID
+    STREAM_QUEUE_SIZE: int = Field(default=256, validation_alias="STREAM_QUEUE_SIZE")
+    # Idle streams get a comment frame this often so proxies keep them open;
+    # it is also how often each worker checks for changes the bus missed
+    STREAM_HEARTBEAT_SECONDS: float = Field(
+        default=15.0, validation_alias="STREAM_HEARTBEAT_SECONDS"
+    )
+
+    # Background exports (POST /api/jobs/exports) generated at once per worker
+    # process, and how many more may wait; beyond that new ones get a 503
+    EXPORT_MAX_WORKERS: int = Field(default=2, validation_alias="EXPORT_MAX_WORKERS")
+    EXPORT_MAX_PENDING: int = Field(default=16, validation_alias="EXPORT_MAX_PENDING")
+    # Finished export files are removed once this old
+    EXPORT_TTL_SECONDS: float = Field(
+        default=24 * 60 * 60, validation_alias="EXPORT_TTL_SECONDS"
+    )
+    # Unfinished exports touch their state file this often; one that misses
+    # a few beats lost its worker and is started over by the next request
+    EXPORT_HEARTBEAT_SECONDS: float = Field(
+        default=10.0, validation_alias="EXPORT_HEARTBEAT_SECONDS"
+    )
+
+    # Processes that format large export chunks (CSV/JSON) off the event
+    # loop, per worker; 0 formats everything inline
+    EXPORT_FORMAT_PROCESSES: int = Field(
+        default=2, validation_alias="EXPORT_FORMAT_PROCESSES"
+    )
 
     @property
     def database_url(self) -> str:
@@ -1,6 +1,7 @@
 import json
-from typing import Any, Dict, AsyncGenerator
+from typing import Any, Dict, AsyncGenerator, Iterable, List, Set
 
+from sqlalchemy import Table, event, inspect, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -24,10 +25,23 @@ def _get_create_engine_kwargs(url: str) -> Dict[str, Any]:
     return kwargs
 
 
+def enable_foreign_keys(engine: AsyncEngine) -> None:
+    """Turn on SQLite's per-connection foreign key enforcement (and ON DELETE CASCADE)."""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 async_engine: AsyncEngine = create_async_engine(
     settings.database_url,
     **_get_create_engine_kwargs(settings.database_url),
 )
+enable_foreign_keys(async_engine)
 
 async_session_maker = async_sessionmaker(
     bind=async_engine,
@@ -45,7 +59,112 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    from app.models import job  # noqa: F401
+    from app.models import job, upload  # noqa: F401
+    from app.services.change_feed import ensure_change_counter
+    from app.services.derived_fields import DERIVED_COLUMNS, backfill_derived
+    from app.services.search_index import create_search_index
+    from app.services.tech_index import rebuild_tech_index
+    from app.services.upload_refs import rebuild_refs
+
+    # Side indexes derived from jobs, filled once when their table is new
+    backfills = {
+        upload.UploadRef.__tablename__: rebuild_refs,
+        job.JobTech.__tablename__: rebuild_tech_index,
+    }
 
     async with async_engine.begin() as conn:
+        # Before the snapshot below, so dropped side tables count as new
+        await conn.run_sync(
+            _drop_tables_missing_foreign_keys,
+            [job.Base.metadata.tables[name] for name in backfills],
+        )
+        existing = await conn.run_sync(
+            lambda sync_conn: set(inspect(sync_conn).get_table_names())
+        )
         await conn.run_sync(job.Base.metadata.create_all)
+        # create_all skips tables that already exist, including their new
+        # columns and indexes
+        added = await conn.run_sync(_add_missing_columns, job.Base.metadata)
+        await conn.run_sync(_drop_retired_columns)
+        await conn.run_sync(_create_missing_indexes, job.Base.metadata)
+        for table_name, backfill in backfills.items():
+            if table_name not in existing:
+                await conn.run_sync(backfill)
+        if not set(DERIVED_COLUMNS).isdisjoint(added.get(job.Job.__tablename__, ())):
+            await conn.run_sync(backfill_derived)
+        await conn.run_sync(ensure_change_counter)
+        await conn.run_sync(create_search_index)
+
+
+def _add_missing_columns(sync_conn, metadata) -> Dict[str, List[str]]:
+    """Add model columns missing from existing tables; returns them by table.
+
+    Only suits columns that are nullable or have a server default, which is
+    what new columns on existing tables are kept to.
+    """
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    added: Dict[str, List[str]] = {}
+    for table in metadata.sorted_tables:
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} "
+                f"{column.type.compile(dialect=sync_conn.dialect)}"
+            )
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            sync_conn.execute(text(ddl))
+            added.setdefault(table.name, []).append(column.name)
+    return added
+
+
+def _drop_tables_missing_foreign_keys(sync_conn, tables: Iterable[Table]) -> Set[str]:
+    """Drop existing tables created before their model's foreign keys; returns their names.
+
+    Only for side tables rebuilt from jobs: SQLite can't add a constraint to
+    an existing table, so they are recreated and backfilled instead.
+    """
+    inspector = inspect(sync_conn)
+    dropped = set()
+    for table in tables:
+        if not table.foreign_keys or not inspector.has_table(table.name):
+            continue
+        if inspector.get_foreign_keys(table.name):
+            continue
+        table.drop(sync_conn)
+        dropped.add(table.name)
+    return dropped
+
+
+# Columns models no longer declare, dropped from existing tables; any left
+# behind NOT NULL would fail inserts that no longer set them
+_RETIRED_COLUMNS = {"upload_blobs": ("ref_count",)}
+
+
+def _drop_retired_columns(sync_conn) -> None:
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    for table_name, columns in _RETIRED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        present = {column["name"] for column in inspector.get_columns(table_name)}
+        for name in columns:
+            if name in present:
+                sync_conn.execute(
+                    text(
+                        f"ALTER TABLE {preparer.quote(table_name)} "
+                        f"DROP COLUMN {preparer.quote(name)}"
+                    )
+                )
+
+
+def _create_missing_indexes(sync_conn, metadata) -> None:
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
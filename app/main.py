@@ -1,22 +1,47 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
 from app.api import jobs, upload
 from app.config import settings
 from app.database import init_db
+from app.services.events import UnixSocketTransport, change_bus
+from app.services.export_service import shutdown_format_pool
+from app.services.upload_gc import run_upload_gc
+from app.utils.compression import CompressionMiddleware
+from app.utils.file_upload import get_upload_path
+from app.utils.upload_files import UploadFiles
+from app.utils.upload_limit import UploadSizeLimitMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
-    yield
+    if settings.INVALIDATION_BUS_DIR:
+        await change_bus.start(UnixSocketTransport(settings.INVALIDATION_BUS_DIR))
+    upload_gc = None
+    if settings.UPLOAD_GC_INTERVAL_SECONDS > 0:
+        upload_gc = asyncio.create_task(run_upload_gc(settings.UPLOAD_GC_INTERVAL_SECONDS))
+    try:
+        yield
+    finally:
+        if upload_gc is not None:
+            upload_gc.cancel()
+        await change_bus.stop()
+        shutdown_format_pool()
 
 
 app = FastAPI(title="Job Tracking API", lifespan=lifespan)
 
+# Innermost, so its 413s still get CORS headers
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    path="/api/upload",
+    max_size=lambda: settings.UPLOAD_MAX_BYTES,
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -25,11 +50,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE
+)
+
 app.include_router(jobs.jobs_router)
 app.include_router(upload.upload_router)
 
 app.mount(
     "/uploads",
-    StaticFiles(directory=settings.UPLOAD_DIR),
+    UploadFiles(directory=get_upload_path()),
     name="uploads",
 )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Integer, String, Text
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
@@ -10,6 +10,24 @@ Base = declarative_base()
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Backs keyset pagination on (date_applied, id)
+        Index("ix_jobs_date_applied_id", "date_applied", "id"),
+        # Equality filter + date order/range for list and export queries
+        Index("ix_jobs_status_date_applied", "status", "date_applied", "id"),
+        Index("ix_jobs_work_model_date_applied", "work_model", "date_applied"),
+        Index("ix_jobs_company_date_applied", "company", "date_applied"),
+        # Range filters on the typed columns derived from date_applied/salary_range
+        Index("ix_jobs_applied_on", "applied_on"),
+        Index("ix_jobs_salary_min", "salary_min"),
+        Index("ix_jobs_salary_max", "salary_max"),
+        # Changes feed: jobs written after a (change_seq, id) position
+        Index("ix_jobs_change_seq_id", "change_seq", "id"),
+        # Containment (@>) and any-of (?|) tech filters; SQLite uses job_tech
+        Index("ix_jobs_tech_stack", "tech_stack", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False)
@@ -26,5 +44,50 @@ class Job(Base):
     resume_url = Column(String, nullable=True)
     cover_letter_url = Column(String, nullable=True)
     attachments = Column(JSONB, nullable=True)
+    # Derived on write from date_applied / salary_range + salary_frequency (see
+    # app.services.derived_fields); salaries are annualized. NULL if unparseable.
+    applied_on = Column(Date, nullable=True)
+    salary_min = Column(Integer, nullable=True)
+    salary_max = Column(Integer, nullable=True)
+    # Value of job_change_counter when this job was last written (0: before
+    # the changes feed existed)
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class JobTech(Base):
+    """One technology of one job: the inverted index behind tech filters and facets.
+
+    Maintained by the job service write paths; rows go with their job on delete.
+    """
+
+    __tablename__ = "job_tech"
+    __table_args__ = (Index("ix_job_tech_job_id", "job_id"),)
+
+    tech = Column(String, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+
+class JobTombstone(Base):
+    """A deleted job, so the changes feed can report deletes."""
+
+    __tablename__ = "job_tombstones"
+
+    # The primary key doubles as the feed's (change_seq, id) index
+    change_seq = Column(Integer, primary_key=True)
+    job_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobChangeCounter(Base):
+    """Single-row counter that numbers job write transactions.
+
+    Bumping it row-locks until commit, so sequence numbers become visible in
+    order and a client that has seen N never misses a later commit below N.
+    """
+
+    __tablename__ = "job_change_counter"
+
+    id = Column(Integer, primary_key=True)
+    value = Column(Integer, nullable=False)
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.models.job import Base
+
+
+class UploadBlob(Base):
+    """Manifest entry for a content-addressed upload, one row per distinct file.
+
+    A hash -> path index used to deduplicate uploads. Which jobs use a file
+    is tracked by upload_refs, not here.
+    """
+
+    __tablename__ = "upload_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    # Path relative to UPLOAD_DIR, e.g. "9f/86/9f86d0...pdf"
+    path = Column(String, nullable=False, unique=True)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped by every upload that resolves to this file; the upload GC keeps
+    # entries re-uploaded within its grace period
+    last_uploaded_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UploadRef(Base):
+    """One upload referenced by one job field; maintained by the job write paths.
+
+    Rows go with their job on delete (ON DELETE CASCADE). Lets the upload garbage collector check whether a file is still in use with
+    an index lookup instead of scanning every job.
+    """
+
+    __tablename__ = "upload_refs"
+    __table_args__ = (Index("ix_upload_refs_path", "path"),)
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    # screenshot_url, resume_url, cover_letter_url or attachments
+    field = Column(String, primary_key=True)
+    # Path relative to UPLOAD_DIR
+    path = Column(String, primary_key=True)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+    bytes: int = 0
+    max_entries: int = 0
+    max_bytes: int = 0
+    ttl_seconds: float = 0
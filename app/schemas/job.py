@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional, List, Any
+from datetime import date, datetime
+from typing import Optional, List, Any, Literal
 
 from pydantic import BaseModel, ConfigDict
 
@@ -55,3 +55,95 @@ class JobResponse(JobBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class JobPage(BaseModel):
+    items: List[JobResponse]
+    next_cursor: Optional[str] = None
+
+
+class JobFilters(BaseModel):
+    status: Optional[List[str]] = None
+    work_model: Optional[str] = None
+    company: Optional[str] = None
+    date_from: Optional[date] = None  # inclusive
+    date_to: Optional[date] = None  # inclusive
+    # Annualized; a job matches when its salary range overlaps [salary_min, salary_max]
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    tech: Optional[List[str]] = None
+    tech_match: Literal["any", "all"] = "any"  # how multiple tech values combine
+
+
+class JobBulkUpdate(JobUpdate):
+    id: int
+
+
+class JobBulkRequest(BaseModel):
+    create: List[JobCreate] = []
+    update: List[JobBulkUpdate] = []
+    delete: List[int] = []
+
+
+class BulkItemResult(BaseModel):
+    index: int  # position in the corresponding request array
+    id: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+
+
+class JobBulkResponse(BaseModel):
+    created: List[BulkItemResult] = []
+    updated: List[BulkItemResult] = []
+    deleted: List[BulkItemResult] = []
+
+
+class TechFacet(BaseModel):
+    name: str
+    count: int
+
+
+class JobFacets(BaseModel):
+    tech_stack: List[TechFacet] = []
+
+
+class Suggestion(BaseModel):
+    value: str
+    count: int
+
+
+class StatBucket(BaseModel):
+    key: Optional[str]
+    count: int
+
+
+class JobStats(BaseModel):
+    total: int
+    by_status: List[StatBucket] = []
+    by_work_model: List[StatBucket] = []
+    # key is the Monday (YYYY-MM-DD) of each week with applications, oldest
+    # first; jobs whose date_applied isn't a date count only in total
+    per_week: List[StatBucket] = []
+
+
+class JobChanges(BaseModel):
+    """A page of the changes feed; ids appear in at most one of the lists."""
+
+    upserted: List[JobResponse] = []
+    deleted: List[int] = []
+    # Pass as since= for the next page, or to poll for later changes
+    next_token: str
+    has_more: bool = False
+
+
+class ExportTask(BaseModel):
+    id: str
+    status: Literal["pending", "running", "done", "failed"]
+    format: str
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    rows: Optional[int] = None
+    size: Optional[int] = None  # bytes
+    error: Optional[str] = None
+    # Set once the export is done
+    download_url: Optional[str] = None
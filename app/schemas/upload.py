@@ -0,0 +1,19 @@
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class UploadSessionCreate(BaseModel):
+    filename: Optional[str] = None
+    size: int = Field(gt=0)
+
+
+class UploadSessionResponse(BaseModel):
+    id: str
+    filename: Optional[str] = None
+    size: int
+    # Next byte a serial client should send
+    offset: int
+    # Merged [start, end) byte ranges received so far
+    received: List[Tuple[int, int]] = []
+    complete: bool = False
@@ -0,0 +1,166 @@
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from app.schemas.cache import CacheStats
+
+# Returned by CacheBackend.get when the key is absent or expired
+MISSING = object()
+
+
+class CacheBackend(ABC):
+    """Key/value store used by the job service for read-through caching.
+
+    Keys are hashable tuples. A shared backend (e.g. Redis) can implement this
+    by serializing keys and values; delete_matching maps to a keyspace scan.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None: ...
+
+    @abstractmethod
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every key for which predicate(key) is true; return how many."""
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> CacheStats: ...
+
+
+def _size_of(value: Any) -> int:
+    """Approximate bytes held by a cached value.
+
+    Serialized bodies (bytes/str) are what grow with the job table; other
+    values (single jobs, facets, stats) are small and counted shallowly.
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class LocalCache(CacheBackend):
+    """Per-process LRU cache bounded by entry count and total bytes, with a TTL per entry.
+
+    A value bigger than max_bytes on its own is not cached at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes
+        )
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return MISSING
+            expires_at, _, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        size = _size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self._stats.invalidations += 1
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            doomed = [key for key in self._entries if predicate(key)]
+            for key in doomed:
+                self._remove(key)
+            self._stats.invalidations += len(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return self._stats.model_copy(
+                update={"size": len(self._entries), "bytes": self._bytes}
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop an entry and its bytes; the caller holds the lock."""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class NullCache(CacheBackend):
+    """Backend that stores nothing; used when caching is disabled."""
+
+    def __init__(self) -> None:
+        self._stats = CacheStats()
+
+    def get(self, key: Hashable) -> Any:
+        self._stats.misses += 1
+        return MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def delete(self, key: Hashable) -> None:
+        pass
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> CacheStats:
+        return self._stats.model_copy()
+
+
+def create_cache(max_entries: int, ttl_seconds: float, max_bytes: int) -> CacheBackend:
+    if max_entries <= 0 or ttl_seconds <= 0 or max_bytes <= 0:
+        return NullCache()
+    return LocalCache(max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
@@ -0,0 +1,128 @@
+"""Sequence numbers and tombstones behind the jobs changes feed.
+
+Every job write transaction takes the next value of job_change_counter and
+stamps it on the jobs it creates or updates (jobs.change_seq) and on a
+job_tombstones row per job it deletes. The feed then reads both by
+(change_seq, id), so a sync costs what changed rather than the table size.
+"""
+
+from datetime import datetime
+from typing import Sequence, Tuple
+
+from sqlalchemy import Delete, Select, func, insert, literal, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.models.job import Job, JobChangeCounter, JobTombstone
+from app.services.search_index import dialect_name
+from app.utils.tokens import decode_token, encode_token
+
+_COUNTER_ID = 1
+
+# A feed position: the (change_seq, job id) of the last change seen
+ChangePosition = Tuple[int, int]
+
+
+def encode_change_token(change_seq: int, job_id: int) -> str:
+    """Encode a feed position as the opaque token clients pass back."""
+    return encode_token([change_seq, job_id])
+
+
+def decode_change_token(token: str) -> ChangePosition:
+    try:
+        change_seq, job_id = decode_token(token)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid token") from e
+    if not isinstance(change_seq, int) or not isinstance(job_id, int):
+        raise ValueError("Invalid token")
+    return change_seq, job_id
+
+
+_bump_counter = (
+    update(JobChangeCounter)
+    .where(JobChangeCounter.id == _COUNTER_ID)
+    .values(value=JobChangeCounter.value + 1)
+)
+
+
+async def next_change_seq(db: AsyncSession) -> int:
+    """Claim the next sequence number for this transaction (one statement).
+
+    For batches, whose statements share a number known up front. The counter
+    row stays locked until commit or rollback, which serializes job writes
+    but keeps sequence numbers in commit order.
+    """
+    result = await db.execute(
+        _bump_counter.returning(JobChangeCounter.value).execution_options(
+            synchronize_session=False
+        )
+    )
+    return result.scalar_one()
+
+
+def claim_change_seq(db: AsyncSession) -> ColumnElement:
+    """SQL for a single-statement write to stamp as its sequence number.
+
+    Write it into jobs.change_seq, or return it from a DELETE. On PostgreSQL
+    it carries the counter bump as a CTE, so the claim costs no statement of
+    its own and the counter row is only locked from the write until commit.
+    SQLite has no DML in CTEs, but it runs one write transaction at a time:
+    the write stamps the counter's value plus one, and finish_change_seq
+    bumps the counter as the last statement before commit.
+    """
+    if dialect_name(db) == "postgresql":
+        claim = _bump_counter.returning(JobChangeCounter.value).cte("change_seq")
+        return select(claim.c.value).scalar_subquery()
+    return (
+        select(JobChangeCounter.value + 1)
+        .where(JobChangeCounter.id == _COUNTER_ID)
+        .scalar_subquery()
+    )
+
+
+async def finish_change_seq(db: AsyncSession) -> None:
+    """Run right before committing a write stamped with claim_change_seq."""
+    if dialect_name(db) != "postgresql":
+        await db.execute(_bump_counter.execution_options(synchronize_session=False))
+
+
+async def current_position(db: AsyncSession) -> ChangePosition:
+    """A position after every change committed so far."""
+    result = await db.execute(select(JobChangeCounter.value))
+    # Job ids start at 1, so (n + 1, 0) sorts after every change numbered n or lower
+    return (result.scalar() or 0) + 1, 0
+
+
+async def add_tombstones(db: AsyncSession, job_ids: Sequence[int], change_seq: int) -> None:
+    if job_ids:
+        now = datetime.utcnow()
+        await db.execute(
+            insert(JobTombstone),
+            [{"change_seq": change_seq, "job_id": job_id, "deleted_at": now} for job_id in job_ids],
+        )
+
+
+def with_tombstones(deleted: Delete) -> Select:
+    """Wrap a DELETE FROM jobs ... RETURNING jobs.id, change_seq so it records its tombstones too.
+
+    PostgreSQL only (SQLite has no DML in CTEs): both run as one statement,
+    and selecting from the result yields the DELETE's RETURNING rows.
+    """
+    deleted = deleted.cte("deleted")
+    tombstones = insert(JobTombstone).from_select(
+        ["change_seq", "job_id", "deleted_at"],
+        select(deleted.c.change_seq, deleted.c.id, literal(datetime.utcnow())),
+    )
+    return select(deleted).add_cte(tombstones.cte("tombstones"))
+
+
+def ensure_change_counter(conn: Connection) -> None:
+    """Create the counter row if missing, above every sequence already handed out."""
+    if conn.execute(select(JobChangeCounter.id)).first() is not None:
+        return
+    highest = max(
+        conn.execute(select(func.max(Job.change_seq))).scalar() or 0,
+        conn.execute(select(func.max(JobTombstone.change_seq))).scalar() or 0,
+    )
+    conn.execute(insert(JobChangeCounter).values(id=_COUNTER_ID, value=highest))
@@ -0,0 +1,207 @@
+"""Typed columns derived from free-text job fields.
+
+date_applied and salary_range are strings as entered. applied_on (a Date) and
+salary_min/salary_max (whole currency units per year, annualized using
+salary_frequency) are parsed from them on every write, so date and salary
+filters are plain range scans on indexed columns. Values that don't parse
+leave the derived columns NULL.
+"""
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.models.job import Job
+
+SALARY_SOURCES = ("salary_range", "salary_frequency")
+DERIVED_COLUMNS = ("applied_on", "salary_min", "salary_max")
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d/%Y")
+
+# Pay periods per year for each salary_frequency (case-insensitive)
+_PERIODS_PER_YEAR = {
+    "yearly": 1,
+    "annual": 1,
+    "annually": 1,
+    "monthly": 12,
+    "biweekly": 26,
+    "weekly": 52,
+    "daily": 260,
+    "hourly": 2080,
+}
+
+# 100000, 100,000, 1.5, 120k, 1.2M
+_AMOUNT = re.compile(r"(\d+(?:,\d{3})*(?:\.\d+)?)\s*([km])?\b", re.IGNORECASE)
+_MULTIPLIERS = {None: 1, "k": 1_000, "m": 1_000_000}
+# Text between the two bounds of a range: "-", "–", "—" or "to", with
+# currency marks around it ("$100k - $150k", "100k USD to 150k USD")
+_RANGE_SEPARATOR = re.compile(
+    r"\s*(?:[a-z]{3}\s*)?(?:-|–|—|to)\s*(?:[a-z]{0,3}[^\w\s]{0,2})?\s*", re.IGNORECASE
+)
+
+# Annualized amounts above this are typos or misread text rather than
+# salaries; leaving them NULL also keeps them inside 32-bit INTEGER columns.
+MAX_ANNUAL_SALARY = 1_000_000_000
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def parse_applied_on(value: Any) -> Optional[date]:
+    """The date in a date_applied string (ISO, optionally with a time; Y/M/D; M/D/Y)."""
+    if not isinstance(value, str):
+        return None
+    text = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text[:10] if fmt == "%Y-%m-%d" else text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_salary(
+    salary_range: Any, salary_frequency: Any = None
+) -> Tuple[Optional[int], Optional[int]]:
+    """Annualized (min, max) from text like "$100k-$150k" or "45 - 60"; (None, None) if unparseable.
+
+    A suffix on the upper bound carries over to a bare lower bound ("100-150k").
+    A single amount gives min == max, and so does text after it that isn't a
+    range ("$120,000 + 10% bonus"). Results above MAX_ANNUAL_SALARY are None.
+    """
+    if not isinstance(salary_range, str):
+        return None, None
+    periods = _PERIODS_PER_YEAR.get((salary_frequency or "yearly").strip().lower())
+    amounts = _salary_amounts(salary_range)
+    if periods is None or not amounts:
+        return None, None
+    suffixes = [suffix.lower() or None for _, suffix in amounts]
+    if len(amounts) == 2 and suffixes[0] is None and suffixes[1] is not None:
+        suffixes[0] = suffixes[1]
+    values = [
+        round(float(number.replace(",", "")) * _MULTIPLIERS[suffix] * periods)
+        for (number, _), suffix in zip(amounts, suffixes)
+    ]
+    if max(values) > MAX_ANNUAL_SALARY:
+        return None, None
+    return min(values), max(values)
+
+
+def _salary_amounts(salary_range: str) -> List[Tuple[str, str]]:
+    """The (number, suffix) of the first amount, and of the second if a range separator joins them.
+
+    Percentages ("10% bonus") are not amounts.
+    """
+    matches = [
+        match
+        for match in _AMOUNT.finditer(salary_range)
+        if not salary_range[match.end():].lstrip().startswith("%")
+    ]
+    amounts = [match.groups("") for match in matches[:2]]
+    if len(matches) > 1 and not _RANGE_SEPARATOR.fullmatch(
+        salary_range, matches[0].end(), matches[1].start()
+    ):
+        del amounts[1:]
+    return amounts
+
+
+def derived_values(
+    values: Mapping[str, Any], current: Optional[Mapping[str, Any]] = None
+) -> Dict[str, Any]:
+    """Derived columns to write alongside values.
+
+    Only columns whose sources appear in values are returned. Salary needs both
+    salary_range and salary_frequency: those missing from values are taken from
+    current (the row before the write) and, without it, salary is left out.
+    """
+    derived: Dict[str, Any] = {}
+    if "date_applied" in values:
+        derived["applied_on"] = parse_applied_on(values["date_applied"])
+    if any(field in values for field in SALARY_SOURCES):
+        merged = {**(current or {}), **values}
+        if all(field in merged for field in SALARY_SOURCES):
+            derived["salary_min"], derived["salary_max"] = parse_salary(
+                merged["salary_range"], merged["salary_frequency"]
+            )
+    return derived
+
+
+def salary_expressions(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """salary_min/salary_max as SQL, for an UPDATE that sends one salary source.
+
+    The other source is only in the row, so the statement combines them: a new
+    salary_range is annualized here for every known frequency and the row's
+    salary_frequency picks the result; a new salary_frequency rescales the
+    row's annualized values from its old one. Rescaling is off where old
+    values were rounded or the old frequency didn't parse, so callers check
+    the returned row against derived_values. Empty unless exactly one source
+    is in values.
+    """
+    if ("salary_range" in values) == ("salary_frequency" in values):
+        return {}
+    frequency = func.lower(func.trim(func.coalesce(Job.salary_frequency, "yearly")))
+    if "salary_range" in values:
+        by_frequency = {
+            name: parse_salary(values["salary_range"], name) for name in _PERIODS_PER_YEAR
+        }
+        if all(low is None for low, _ in by_frequency.values()):
+            return {"salary_min": None, "salary_max": None}
+        return {
+            column: case(
+                {name: bounds[position] for name, bounds in by_frequency.items()},
+                value=frequency,
+            )
+            for position, column in enumerate(("salary_min", "salary_max"))
+        }
+    periods = _PERIODS_PER_YEAR.get((values["salary_frequency"] or "yearly").strip().lower())
+    if periods is None:
+        return {"salary_min": None, "salary_max": None}
+    old_periods: ColumnElement = case(_PERIODS_PER_YEAR, value=frequency)
+    scaled = {
+        column: func.round(getattr(Job, column) * float(periods) / old_periods)
+        for column in ("salary_min", "salary_max")
+    }
+    implausible = scaled["salary_max"] > MAX_ANNUAL_SALARY
+    return {column: case((implausible, None), else_=value) for column, value in scaled.items()}
+
+
+def backfill_derived(conn: Connection) -> int:
+    """Recompute derived columns for every job, in id-ordered batches.
+
+    Only rows whose stored values differ are updated; returns how many.
+    """
+    table = Job.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("job_id"))
+        .values({name: bindparam(name) for name in DERIVED_COLUMNS})
+    )
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(
+                Job.id,
+                Job.date_applied,
+                *(getattr(Job, name) for name in SALARY_SOURCES),
+                *(getattr(Job, name) for name in DERIVED_COLUMNS),
+            )
+            .where(Job.id > last_id)
+            .order_by(Job.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return total
+        changed: List[Dict[str, Any]] = []
+        for row in rows:
+            values = row._asdict()
+            derived = derived_values(values)
+            if any(derived[name] != values[name] for name in DERIVED_COLUMNS):
+                changed.append({"job_id": row.id, **derived})
+        if changed:
+            conn.execute(stmt, changed)
+        total += len(changed)
+        last_id = rows[-1].id
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Row values carried with each change so listeners (e.g. the job cache) can act
+# precisely without querying the database again.
+EVENT_FIELDS = (
+    "title",
+    "company",
+    "status",
+    "work_model",
+    "date_applied",
+    "tech_stack",
+    "salary_range",
+    "salary_frequency",
+)
+
+
+@dataclass(frozen=True)
+class JobChange:
+    job_id: int
+    kind: str  # "created" | "updated" | "deleted"
+    # Job values before and/or after the write, limited to EVENT_FIELDS
+    rows: Tuple[Dict[str, Any], ...] = ()
+    # Set when rows only hold the new values (single-statement UPDATE ...
+    # RETURNING): the columns the update wrote, whose old values are unknown
+    changed_fields: Tuple[str, ...] = ()
+    # Sequence number the write stamped (jobs.change_seq / job_tombstones)
+    change_seq: int = 0
+    origin: int = field(default_factory=os.getpid)
+
+    @classmethod
+    def from_rows(
+        cls,
+        job_id: int,
+        kind: str,
+        rows: List[Mapping[str, Any]],
+        changed_fields: Tuple[str, ...] = (),
+        change_seq: int = 0,
+    ) -> "JobChange":
+        return cls(
+            job_id=job_id,
+            kind=kind,
+            rows=tuple({name: row.get(name) for name in EVENT_FIELDS} for row in rows),
+            changed_fields=changed_fields,
+            change_seq=change_seq,
+        )
+
+    def to_bytes(self) -> bytes:
+        return json.dumps(
+            {
+                "job_id": self.job_id,
+                "kind": self.kind,
+                "rows": list(self.rows),
+                "changed_fields": list(self.changed_fields),
+                "change_seq": self.change_seq,
+                "origin": self.origin,
+            },
+            default=str,
+        ).encode()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "JobChange":
+        payload = json.loads(data)
+        return cls(
+            job_id=payload["job_id"],
+            kind=payload["kind"],
+            rows=tuple(payload["rows"]),
+            changed_fields=tuple(payload.get("changed_fields", ())),
+            change_seq=payload.get("change_seq", 0),
+            origin=payload["origin"],
+        )
+
+
+Listener = Callable[[JobChange], None]
+
+
+class UnixSocketTransport:
+    """Fan job changes out to every worker process on this host.
+
+    Each worker binds a datagram socket named after its pid in a shared
+    directory; publishing sends one datagram to every other socket there.
+    Sockets left behind by dead workers are removed on the first failed send.
+    """
+
+    def __init__(self, directory: str, name: Optional[str] = None) -> None:
+        self.directory = Path(directory)
+        self.path = self.directory / f"{name or os.getpid()}.sock"
+        self._sock: Optional[socket.socket] = None
+
+    async def start(self, on_message: Callable[[bytes], None]) -> None:
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self.path))
+        sock.setblocking(False)
+        self._sock = sock
+
+        def _on_readable() -> None:
+            while True:
+                try:
+                    data = sock.recv(65536)
+                except (BlockingIOError, InterruptedError):
+                    return
+                on_message(data)
+
+        asyncio.get_running_loop().add_reader(sock.fileno(), _on_readable)
+
+    async def stop(self) -> None:
+        if self._sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self.path.unlink(missing_ok=True)
+
+    def send(self, data: bytes) -> None:
+        if self._sock is None:
+            return
+        for peer in self.directory.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(data, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                peer.unlink(missing_ok=True)
+            except (BlockingIOError, OSError) as e:
+                # A peer that can't keep up falls back to its cache TTL
+                logger.warning("Dropped job change for %s: %s", peer.name, e)
+
+
+class ChangeBus:
+    """Delivers job changes to in-process listeners and, via an optional
+    transport, to the same listeners in every other worker process."""
+
+    def __init__(self) -> None:
+        self._listeners: List[Listener] = []
+        self._transport: Optional[UnixSocketTransport] = None
+
+    def subscribe(self, listener: Listener) -> None:
+        """Call listener with this process's changes and, while a transport is
+        running, with the changes published by every other worker."""
+        self._listeners.append(listener)
+
+    def publish(self, change: JobChange) -> None:
+        self._deliver(change)
+        if self._transport is not None:
+            self._transport.send(change.to_bytes())
+
+    async def start(self, transport: UnixSocketTransport) -> None:
+        await transport.start(self._on_message)
+        self._transport = transport
+
+    async def stop(self) -> None:
+        if self._transport is not None:
+            await self._transport.stop()
+            self._transport = None
+
+    def _on_message(self, data: bytes) -> None:
+        try:
+            change = JobChange.from_bytes(data)
+        except (ValueError, KeyError) as e:
+            logger.warning("Ignoring malformed job change: %s", e)
+            return
+        if change.origin != os.getpid():
+            self._deliver(change)
+
+    def _deliver(self, change: JobChange) -> None:
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception:
+                logger.exception("Job change listener failed")
+
+
+change_bus = ChangeBus()
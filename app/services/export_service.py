@@ -1,69 +1,123 @@
+import asyncio
 import csv
 import io
 import json
-from typing import List
+import multiprocessing
+import textwrap
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Deque,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
 
-from app.schemas.job import JobResponse
+from app.config import settings
+from app.schemas.job import JobFilters, JobResponse
 
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "company",
+    "url",
+    "date_applied",
+    "status",
+    "work_model",
+    "salary_range",
+    "salary_frequency",
+    "tech_stack",
+    "notes",
+    "screenshot_url",
+    "resume_url",
+    "cover_letter_url",
+    "attachments",
+    "created_at",
+    "updated_at",
+]
 
-def generate_csv(jobs: List[JobResponse]) -> str:
-    output = io.StringIO()
-    writer = csv.writer(output, quoting=csv.QUOTE_ALL)
-
-    writer.writerow(
-        [
-            "id",
-            "title",
-            "company",
-            "url",
-            "date_applied",
-            "status",
-            "work_model",
-            "salary_range",
-            "salary_frequency",
-            "tech_stack",
-            "notes",
-            "screenshot_url",
-            "resume_url",
-            "cover_letter_url",
-            "attachments",
-            "created_at",
-            "updated_at",
-        ]
-    )
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
 
-    def _cell(value):
-        if value is None:
-            return ""
-        if isinstance(value, (list, dict)):
-            return json.dumps(value)
-        if hasattr(value, "isoformat"):
-            return value.isoformat()
-        return value
+# Rows buffered before a chunk is handed to the response
+EXPORT_CHUNK_ROWS = 500
+
+# Chunks with at least this many rows are formatted in the process pool;
+# smaller ones cost more to ship to a worker process than to format inline
+OFFLOAD_MIN_ROWS = 200
+
+_format_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value: Any) -> str:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _json_element(job: Mapping[str, Any]) -> str:
+    # Indent each element as json.dumps(list, indent=2) would
+    return textwrap.indent(json.dumps(dict(job), indent=2, default=_json_default), "  ")
 
-    for job in jobs:
-        writer.writerow(
-            [
-                job.id,
-                job.title,
-                job.company,
-                job.url or "",
-                job.date_applied,
-                job.status,
-                job.work_model or "",
-                job.salary_range or "",
-                job.salary_frequency or "",
-                _cell(job.tech_stack),
-                job.notes or "",
-                job.screenshot_url or "",
-                job.resume_url or "",
-                job.cover_letter_url or "",
-                _cell(job.attachments),
-                _cell(job.created_at),
-                _cell(job.updated_at),
-            ]
-        )
 
+def _csv_writer(output: io.StringIO):
+    return csv.writer(output, quoting=csv.QUOTE_ALL)
+
+
+def _csv_row(
+    job: Mapping[str, Any], columns: Sequence[str] = EXPORT_COLUMNS
+) -> List[Any]:
+    return [_cell(job[column]) for column in columns]
+
+
+def parse_columns(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated column list; raises ValueError on unknown names."""
+    if not value:
+        return list(EXPORT_COLUMNS)
+    columns: List[str] = []
+    for name in (part.strip() for part in value.split(",")):
+        if not name or name in columns:
+            continue
+        if name not in EXPORT_COLUMNS:
+            raise ValueError(f"Unknown export column '{name}'.")
+        columns.append(name)
+    if not columns:
+        raise ValueError("At least one export column is required.")
+    return columns
+
+
+def export_filename(format: str, filters: JobFilters) -> str:
+    prefix = "saved-jobs" if filters.status == ["Saved"] else "jobs"
+    return f"{prefix}-{date.today().isoformat()}.{format}"
+
+
+def generate_csv(jobs: List[JobResponse]) -> str:
+    output = io.StringIO()
+    writer = _csv_writer(output)
+    writer.writerow(EXPORT_COLUMNS)
+    for job in jobs:
+        writer.writerow(_csv_row(job.model_dump()))
     return output.getvalue()
 
 
@@ -73,3 +127,136 @@ def generate_json(jobs: List[JobResponse]) -> str:
         indent=2,
         default=str,
     )
+
+
+def _csv_batch(rows: List[Mapping[str, Any]], first: bool, columns: Sequence[str]) -> str:
+    output = io.StringIO()
+    writer = _csv_writer(output)
+    if first:
+        writer.writerow(columns)
+    for job in rows:
+        writer.writerow(_csv_row(job, columns))
+    return output.getvalue()
+
+
+def _json_batch(rows: List[Mapping[str, Any]], first: bool) -> str:
+    return ("[\n" if first else ",\n") + ",\n".join(_json_element(job) for job in rows)
+
+
+def _ndjson_batch(rows: List[Mapping[str, Any]], first: bool) -> str:
+    return "".join(json.dumps(job, default=_json_default) + "\n" for job in rows)
+
+
+def _get_format_pool() -> Optional[ProcessPoolExecutor]:
+    global _format_pool
+    if _format_pool is None and settings.EXPORT_FORMAT_PROCESSES > 0:
+        # spawn: children must not inherit the event loop or database sockets
+        _format_pool = ProcessPoolExecutor(
+            settings.EXPORT_FORMAT_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _format_pool
+
+
+def shutdown_format_pool() -> None:
+    global _format_pool
+    pool, _format_pool = _format_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _result(future: "asyncio.Future[str]") -> str:
+    try:
+        return await future
+    except BrokenProcessPool:
+        # A worker process died; the next export starts a fresh pool
+        shutdown_format_pool()
+        raise
+
+
+async def _format_batches(
+    jobs: AsyncIterable[Mapping[str, Any]],
+    chunk_rows: int,
+    format_batch: Callable[[List[Mapping[str, Any]], bool], str],
+) -> AsyncIterator[str]:
+    """Format jobs chunk_rows at a time and yield each batch's text, in order.
+
+    Batches of OFFLOAD_MIN_ROWS or more are formatted in the process pool,
+    with up to one batch per pool process in flight while the next one is
+    read, so formatting uses spare cores and the event loop keeps serving.
+    """
+    depth = settings.EXPORT_FORMAT_PROCESSES
+    loop = asyncio.get_running_loop()
+    in_flight: Deque["asyncio.Future[str]"] = deque()
+    batch: List[Mapping[str, Any]] = []
+    first = True
+
+    def submit() -> None:
+        nonlocal batch, first
+        if len(batch) >= OFFLOAD_MIN_ROWS and (pool := _get_format_pool()) is not None:
+            future = loop.run_in_executor(pool, format_batch, batch, first)
+        else:
+            future = loop.create_future()
+            future.set_result(format_batch(batch, first))
+        in_flight.append(future)
+        batch, first = [], False
+
+    try:
+        async for job in jobs:
+            batch.append(dict(job))
+            if len(batch) >= chunk_rows:
+                submit()
+                while in_flight and (in_flight[0].done() or len(in_flight) > depth):
+                    yield await _result(in_flight.popleft())
+        if batch:
+            submit()
+        while in_flight:
+            yield await _result(in_flight.popleft())
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+async def iter_csv(
+    jobs: AsyncIterable[Mapping[str, Any]],
+    columns: Sequence[str] = EXPORT_COLUMNS,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> AsyncIterator[str]:
+    """Stream CSV text (header first) in chunks of up to chunk_rows rows."""
+    empty = True
+    async for chunk in _format_batches(
+        jobs, chunk_rows, partial(_csv_batch, columns=list(columns))
+    ):
+        empty = False
+        yield chunk
+    if empty:
+        yield _csv_batch([], True, columns)
+
+
+async def iter_json(
+    jobs: AsyncIterable[Mapping[str, Any]], chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> AsyncIterator[str]:
+    """Stream a JSON array, formatted like generate_json, in chunks of elements."""
+    empty = True
+    async for chunk in _format_batches(jobs, chunk_rows, _json_batch):
+        empty = False
+        yield chunk
+    yield "[]" if empty else "\n]"
+
+
+async def iter_ndjson(
+    jobs: AsyncIterable[Mapping[str, Any]], chunk_rows: int = EXPORT_CHUNK_ROWS
+) -> AsyncIterator[str]:
+    """Stream newline-delimited JSON: one compact object per line."""
+    async for chunk in _format_batches(jobs, chunk_rows, _ndjson_batch):
+        yield chunk
+
+
+def iter_export(
+    format: str, jobs: AsyncIterable[Mapping[str, Any]], columns: Sequence[str]
+) -> AsyncIterator[str]:
+    """Chunks of jobs formatted as format, one of EXPORT_MEDIA_TYPES."""
+    if format == "csv":
+        return iter_csv(jobs, columns)
+    if format == "json":
+        return iter_json(jobs)
+    return iter_ndjson(jobs)
@@ -0,0 +1,216 @@
+"""Background exports: generated off the request, stored under UPLOAD_DIR.
+
+start_export returns at once with the export's state. A bounded runner per
+worker process writes the file, and clients poll for the status and then
+download it. The export id hashes the format, columns, filters and the job
+change counter, so identical requests made while no job has changed get the
+same export, finished or in progress, instead of a new one.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.schemas.job import JobFilters
+from app.services.change_feed import current_position
+from app.services.export_service import export_filename, iter_export
+from app.services.job_service import stream_jobs
+from app.utils.export_store import (
+    ExportNotFound,
+    ExportRecord,
+    artifact_path,
+    create_export,
+    expire_exports,
+    export_age,
+    load_export,
+    make_export_id,
+    save_export,
+    touch_export,
+)
+from app.utils.file_upload import get_upload_path
+
+logger = logging.getLogger(__name__)
+
+# Heartbeats an unfinished export may miss before it counts as abandoned
+MISSED_HEARTBEATS = 3
+
+
+class ExportQueueFull(RuntimeError):
+    """This worker already has as many exports queued as it accepts."""
+
+
+class ExportRunner:
+    """Runs at most max_workers exports at a time, with up to max_pending waiting."""
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def __contains__(self, export_id: str) -> bool:
+        return export_id in self._tasks
+
+    @property
+    def full(self) -> bool:
+        return len(self._tasks) >= self.max_workers + self.max_pending
+
+    def submit(
+        self, record: ExportRecord, columns: Sequence[str], filters: JobFilters
+    ) -> None:
+        if record.id in self._tasks:
+            return
+        if self.full:
+            raise ExportQueueFull(record.id)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        task = asyncio.create_task(self._run(record, columns, filters))
+        self._tasks[record.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(record.id, None))
+
+    async def _run(
+        self, record: ExportRecord, columns: Sequence[str], filters: JobFilters
+    ) -> None:
+        upload_dir = get_upload_path()
+        # Beats while queued too, so a long queue doesn't look abandoned
+        heartbeat = asyncio.create_task(_heartbeat(upload_dir, record.id))
+        try:
+            async with self._slots:
+                record = replace(record, status="running")
+                await run_in_threadpool(save_export, upload_dir, record)
+                try:
+                    rows, size = await _write_artifact(upload_dir, record, columns, filters)
+                    record = replace(
+                        record, status="done", rows=rows, size=size, finished_at=time.time()
+                    )
+                except Exception as e:
+                    logger.exception("Export %s failed", record.id)
+                    record = replace(
+                        record,
+                        status="failed",
+                        error=str(e) or "Export failed",
+                        finished_at=time.time(),
+                    )
+                await run_in_threadpool(save_export, upload_dir, record)
+        finally:
+            heartbeat.cancel()
+
+
+async def _heartbeat(upload_dir: Path, export_id: str) -> None:
+    """Touch the export's state file every EXPORT_HEARTBEAT_SECONDS until cancelled."""
+    while True:
+        await asyncio.sleep(settings.EXPORT_HEARTBEAT_SECONDS)
+        try:
+            await run_in_threadpool(touch_export, upload_dir, export_id)
+        except OSError:
+            logger.exception("Export %s heartbeat failed", export_id)
+
+
+async def _write_artifact(
+    upload_dir: Path, record: ExportRecord, columns: Sequence[str], filters: JobFilters
+) -> Tuple[int, int]:
+    """Stream the export into its file; returns (rows, bytes)."""
+    destination = artifact_path(upload_dir, record)
+    # Unique, in case a worker that was taken for dead is still writing
+    temp_path = destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.part")
+    rows = 0
+
+    async def counted(jobs):
+        nonlocal rows
+        async for job in jobs:
+            rows += 1
+            yield job
+
+    out = await run_in_threadpool(open, temp_path, "w", encoding="utf-8", newline="")
+    try:
+        try:
+            async with async_session_maker() as db:
+                jobs = counted(stream_jobs(db, columns, filters))
+                async for chunk in iter_export(record.format, jobs, columns):
+                    await run_in_threadpool(out.write, chunk)
+        finally:
+            await run_in_threadpool(out.close)
+        await run_in_threadpool(temp_path.replace, destination)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return rows, destination.stat().st_size
+
+
+async def _reusable(upload_dir: Path, record: ExportRecord) -> bool:
+    """False for a failed export, a finished one whose file is gone, and an
+    unfinished one no worker is generating any more (e.g. after a restart)."""
+    if record.status == "failed":
+        return False
+    if record.status == "done":
+        return await run_in_threadpool(artifact_path(upload_dir, record).is_file)
+    if record.id in export_runner:
+        return True
+    try:
+        age = await run_in_threadpool(export_age, upload_dir, record.id)
+    except ExportNotFound:
+        return False
+    return age <= settings.EXPORT_HEARTBEAT_SECONDS * MISSED_HEARTBEATS
+
+
+async def start_export(
+    db: AsyncSession, format: str, columns: Sequence[str], filters: JobFilters
+) -> ExportRecord:
+    """The export for this request, reusing an identical one when no job has changed.
+
+    Raises ExportQueueFull when a new export is needed but this worker's
+    runner is full.
+    """
+    upload_dir = get_upload_path()
+    # Moves with every job write, so a reused export never has stale rows
+    change_seq, _ = await current_position(db)
+    export_id = make_export_id(
+        format, ",".join(columns), filters.model_dump_json(), str(change_seq)
+    )
+    try:
+        existing = await run_in_threadpool(load_export, upload_dir, export_id)
+    except ExportNotFound:
+        existing = None
+    if existing is not None and await _reusable(upload_dir, existing):
+        return existing
+
+    if export_runner.full:
+        raise ExportQueueFull(export_id)
+    await run_in_threadpool(expire_exports, upload_dir, settings.EXPORT_TTL_SECONDS)
+    record = ExportRecord(
+        id=export_id,
+        format=format,
+        filename=export_filename(format, filters),
+        status="pending",
+        created_at=time.time(),
+    )
+    if existing is None:
+        if not await run_in_threadpool(create_export, upload_dir, record):
+            # Another worker started the same export first
+            return await run_in_threadpool(load_export, upload_dir, export_id)
+    else:
+        # Retry a failed, lost or abandoned export under the same id
+        await run_in_threadpool(save_export, upload_dir, record)
+    export_runner.submit(record, columns, filters)
+    return record
+
+
+async def get_export(export_id: str) -> ExportRecord:
+    """Raises ExportNotFound for unknown or expired ids."""
+    return await run_in_threadpool(load_export, get_upload_path(), export_id)
+
+
+def export_file(record: ExportRecord) -> Path:
+    return artifact_path(get_upload_path(), record)
+
+
+export_runner = ExportRunner(settings.EXPORT_MAX_WORKERS, settings.EXPORT_MAX_PENDING)
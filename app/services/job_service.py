@@ -1,11 +1,82 @@
 import json
-from typing import List, Optional
-
-from sqlalchemy import select
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.models.job import Job
-from app.schemas.job import JobCreate, JobResponse, JobUpdate
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.config import settings
+from app.models.job import Job, JobChangeCounter, JobTech, JobTombstone
+from app.schemas.cache import CacheStats
+from app.schemas.job import (
+    BulkItemResult,
+    JobBulkRequest,
+    JobBulkResponse,
+    JobCreate,
+    JobFacets,
+    JobFilters,
+    JobResponse,
+    JobStats,
+    JobUpdate,
+    StatBucket,
+    Suggestion,
+    TechFacet,
+)
+from app.services.cache import MISSING, CacheBackend, create_cache
+from app.services.change_feed import (
+    ChangePosition,
+    add_tombstones,
+    claim_change_seq,
+    decode_change_token,
+    encode_change_token,
+    finish_change_seq,
+    next_change_seq,
+    with_tombstones,
+)
+from app.services.derived_fields import (
+    SALARY_SOURCES,
+    derived_values,
+    parse_applied_on,
+    parse_salary,
+    salary_expressions,
+)
+from app.services.events import EVENT_FIELDS, JobChange, change_bus
+from app.services.search_index import (
+    dialect_name,
+    reindex_jobs,
+    remove_jobs,
+    search_statement,
+    touches_search,
+)
+from app.services.suggest_index import suggest_indexes
+from app.services.tech_index import TechMatch, add_techs, replace_techs, tech_list
+from app.services.upload_refs import add_refs, replace_refs
+from app.utils.tokens import decode_token, encode_token
 
 
 def _parse_json_field(value: any) -> any:
@@ -17,12 +88,18 @@ def _parse_json_field(value: any) -> any:
     return value
 
 
-def _job_to_response(job: Job) -> JobResponse:
+# Rows fetched per round trip when streaming large result sets
+STREAM_BATCH_SIZE = 500
+
+_JSON_FIELDS = ("tech_stack", "attachments")
+
+
+def _job_to_dict(job: Job) -> Dict[str, Any]:
     # Parse JSONB fields (can be strings or Python objects depending on SQLAlchemy version)
     tech_stack = _parse_json_field(job.tech_stack) or []
     attachments = _parse_json_field(job.attachments) or []
 
-    job_dict = {
+    return {
         "id": job.id,
         "title": job.title,
         "company": job.company,
@@ -41,7 +118,241 @@ def _job_to_response(job: Job) -> JobResponse:
         "created_at": job.created_at,
         "updated_at": job.updated_at,
     }
-    return JobResponse(**job_dict)
+
+
+def _job_to_response(job: Job) -> JobResponse:
+    return JobResponse(**_job_to_dict(job))
+
+
+# --- JSON fast path ---
+#
+# The list endpoints select plain column tuples in JobResponse field order and
+# serialize them straight to bytes, skipping ORM entities and both Pydantic
+# validations (ours and FastAPI's response_model).
+
+_RESPONSE_FIELDS = list(JobResponse.model_fields)
+_RESPONSE_COLUMNS = [getattr(Job, name) for name in _RESPONSE_FIELDS]
+_JSON_FIELD_POSITIONS = [_RESPONSE_FIELDS.index(name) for name in _JSON_FIELDS]
+_json_payload = TypeAdapter(Any)
+
+
+def _row_to_response_dict(row: Sequence[Any]) -> Dict[str, Any]:
+    job = dict(zip(_RESPONSE_FIELDS, row))
+    for position in _JSON_FIELD_POSITIONS:
+        name = _RESPONSE_FIELDS[position]
+        job[name] = _parse_json_field(row[position]) or []
+    return job
+
+
+def _rows_to_json(rows: Iterable[Sequence[Any]]) -> bytes:
+    return _json_payload.dump_json([_row_to_response_dict(row) for row in rows])
+
+
+def _encode_cursor(date_applied: str, job_id: int) -> str:
+    """Encode the (date_applied, id) seek position as an opaque URL-safe token."""
+    return encode_token([date_applied, job_id])
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decode a token produced by _encode_cursor. Raises ValueError if malformed."""
+    try:
+        date_applied, job_id = decode_token(cursor)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(date_applied, str) or not isinstance(job_id, int):
+        raise ValueError("Invalid cursor")
+    return date_applied, job_id
+
+
+def _encode_offset(offset: int) -> str:
+    """Encode a result offset as an opaque URL-safe token (ranked search pages)."""
+    return encode_token({"offset": offset})
+
+
+def _decode_offset(cursor: str) -> int:
+    try:
+        offset = decode_token(cursor)["offset"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError("Invalid cursor")
+    return offset
+
+
+def _seek_after(stmt: Select, cursor: Optional[str]) -> Select:
+    """Restrict a (date_applied, id) DESC query to rows after the cursor position."""
+    if cursor is None:
+        return stmt
+    date_applied, job_id = _decode_cursor(cursor)
+    return stmt.where(tuple_(Job.date_applied, Job.id) < tuple_(date_applied, job_id))
+
+
+def _apply_filters(stmt: Select, filters: Optional[JobFilters]) -> Select:
+    """Push JobFilters down into the WHERE clause (each maps to an indexed column)."""
+    if filters is None:
+        return stmt
+    if filters.status:
+        stmt = stmt.where(Job.status.in_(filters.status))
+    if filters.work_model is not None:
+        stmt = stmt.where(Job.work_model == filters.work_model)
+    if filters.company is not None:
+        stmt = stmt.where(Job.company == filters.company)
+    if filters.date_from is not None:
+        stmt = stmt.where(Job.applied_on >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(Job.applied_on <= filters.date_to)
+    # Range overlap: each bound is one range scan on its own index
+    if filters.salary_min is not None:
+        stmt = stmt.where(Job.salary_max >= filters.salary_min)
+    if filters.salary_max is not None:
+        stmt = stmt.where(Job.salary_min <= filters.salary_max)
+    if filters.tech:
+        stmt = stmt.where(TechMatch(filters.tech, match_all=filters.tech_match == "all"))
+    return stmt
+
+
+# --- Read-through cache ---
+#
+# Keys are ("job", id, version) for single jobs and (kind, filters_key,
+# version, *extra) for list shapes. Writes drop the job's own keys plus every
+# list shape whose filters match the row before or after the change.
+#
+# version is the marker the caller built its ETag from (None without one).
+# Keying on it means a cached body is only ever served under the ETag it was
+# loaded for: when this process missed an invalidation (another worker wrote
+# without a bus, a dropped datagram, the gap between commit and publish) the
+# database's new marker simply misses the stale entry.
+
+job_cache: CacheBackend = create_cache(
+    settings.JOB_CACHE_MAX_ENTRIES,
+    settings.JOB_CACHE_TTL_SECONDS,
+    settings.JOB_CACHE_MAX_BYTES,
+)
+
+# Bumped by every invalidation so reads that raced a write don't repopulate
+# the cache with rows loaded before the write committed.
+_cache_generation = 0
+
+_SAVED_FILTERS = JobFilters(status=["Saved"])
+
+# Columns JobFilters can constrain; a write that doesn't touch them cannot
+# move a row in or out of a filtered list.
+_FILTERED_FIELDS = frozenset(
+    {"status", "work_model", "company", "date_applied", "tech_stack", *SALARY_SOURCES}
+)
+
+
+def set_job_cache(backend: CacheBackend) -> None:
+    """Swap the cache backend (e.g. for a shared cache or in tests)."""
+    global job_cache
+    job_cache = backend
+
+
+def get_job_cache_stats() -> CacheStats:
+    return job_cache.stats()
+
+
+def _filters_key(filters: Optional[JobFilters]) -> Tuple:
+    if filters is None:
+        filters = JobFilters()
+    return (
+        tuple(filters.status) if filters.status else None,
+        filters.work_model,
+        filters.company,
+        filters.date_from,
+        filters.date_to,
+        tuple(filters.tech) if filters.tech else None,
+        filters.tech_match,
+        filters.salary_min,
+        filters.salary_max,
+    )
+
+
+def _filters_match(key: Tuple, job: Mapping[str, Any]) -> bool:
+    """Whether a row with these values belongs to the list cached under key."""
+    (
+        status, work_model, company, date_from, date_to, tech, tech_match,
+        salary_min, salary_max,
+    ) = key
+    if tech:
+        techs = set(tech_list(job.get("tech_stack")))
+        wanted = all if tech_match == "all" else any
+        if not wanted(name in techs for name in tech):
+            return False
+    if date_from is not None or date_to is not None:
+        applied_on = parse_applied_on(job.get("date_applied"))
+        if applied_on is None:
+            return False
+        if (date_from is not None and applied_on < date_from) or (
+            date_to is not None and applied_on > date_to
+        ):
+            return False
+    if salary_min is not None or salary_max is not None:
+        low, high = parse_salary(job.get("salary_range"), job.get("salary_frequency"))
+        if low is None:
+            return False
+        if (salary_min is not None and high < salary_min) or (
+            salary_max is not None and low > salary_max
+        ):
+            return False
+    return (
+        (status is None or job["status"] in status)
+        and (work_model is None or job["work_model"] == work_model)
+        and (company is None or job["company"] == company)
+    )
+
+
+async def _read_through(key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+    value = job_cache.get(key)
+    if value is not MISSING:
+        return value
+    generation = _cache_generation
+    value = await load()
+    if generation == _cache_generation:
+        job_cache.set(key, value)
+    return value
+
+
+def invalidate_job(
+    job_id: int,
+    rows: Iterable[Mapping[str, Any]] = (),
+    changed_fields: Iterable[str] = (),
+) -> None:
+    """Drop cache entries a write to job_id can affect.
+
+    rows are the job's values before and/or after the write; only list shapes
+    whose filters match one of them are dropped. With no rows, or when
+    changed_fields (columns whose old values are unknown) includes a filtered
+    column, all list shapes are dropped.
+    """
+    global _cache_generation
+    _cache_generation += 1
+
+    rows = list(rows)
+    if not _FILTERED_FIELDS.isdisjoint(changed_fields):
+        rows = []
+    job_cache.delete_matching(
+        lambda key: key[1] == job_id
+        if key[0] == "job"
+        else not rows or any(_filters_match(key[1], row) for row in rows)
+    )
+
+
+def _invalidate_on_change(change: JobChange) -> None:
+    invalidate_job(change.job_id, change.rows, change.changed_fields)
+
+
+change_bus.subscribe(_invalidate_on_change)
+
+
+def _publish_change(
+    job_id: int,
+    kind: str,
+    rows: List[Mapping[str, Any]],
+    changed_fields: Tuple[str, ...] = (),
+    change_seq: int = 0,
+) -> None:
+    change_bus.publish(JobChange.from_rows(job_id, kind, rows, changed_fields, change_seq))
 
 
 async def create_job(db: AsyncSession, job: JobCreate) -> JobResponse:
@@ -49,22 +360,289 @@ async def create_job(db: AsyncSession, job: JobCreate) -> JobResponse:
     # With JSONB, pass Python objects directly (no serialization needed)
     # SQLAlchemy handles the conversion to JSONB automatically
 
-    db_job = Job(**job_dict)
-    db.add(db_job)
+    # RETURNING brings back the id for the side indexes and the defaults for
+    # the response, so the row is never read back
+    result = await db.execute(
+        insert(Job)
+        .values(**job_dict, **derived_values(job_dict), change_seq=claim_change_seq(db))
+        .returning(Job.change_seq, *_RESPONSE_COLUMNS)
+    )
+    row = result.one()
+    await add_refs(db, [(row.id, job_dict)])
+    await add_techs(db, [(row.id, job_dict)])
+    await reindex_jobs(db, [row.id])
+    await finish_change_seq(db)
     await db.commit()
-    await db.refresh(db_job)
 
-    return _job_to_response(db_job)
+    response = JobResponse(**_row_to_response_dict(row[1:]))
+    _publish_change(response.id, "created", [job_dict], change_seq=row.change_seq)
+    return response
 
 
-async def get_jobs(db: AsyncSession) -> List[JobResponse]:
-    result = await db.execute(select(Job).order_by(Job.date_applied.desc()))
-    jobs = result.scalars().all()
+async def get_jobs_json(
+    db: AsyncSession,
+    filters: Optional[JobFilters] = None,
+    version: Optional[str] = None,
+) -> bytes:
+    """Jobs matching filters, newest first, serialized as a JSON array."""
+    return await _read_through(
+        ("list_json", _filters_key(filters), version),
+        lambda: _load_jobs_json(db, filters),
+    )
+
+
+async def _load_jobs_json(db: AsyncSession, filters: Optional[JobFilters]) -> bytes:
+    stmt = _apply_filters(select(*_RESPONSE_COLUMNS), filters)
+    result = await db.execute(stmt.order_by(Job.date_applied.desc()))
+    return _rows_to_json(result.all())
+
+
+async def get_jobs_page_json(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[JobFilters] = None,
+    version: Optional[str] = None,
+) -> bytes:
+    """One page of jobs ordered by (date_applied, id) descending, as JobPage JSON.
+
+    Uses keyset pagination: the cursor carries the last (date_applied, id) seen,
+    so every page is an index seek regardless of how deep the client has paged.
+    """
+    return await _read_through(
+        ("page_json", _filters_key(filters), version, limit, cursor),
+        lambda: _load_jobs_page_json(db, limit, cursor, filters),
+    )
+
+
+async def _load_jobs_page_json(
+    db: AsyncSession,
+    limit: int,
+    cursor: Optional[str],
+    filters: Optional[JobFilters],
+) -> bytes:
+    stmt = _apply_filters(select(*_RESPONSE_COLUMNS), filters)
+    stmt = _seek_after(stmt.order_by(Job.date_applied.desc(), Job.id.desc()), cursor)
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1].date_applied, rows[-1].id)
+
+    return _json_payload.dump_json(
+        {
+            "items": [_row_to_response_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+async def search_jobs_json(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    filters: Optional[JobFilters] = None,
+) -> bytes:
+    """Jobs whose title, company or notes match q, best match first, as JobPage JSON.
+
+    Served from the full-text index, so cost follows the number of matches
+    rather than the size of the table. Rank has no stable seek key, so the
+    cursor carries an offset.
+    """
+    offset = _decode_offset(cursor) if cursor else 0
+    stmt = search_statement(dialect_name(db), q, _RESPONSE_COLUMNS)
+    rows = []
+    if stmt is not None:
+        stmt = _apply_filters(stmt, filters).limit(limit + 1).offset(offset)
+        rows = (await db.execute(stmt)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_offset(offset + limit)
+
+    return _json_payload.dump_json(
+        {
+            "items": [_row_to_response_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+async def get_tech_facets(
+    db: AsyncSession,
+    limit: int,
+    filters: Optional[JobFilters] = None,
+    version: Optional[str] = None,
+) -> JobFacets:
+    """Most used technologies across the jobs matching filters, with job counts."""
+    return await _read_through(
+        ("facets", _filters_key(filters), version, limit),
+        lambda: _load_tech_facets(db, limit, filters),
+    )
+
+
+async def _load_tech_facets(
+    db: AsyncSession, limit: int, filters: Optional[JobFilters]
+) -> JobFacets:
+    count = func.count().label("count")
+    stmt = select(JobTech.tech, count).group_by(JobTech.tech)
+    if filters is not None and filters != JobFilters():
+        stmt = _apply_filters(stmt.join(Job, Job.id == JobTech.job_id), filters)
+    result = await db.execute(stmt.order_by(count.desc(), JobTech.tech).limit(limit))
+    return JobFacets(
+        tech_stack=[TechFacet(name=tech, count=n) for tech, n in result.all()]
+    )
 
-    return [_job_to_response(job) for job in jobs]
 
+def _week_start(dialect: str) -> ColumnElement:
+    """Monday of the week a job was applied, as YYYY-MM-DD (NULL without a date)."""
+    if dialect == "postgresql":
+        return func.to_char(func.date_trunc("week", Job.applied_on), "YYYY-MM-DD")
+    # SQLite: forward to Sunday (or stay on it), then back to Monday
+    return func.date(Job.applied_on, "weekday 0", "-6 days")
 
-async def get_job(db: AsyncSession, job_id: int) -> Optional[JobResponse]:
+
+async def get_job_stats(
+    db: AsyncSession,
+    filters: Optional[JobFilters] = None,
+    version: Optional[str] = None,
+) -> JobStats:
+    """Dashboard aggregates over the jobs matching filters."""
+    return await _read_through(
+        ("stats", _filters_key(filters), version), lambda: _load_job_stats(db, filters)
+    )
+
+
+async def _count_by(
+    db: AsyncSession,
+    column: ColumnElement,
+    filters: Optional[JobFilters],
+    most_first: bool = True,
+    skip_null: bool = False,
+) -> List[StatBucket]:
+    # Group on the subquery's column: repeating a bound expression in GROUP BY
+    # gives it new parameters on positional drivers, which PostgreSQL rejects
+    keys = _apply_filters(select(column.label("key")), filters).subquery()
+    count = func.count().label("count")
+    stmt = select(keys.c.key, count).group_by(keys.c.key)
+    if skip_null:
+        stmt = stmt.where(keys.c.key.is_not(None))
+    stmt = stmt.order_by(count.desc(), keys.c.key) if most_first else stmt.order_by(keys.c.key)
+    result = await db.execute(stmt)
+    return [StatBucket(key=value, count=n) for value, n in result.all()]
+
+
+async def _load_job_stats(db: AsyncSession, filters: Optional[JobFilters]) -> JobStats:
+    # One GROUP BY per dimension; only (key, count) pairs cross the wire
+    by_status = await _count_by(db, Job.status, filters)
+    return JobStats(
+        total=sum(bucket.count for bucket in by_status),
+        by_status=by_status,
+        by_work_model=await _count_by(db, Job.work_model, filters),
+        per_week=await _count_by(
+            db, _week_start(dialect_name(db)), filters, most_first=False, skip_null=True
+        ),
+    )
+
+
+async def suggest_values(
+    db: AsyncSession, field: str, prefix: str, limit: int
+) -> List[Suggestion]:
+    """Distinct values of field starting with prefix, most used first."""
+    index = await suggest_indexes.get(db, field)
+    return [Suggestion(value=value, count=n) for value, n in index.suggest(prefix, limit)]
+
+
+# (change_seq, job id, JobResponse dict or None for a delete)
+ChangeEntry = Tuple[int, int, Optional[Dict[str, Any]]]
+
+
+async def read_changes(
+    db: AsyncSession, position: ChangePosition, limit: int
+) -> Tuple[List[ChangeEntry], bool]:
+    """Up to limit writes and deletes after position, oldest first, and whether more follow.
+
+    Both reads are bounded by the counter value read first: anything
+    committed later has a higher sequence number, so the two statements agree
+    even without a snapshot transaction.
+    """
+    result = await db.execute(select(JobChangeCounter.value))
+    high = result.scalar() or 0
+
+    live = await db.execute(
+        select(Job.change_seq, *_RESPONSE_COLUMNS)
+        .where(tuple_(Job.change_seq, Job.id) > tuple_(*position), Job.change_seq <= high)
+        .order_by(Job.change_seq, Job.id)
+        .limit(limit + 1)
+    )
+    gone = await db.execute(
+        select(JobTombstone.change_seq, JobTombstone.job_id)
+        .where(
+            tuple_(JobTombstone.change_seq, JobTombstone.job_id) > tuple_(*position),
+            JobTombstone.change_seq <= high,
+        )
+        .order_by(JobTombstone.change_seq, JobTombstone.job_id)
+        .limit(limit + 1)
+    )
+    entries = [(row[0], row.id, _row_to_response_dict(row[1:])) for row in live.all()]
+    entries += [(change_seq, job_id, None) for change_seq, job_id in gone.all()]
+    entries.sort(key=lambda entry: entry[:2])
+    return entries[:limit], len(entries) > limit
+
+
+async def get_changes_json(db: AsyncSession, since: Optional[str], limit: int) -> bytes:
+    """Jobs written or deleted after the since token, oldest first, as JobChanges JSON.
+
+    Without a token the feed starts at the beginning, i.e. a full sync.
+    """
+    position = decode_change_token(since) if since else (0, 0)
+    page, has_more = await read_changes(db, position, limit)
+
+    # A reused id can be deleted and recreated within a page; keep its last event
+    latest = {job_id: job for _, job_id, job in page}
+    next_position = page[-1][:2] if page else position
+    return _json_payload.dump_json(
+        {
+            "upserted": [job for job in latest.values() if job is not None],
+            "deleted": [job_id for job_id, job in latest.items() if job is None],
+            "next_token": encode_change_token(*next_position),
+            "has_more": has_more,
+        }
+    )
+
+
+async def get_jobs_version(db: AsyncSession) -> str:
+    """Version marker for every job list: the change counter's value.
+
+    Each create, update and delete advances it (see change_feed), so one
+    primary-key read replaces aggregating over the filtered rows on every
+    request. A write outside a list's filters changes its marker too, which
+    costs that list a re-fetch but never serves a stale body.
+    """
+    result = await db.execute(select(JobChangeCounter.value))
+    return str(result.scalar() or 0)
+
+
+async def get_job_version(db: AsyncSession, job_id: int) -> Optional[str]:
+    """Per-row version marker (its updated_at), or None if the job does not exist."""
+    result = await db.execute(select(Job.updated_at).where(Job.id == job_id))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return f"{job_id}:{row.updated_at.isoformat() if row.updated_at else ''}"
+
+
+async def get_job(
+    db: AsyncSession, job_id: int, version: Optional[str] = None
+) -> Optional[JobResponse]:
+    return await _read_through(("job", job_id, version), lambda: _load_job(db, job_id))
+
+
+async def _load_job(db: AsyncSession, job_id: int) -> Optional[JobResponse]:
     result = await db.execute(select(Job).where(Job.id == job_id))
     job = result.scalar_one_or_none()
 
@@ -77,41 +655,235 @@ async def get_job(db: AsyncSession, job_id: int) -> Optional[JobResponse]:
 async def update_job(
     db: AsyncSession, job_id: int, job: JobUpdate
 ) -> Optional[JobResponse]:
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    db_job = result.scalar_one_or_none()
-
-    if db_job is None:
-        return None
+    """Apply a partial update in one UPDATE ... RETURNING round trip.
 
+    Returns None when no job has this id.
+    """
     update_data = job.model_dump(exclude_unset=True)
+    derived = {**derived_values(update_data), **salary_expressions(update_data)}
     # With JSONB, pass Python objects directly (no serialization needed)
+    # Bump explicitly: an update that changes no column would not fire onupdate
+    stmt = (
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            **update_data,
+            **derived,
+            change_seq=claim_change_seq(db),
+            updated_at=datetime.utcnow(),
+        )
+        .returning(Job.change_seq, Job.salary_min, Job.salary_max, *_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt)
+    row = result.one_or_none()
 
-    for field, value in update_data.items():
-        setattr(db_job, field, value)
+    if row is None:
+        return None
 
+    change_seq = row.change_seq
+    new_row = _row_to_response_dict(row[3:])
+    if not set(SALARY_SOURCES).isdisjoint(update_data):
+        salary = derived_values({name: new_row[name] for name in SALARY_SOURCES})
+        if (row.salary_min, row.salary_max) != (salary["salary_min"], salary["salary_max"]):
+            # Rare: SQL couldn't rescale the old values exactly
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(**salary)
+                .execution_options(synchronize_session=False)
+            )
+    await replace_refs(db, [(job_id, update_data)])
+    await replace_techs(db, [(job_id, update_data)])
+    if touches_search(update_data):
+        await reindex_jobs(db, [job_id])
+    await finish_change_seq(db)
     await db.commit()
-    await db.refresh(db_job)
 
-    return _job_to_response(db_job)
+    # RETURNING only sees the new row, so listeners are told which columns
+    # changed instead of their old values.
+    _publish_change(job_id, "updated", [new_row], tuple(update_data), change_seq)
+    return JobResponse(**new_row)
+
+
+async def _delete_jobs(
+    db: AsyncSession, job_ids: List[int], change_seq: Union[int, ColumnElement]
+) -> List[Any]:
+    """Delete jobs and record their tombstones; returns the deleted rows' event fields
+    and change_seq.
+
+    upload_refs, job_tech and job_search rows go with their job through ON
+    DELETE CASCADE. On PostgreSQL the tombstones are written by the DELETE's
+    own statement. SQLite has no DML in CTEs and can't cascade into its FTS5
+    table, so it takes two more statements, in process rather than over the
+    wire.
+    """
+    if isinstance(change_seq, int):
+        change_seq = literal(change_seq)
+    stmt = delete(Job).where(Job.id.in_(job_ids)).returning(
+        Job.id,
+        *(getattr(Job, name) for name in EVENT_FIELDS),
+        change_seq.label("change_seq"),
+    )
+    if dialect_name(db) == "postgresql":
+        result = await db.execute(with_tombstones(stmt))
+        return result.all()
+
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    rows = result.all()
+    if rows:
+        deleted = [row.id for row in rows]
+        await remove_jobs(db, deleted)
+        await add_tombstones(db, deleted, rows[0].change_seq)
+    return rows
 
 
 async def delete_job(db: AsyncSession, job_id: int) -> bool:
-    result = await db.execute(select(Job).where(Job.id == job_id))
-    job = result.scalar_one_or_none()
+    """Delete in one DELETE ... RETURNING round trip; False if the id is unknown."""
+    rows = await _delete_jobs(db, [job_id], claim_change_seq(db))
 
-    if job is None:
+    if not rows:
         return False
 
-    await db.delete(job)
+    await finish_change_seq(db)
     await db.commit()
 
+    deleted = rows[0]._asdict()
+    _publish_change(job_id, "deleted", [deleted], change_seq=deleted["change_seq"])
     return True
 
 
+async def bulk_write(db: AsyncSession, request: JobBulkRequest) -> JobBulkResponse:
+    """Apply creates, partial updates and deletes in a single transaction.
+
+    Each kind is one multi-row statement (INSERT ... RETURNING, executemany
+    UPDATE by primary key, DELETE ... WHERE id IN), plus one SELECT that finds
+    which update/delete ids exist and one that claims the batch's change
+    sequence number. Missing ids are reported per item rather than failing
+    the batch.
+    """
+    response = JobBulkResponse()
+    now = datetime.utcnow()
+
+    target_ids = {item.id for item in request.update} | set(request.delete)
+    existing: Dict[int, Dict[str, Any]] = {}
+    if target_ids:
+        result = await db.execute(
+            select(Job.id, *(getattr(Job, name) for name in EVENT_FIELDS)).where(
+                Job.id.in_(target_ids)
+            )
+        )
+        existing = {row.id: row._asdict() for row in result.all()}
+
+    # Every job the batch writes shares one sequence number
+    change_seq = await next_change_seq(db) if request.create or existing else 0
+    changes: List[Tuple[int, str, List[Mapping[str, Any]]]] = []
+
+    if request.create:
+        rows = []
+        for item in request.create:
+            values = item.model_dump()
+            rows.append(
+                {
+                    **values,
+                    **derived_values(values),
+                    "change_seq": change_seq,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        result = await db.execute(
+            insert(Job).returning(Job.id, sort_by_parameter_order=True), rows
+        )
+        created_ids = result.scalars().all()
+        for index, (job_id, row) in enumerate(zip(created_ids, rows)):
+            response.created.append(BulkItemResult(index=index, id=job_id, success=True))
+            changes.append((job_id, "created", [row]))
+        await add_refs(db, zip(created_ids, rows))
+        await add_techs(db, zip(created_ids, rows))
+        await reindex_jobs(db, created_ids)
+
+    update_rows = []
+    for index, item in enumerate(request.update):
+        if item.id not in existing:
+            response.updated.append(
+                BulkItemResult(index=index, id=item.id, success=False, error="Job not found")
+            )
+            continue
+        values = item.model_dump(exclude_unset=True, exclude={"id"})
+        old_row = existing[item.id]
+        update_rows.append(
+            {
+                "id": item.id,
+                **values,
+                **derived_values(values, old_row),
+                "change_seq": change_seq,
+                "updated_at": now,
+            }
+        )
+        response.updated.append(BulkItemResult(index=index, id=item.id, success=True))
+        changes.append((item.id, "updated", [old_row, {**old_row, **values}]))
+    if update_rows:
+        # ORM bulk UPDATE by primary key; rows with the same keys share one executemany
+        await db.execute(update(Job), update_rows)
+        await replace_refs(db, ((row["id"], row) for row in update_rows))
+        await replace_techs(db, ((row["id"], row) for row in update_rows))
+        await reindex_jobs(db, [row["id"] for row in update_rows if touches_search(row)])
+
+    delete_ids = []
+    for index, job_id in enumerate(request.delete):
+        if job_id not in existing or job_id in delete_ids:
+            response.deleted.append(
+                BulkItemResult(index=index, id=job_id, success=False, error="Job not found")
+            )
+            continue
+        delete_ids.append(job_id)
+        response.deleted.append(BulkItemResult(index=index, id=job_id, success=True))
+        changes.append((job_id, "deleted", [existing[job_id]]))
+    if delete_ids:
+        await _delete_jobs(db, delete_ids, change_seq)
+
+    await db.commit()
+
+    for job_id, kind, rows in changes:
+        _publish_change(job_id, kind, rows, change_seq=change_seq)
+    return response
+
+
 async def get_saved_jobs(db: AsyncSession) -> List[JobResponse]:
+    return await _read_through(
+        ("saved", _filters_key(_SAVED_FILTERS), None), lambda: _load_saved_jobs(db)
+    )
+
+
+async def _load_saved_jobs(db: AsyncSession) -> List[JobResponse]:
     result = await db.execute(
         select(Job).where(Job.status == "Saved").order_by(Job.date_applied.desc())
     )
     jobs = result.scalars().all()
 
     return [_job_to_response(job) for job in jobs]
+
+
+async def stream_jobs(
+    db: AsyncSession,
+    columns: Sequence[str],
+    filters: Optional[JobFilters] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield matching jobs as dicts of the given columns from a server-side cursor.
+
+    Only the requested columns are selected, and rows are fetched
+    STREAM_BATCH_SIZE at a time, so memory stays bounded no matter how many
+    jobs match.
+    """
+    stmt = _apply_filters(select(*(getattr(Job, name) for name in columns)), filters)
+    stmt = stmt.order_by(Job.date_applied.desc(), Job.id.desc()).execution_options(
+        yield_per=STREAM_BATCH_SIZE
+    )
+    result = await db.stream(stmt)
+    async for row in result:
+        job = row._asdict()
+        for field in _JSON_FIELDS:
+            if field in job:
+                job[field] = _parse_json_field(job[field]) or []
+        yield job
@@ -0,0 +1,194 @@
+"""Server-Sent Events fan-out of job changes (GET /api/jobs/stream).
+
+Each worker runs one pump task while it has subscribers. When the change bus
+reports a write, the pump reads what is new from the changes feed, formats
+every change as an SSE frame once and puts the frame on each subscriber's
+queue. Event ids are changes feed tokens, so a client that reconnects with
+Last-Event-ID, including one dropped for falling behind, replays what it
+missed from the database before receiving live frames again.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.services.change_feed import ChangePosition, current_position, encode_change_token
+from app.services.events import JobChange, change_bus
+from app.services.job_service import read_changes
+
+logger = logging.getLogger(__name__)
+
+# Changes read from the feed per query, by the pump and by replays
+READ_BATCH_SIZE = 500
+
+HEARTBEAT_FRAME = b": ping\n\n"
+
+_json_payload = TypeAdapter(Any)
+
+
+def format_event(
+    change_seq: int, job_id: int, job: Optional[Dict[str, Any]], kind: Optional[str] = None
+) -> bytes:
+    """One SSE frame; job is the JobResponse dict, or None for a delete.
+
+    The feed only stores a job's latest state, so without kind (the change
+    bus's "created"/"updated") an upsert is sent as job-updated.
+    """
+    if job is None:
+        event, data = "job-deleted", {"id": job_id}
+    else:
+        event, data = ("job-created" if kind == "created" else "job-updated"), job
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+        encode_change_token(change_seq, job_id).encode(),
+        event.encode(),
+        _json_payload.dump_json(data),
+    )
+
+
+class _Subscriber:
+    __slots__ = ("queue",)
+
+    def __init__(self, queue_size: int) -> None:
+        # None tells the subscriber's stream to end
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(queue_size)
+
+
+class JobStream:
+    """The SSE subscribers of this worker and the pump that feeds them."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        heartbeat_seconds: float,
+        session_factory: Callable[[], AsyncSession] = async_session_maker,
+    ) -> None:
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self._session_factory = session_factory
+        self._subscribers: Set[_Subscriber] = set()
+        # Kind of each change announced on the bus that the pump hasn't sent yet
+        self._kinds: Dict[ChangePosition, str] = {}
+        # Everything up to here has been put on the subscribers' queues
+        self._position: Optional[ChangePosition] = None
+        self._pump: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    async def events(self, since: Optional[ChangePosition] = None) -> AsyncIterator[bytes]:
+        """SSE frames for one client: changes after since, then live ones until closed."""
+        subscriber = _Subscriber(self.queue_size)
+        await self._start()
+        # Frames for changes after live_from reach the queue from here on
+        live_from = self._position
+        self._subscribers.add(subscriber)
+        try:
+            if since is not None and since < live_from:
+                async for frame in self._replay(since, live_from):
+                    yield frame
+            while True:
+                frame = await subscriber.queue.get()
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self._unsubscribe(subscriber)
+
+    def on_change(self, change: JobChange) -> None:
+        """Change bus listener: wake the pump, remembering the change's kind."""
+        if self._pump is None:
+            return
+        if change.change_seq:
+            self._kinds[(change.change_seq, change.job_id)] = change.kind
+        self._wake.set()
+
+    async def _start(self) -> None:
+        if self._pump is not None:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._pump is not None:
+                return
+            async with self._session_factory() as db:
+                self._position = await current_position(db)
+            self._kinds.clear()
+            self._wake = asyncio.Event()
+            self._pump = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.heartbeat_seconds)
+            except asyncio.TimeoutError:
+                # Idle: keep connections open, and pick up writes from
+                # workers the change bus doesn't reach
+                self._broadcast(HEARTBEAT_FRAME)
+            self._wake.clear()
+            try:
+                await self._read_new()
+            except Exception:
+                logger.exception("Reading job changes for the stream failed")
+
+    async def _read_new(self) -> None:
+        async with self._session_factory() as db:
+            has_more = True
+            while has_more:
+                entries, has_more = await read_changes(db, self._position, READ_BATCH_SIZE)
+                if not entries:
+                    return
+                # No await between moving the position and queueing its frames,
+                # so a new subscriber sees each change exactly once
+                self._position = entries[-1][:2]
+                for entry in entries:
+                    self._broadcast(format_event(*entry, self._kinds.pop(entry[:2], None)))
+        self._kinds = {key: kind for key, kind in self._kinds.items() if key > self._position}
+
+    async def _replay(
+        self, position: ChangePosition, until: ChangePosition
+    ) -> AsyncIterator[bytes]:
+        async with self._session_factory() as db:
+            has_more = True
+            while has_more:
+                entries, has_more = await read_changes(db, position, READ_BATCH_SIZE)
+                for entry in entries:
+                    if entry[:2] > until:
+                        return
+                    yield format_event(*entry)
+                if not entries:
+                    return
+                position = entries[-1][:2]
+
+    def _broadcast(self, frame: bytes) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                logger.info("Dropping a job stream subscriber that fell behind")
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: _Subscriber) -> None:
+        """Close a stream. Its buffered frames are discarded: the client
+        resumes from the last one it received."""
+        self._subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def _unsubscribe(self, subscriber: _Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and self._pump is not None:
+            self._pump.cancel()
+            self._pump = None
+
+
+job_stream = JobStream(settings.STREAM_QUEUE_SIZE, settings.STREAM_HEARTBEAT_SECONDS)
+
+change_bus.subscribe(job_stream.on_change)
@@ -0,0 +1,158 @@
+"""Full-text index over job title, company and notes.
+
+SQLite uses an FTS5 table (jobs_fts, rowid = job id); PostgreSQL uses a
+job_search side table holding a weighted tsvector under a GIN index. Neither is
+maintained by triggers: the job service write paths call reindex_jobs inside
+their own transactions. job_search rows go with their job on delete (ON DELETE
+CASCADE); a virtual table can't reference jobs, so deletes on SQLite also call
+remove_jobs.
+"""
+
+import re
+from typing import Any, List, Mapping, Optional, Sequence
+
+from sqlalchemy import Select, bindparam, column, func, inspect, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+
+SEARCH_FIELDS = ("title", "company", "notes")
+
+# Relative weight of a match in title, company and notes
+_SQLITE_RANK = "bm25(jobs_fts, 10.0, 5.0, 1.0)"
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    "title, company, notes, tokenize='porter unicode61 remove_diacritics 2')",
+]
+_POSTGRES_DDL = [
+    "CREATE TABLE IF NOT EXISTS job_search ("
+    "job_id INTEGER PRIMARY KEY REFERENCES jobs (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_job_search_document ON job_search USING GIN (document)",
+]
+
+_SQLITE_REINDEX = text(
+    "INSERT OR REPLACE INTO jobs_fts (rowid, title, company, notes) "
+    "SELECT id, title, company, coalesce(notes, '') FROM jobs WHERE id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+_POSTGRES_REINDEX = text(
+    "INSERT INTO job_search (job_id, document) "
+    "SELECT id, "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(notes, '')), 'C') "
+    "FROM jobs WHERE id IN :ids "
+    "ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document"
+).bindparams(bindparam("ids", expanding=True))
+
+_SQLITE_REMOVE = text("DELETE FROM jobs_fts WHERE rowid IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+_POSTGRES_REMOVE = text("DELETE FROM job_search WHERE job_id IN :ids").bindparams(
+    bindparam("ids", expanding=True)
+)
+
+_jobs_fts = table("jobs_fts", column("rowid"))
+_job_search = table("job_search", column("job_id"), column("document"))
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def _is_postgres(name: str) -> bool:
+    return name == "postgresql"
+
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.bind.dialect.name
+
+
+def touches_search(values: Mapping[str, Any]) -> bool:
+    return any(field in values for field in SEARCH_FIELDS)
+
+
+def create_search_index(conn: Connection) -> None:
+    """Create the dialect's index if missing, indexing existing jobs when new."""
+    postgres = _is_postgres(conn.dialect.name)
+    name = "job_search" if postgres else "jobs_fts"
+    exists = conn.dialect.has_table(conn, name)
+    if exists and postgres and not inspect(conn).get_foreign_keys(name):
+        # Created before it cascaded from jobs; it is rebuilt from them anyway
+        conn.execute(text("DROP TABLE job_search"))
+        exists = False
+    for statement in _POSTGRES_DDL if postgres else _SQLITE_DDL:
+        conn.execute(text(statement))
+    if not exists:
+        rebuild_search_index(conn)
+
+
+def rebuild_search_index(conn: Connection) -> int:
+    """Re-index every job in id order, in batches; returns how many."""
+    postgres = _is_postgres(conn.dialect.name)
+    conn.execute(text("DELETE FROM job_search" if postgres else "DELETE FROM jobs_fts"))
+    reindex = _POSTGRES_REINDEX if postgres else _SQLITE_REINDEX
+    last_id = 0
+    total = 0
+    while True:
+        ids = conn.execute(
+            select(Job.id).where(Job.id > last_id).order_by(Job.id).limit(REBUILD_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            return total
+        conn.execute(reindex, {"ids": list(ids)})
+        total += len(ids)
+        last_id = ids[-1]
+
+
+async def reindex_jobs(db: AsyncSession, job_ids: Sequence[int]) -> None:
+    """Refresh the index entries of job_ids from their current rows (one statement)."""
+    if not job_ids:
+        return
+    reindex = _POSTGRES_REINDEX if _is_postgres(dialect_name(db)) else _SQLITE_REINDEX
+    await db.execute(reindex, {"ids": list(job_ids)})
+
+
+async def remove_jobs(db: AsyncSession, job_ids: Sequence[int]) -> None:
+    if not job_ids:
+        return
+    remove = _POSTGRES_REMOVE if _is_postgres(dialect_name(db)) else _SQLITE_REMOVE
+    await db.execute(remove, {"ids": list(job_ids)})
+
+
+def fts5_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last as a prefix.
+
+    Quoting each word keeps FTS5 operators and punctuation in user input inert.
+    """
+    words = re.findall(r"\w+", q.lower())
+    if not words:
+        return ""
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_statement(dialect: str, q: str, columns: List[Any]) -> Optional[Select]:
+    """SELECT columns of jobs matching q, best match first (ties by id).
+
+    Returns None when q has no searchable words.
+    """
+    if _is_postgres(dialect):
+        query = func.websearch_to_tsquery("english", q)
+        return (
+            select(*columns)
+            .select_from(_job_search.join(Job, Job.id == _job_search.c.job_id))
+            .where(_job_search.c.document.op("@@")(query))
+            .order_by(func.ts_rank_cd(_job_search.c.document, query).desc(), Job.id)
+        )
+
+    match = fts5_query(q)
+    if not match:
+        return None
+    return (
+        select(*columns)
+        .select_from(_jobs_fts.join(Job, Job.id == _jobs_fts.c.rowid))
+        .where(text("jobs_fts MATCH :match").bindparams(match=match))
+        .order_by(text(_SQLITE_RANK), Job.id)
+    )
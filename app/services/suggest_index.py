@@ -0,0 +1,180 @@
+"""In-memory prefix indexes behind company/title autocomplete.
+
+Each field keeps its distinct values twice: sorted by casefolded value, so a
+prefix maps to one contiguous bisect range, and sorted by count, so a short
+prefix matching most values can stop at the first `limit` hits instead of
+ranking its whole range. It also keeps the current value of every job.
+
+Indexes are loaded on first use and then follow job changes from the change
+bus; knowing each job's current value lets an update that only reports new
+values (UPDATE ... RETURNING) still move one count from the old value to the
+new one. Past SUGGEST_REFRESH_SECONDS an index is rebuilt in the background
+while requests keep using the old one.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.job import Job
+from app.services.events import JobChange, change_bus
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_FIELDS = ("company", "title")
+
+# Sorts after every character, closing the bisect range of a prefix
+_PREFIX_END = "\U0010ffff"
+# Prefix ranges wider than this are answered by walking values most used first
+_RANK_RANGE_MAX = 256
+
+
+class PrefixIndex:
+    """Distinct values of one job field with the number of jobs using each."""
+
+    def __init__(self, rows: Iterable[Tuple[int, Optional[str]]] = ()) -> None:
+        self._counts: Dict[str, int] = {}
+        self._job_values: Dict[int, str] = {}
+        for job_id, value in rows:
+            if value:
+                self._job_values[job_id] = value
+                self._counts[value] = self._counts.get(value, 0) + 1
+        self._keys: List[Tuple[str, str]] = sorted(
+            (value.casefold(), value) for value in self._counts
+        )
+        self._by_count: List[Tuple[int, str, str]] = sorted(
+            (-count, value.casefold(), value) for value, count in self._counts.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _recount(self, value: str, delta: int) -> None:
+        folded = value.casefold()
+        count = self._counts.get(value, 0)
+        if count:
+            del self._by_count[bisect_left(self._by_count, (-count, folded, value))]
+        else:
+            insort(self._keys, (folded, value))
+        count += delta
+        if count:
+            self._counts[value] = count
+            insort(self._by_count, (-count, folded, value))
+        else:
+            del self._counts[value]
+            del self._keys[bisect_left(self._keys, (folded, value))]
+
+    def set_job(self, job_id: int, value: Optional[str]) -> None:
+        old = self._job_values.get(job_id)
+        if old == (value or None):
+            return
+        if old is not None:
+            self._recount(old, -1)
+            del self._job_values[job_id]
+        if value:
+            self._recount(value, 1)
+            self._job_values[job_id] = value
+
+    def drop_job(self, job_id: int) -> None:
+        self.set_job(job_id, None)
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """Values starting with prefix (case-insensitive), most used first."""
+        folded = prefix.casefold()
+        lo = bisect_left(self._keys, (folded,))
+        hi = bisect_left(self._keys, (folded + _PREFIX_END,), lo)
+        if hi - lo > _RANK_RANGE_MAX:
+            wanted = min(limit, hi - lo)
+            # Matches are dense in a wide range, so walking values most used
+            # first usually ends early; stop once it costs more than ranking
+            ranked = []
+            for entry in islice(self._by_count, hi - lo):
+                if entry[1].startswith(folded):
+                    ranked.append(entry)
+                    if len(ranked) == wanted:
+                        return [(value, -negative) for negative, _, value in ranked]
+        ranked = heapq.nsmallest(
+            limit,
+            ((-self._counts[value], key, value) for key, value in self._keys[lo:hi]),
+        )
+        return [(value, -negative) for negative, _, value in ranked]
+
+
+class SuggestIndexes:
+    """The prefix index of each SUGGEST_FIELDS field, loaded lazily."""
+
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._indexes: Dict[str, PrefixIndex] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._locks = {field: asyncio.Lock() for field in SUGGEST_FIELDS}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        # Bumped by every change so a load that raced a write isn't kept
+        self._generation = 0
+
+    def _stale(self, field: str) -> bool:
+        return self.refresh_seconds > 0 and (
+            time.monotonic() - self._loaded_at[field] > self.refresh_seconds
+        )
+
+    async def get(self, db: AsyncSession, field: str) -> PrefixIndex:
+        index = self._indexes.get(field)
+        if index is None:
+            async with self._locks[field]:
+                index = self._indexes.get(field)
+                if index is None:
+                    # Nothing to serve yet, so the first request waits for it
+                    return await self._load(db, field)
+        if self._stale(field) and field not in self._refreshes:
+            task = asyncio.create_task(self._refresh(field))
+            self._refreshes[field] = task
+            task.add_done_callback(lambda _: self._refreshes.pop(field, None))
+        return index
+
+    async def _load(self, db: AsyncSession, field: str) -> PrefixIndex:
+        generation = self._generation
+        column = getattr(Job, field)
+        result = await db.execute(select(Job.id, column).where(column.is_not(None)))
+        index = PrefixIndex(result.all())
+        if generation == self._generation:
+            self._indexes[field] = index
+            self._loaded_at[field] = time.monotonic()
+        # After a race the snapshot only serves this request: the next one
+        # loads again, or refreshes again an index that followed the change
+        return index
+
+    async def _refresh(self, field: str) -> None:
+        """Rebuild field's index on a session of its own, off the request."""
+        try:
+            async with self._locks[field]:
+                async with async_session_maker() as db:
+                    await self._load(db, field)
+        except Exception:
+            logger.exception("Refreshing the %s suggest index failed", field)
+
+    def apply(self, change: JobChange) -> None:
+        self._generation += 1
+        for field, index in self._indexes.items():
+            if change.kind == "deleted":
+                index.drop_job(change.job_id)
+            elif change.rows:
+                index.set_job(change.job_id, change.rows[-1].get(field))
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._indexes.clear()
+        self._loaded_at.clear()
+
+
+suggest_indexes = SuggestIndexes(settings.SUGGEST_REFRESH_SECONDS)
+
+change_bus.subscribe(suggest_indexes.apply)
@@ -0,0 +1,122 @@
+"""Tech-stack filters and facet counts.
+
+The job_tech table (one row per job and technology) backs facet counts on
+every backend and tech filters on SQLite. On PostgreSQL the filters use the GIN
+index on jobs.tech_stack instead. The job service write paths keep job_tech in
+step with tech_stack.
+"""
+
+import json
+from typing import Any, Iterable, List, Mapping, Sequence, Tuple
+
+from sqlalchemy import Boolean, delete, func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.models.job import Job, JobTech
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def tech_list(value: Any) -> List[str]:
+    """Distinct technologies of a tech_stack value, in their original order."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    seen = {}
+    for tech in value or []:
+        if isinstance(tech, str) and tech:
+            seen.setdefault(tech, None)
+    return list(seen)
+
+
+class TechMatch(ColumnElement):
+    """WHERE clause for "job uses any/all of these technologies".
+
+    Compiles to a job_tech subquery by default and to GIN-indexable JSONB
+    operators on PostgreSQL, so callers stay dialect-agnostic.
+    """
+
+    type = Boolean()
+    inherit_cache = False
+
+    def __init__(self, techs: Sequence[str], match_all: bool) -> None:
+        self.techs = list(dict.fromkeys(techs))
+        self.match_all = match_all
+
+    def self_group(self, against=None) -> "TechMatch":
+        # Already a predicate; don't let non-native-boolean dialects add "= 1"
+        return self
+
+
+@compiles(TechMatch)
+def _compile_tech_match(element: TechMatch, compiler, **kw) -> str:
+    job_ids = select(JobTech.job_id).where(JobTech.tech.in_(element.techs))
+    if element.match_all:
+        job_ids = job_ids.group_by(JobTech.job_id).having(
+            func.count() == len(element.techs)
+        )
+    return compiler.process(Job.id.in_(job_ids), **kw)
+
+
+@compiles(TechMatch, "postgresql")
+def _compile_tech_match_postgresql(element: TechMatch, compiler, **kw) -> str:
+    if element.match_all:
+        clause = Job.tech_stack.contains(element.techs)
+    else:
+        clause = Job.tech_stack.has_any(postgresql.array(element.techs))
+    return compiler.process(clause, **kw)
+
+
+def _tech_rows(job_id: int, values: Mapping[str, Any]) -> List[dict]:
+    return [
+        {"tech": tech, "job_id": job_id} for tech in tech_list(values.get("tech_stack"))
+    ]
+
+
+async def add_techs(db: AsyncSession, jobs: Iterable[Tuple[int, Mapping[str, Any]]]) -> None:
+    rows = [row for job_id, values in jobs for row in _tech_rows(job_id, values)]
+    if rows:
+        await db.execute(insert(JobTech), rows)
+
+
+async def replace_techs(
+    db: AsyncSession, jobs: Iterable[Tuple[int, Mapping[str, Any]]]
+) -> None:
+    """Re-index jobs whose new values include tech_stack; others cost nothing."""
+    jobs = [(job_id, values) for job_id, values in jobs if "tech_stack" in values]
+    if not jobs:
+        return
+    await drop_techs(db, [job_id for job_id, _ in jobs])
+    await add_techs(db, jobs)
+
+
+async def drop_techs(db: AsyncSession, job_ids: Sequence[int]) -> None:
+    if job_ids:
+        await db.execute(delete(JobTech).where(JobTech.job_id.in_(job_ids)))
+
+
+def rebuild_tech_index(conn: Connection) -> int:
+    """Rebuild job_tech from jobs.tech_stack in id-ordered batches; returns rows."""
+    conn.execute(delete(JobTech))
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(Job.id, Job.tech_stack)
+            .where(Job.id > last_id)
+            .order_by(Job.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return total
+        techs = [tech for row in rows for tech in _tech_rows(row.id, row._asdict())]
+        if techs:
+            conn.execute(insert(JobTech), techs)
+        total += len(techs)
+        last_id = rows[-1].id
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.upload import UploadBlob
+from app.services.upload_refs import referenced_paths
+from app.utils.export_store import exports_dir
+from app.utils.file_upload import get_upload_path
+from app.utils.upload_sessions import sessions_dir
+
+logger = logging.getLogger(__name__)
+
+# Candidate files checked against upload_refs per query
+GC_BATCH_SIZE = 500
+
+
+@dataclass
+class UploadGcReport:
+    scanned_files: int = 0
+    orphaned_files: int = 0
+    expired_sessions: int = 0
+    reclaimed_bytes: int = 0
+    dry_run: bool = False
+
+
+def _old_files(upload_dir: Path, cutoff: float) -> Tuple[int, List[Tuple[str, int]]]:
+    """Walk upload_dir; return (files seen, [(relative path, size)] older than cutoff).
+
+    Resumable upload sessions and background exports are skipped; they
+    expire separately.
+    """
+    skip = {sessions_dir(upload_dir), exports_dir(upload_dir)}
+    scanned = 0
+    old = []
+    pending = [upload_dir]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if Path(entry.path) not in skip:
+                        pending.append(Path(entry.path))
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                scanned += 1
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff:
+                    old.append((Path(entry.path).relative_to(upload_dir).as_posix(), stat.st_size))
+    return scanned, old
+
+
+def _remove_files(
+    upload_dir: Path, files: List[Tuple[str, int]], cutoff: float
+) -> Tuple[int, int]:
+    """Unlink files still older than cutoff; return (count, bytes) removed.
+
+    The mtime is checked again right before each unlink: a deduplicated
+    re-upload since the scan touched the file and handed out its URL.
+    """
+    removed = removed_bytes = 0
+    for path, size in files:
+        target = upload_dir / path
+        try:
+            if target.stat().st_mtime >= cutoff:
+                continue
+            target.unlink()
+        except FileNotFoundError:
+            continue
+        removed += 1
+        removed_bytes += size
+        # Drop shard directories left empty
+        parent = target.parent
+        while parent != upload_dir:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+    return removed, removed_bytes
+
+
+def _expire_sessions(upload_dir: Path, cutoff: float, dry_run: bool) -> Tuple[int, int]:
+    """Remove resumable sessions untouched since cutoff; return (count, bytes)."""
+    root = sessions_dir(upload_dir)
+    if not root.is_dir():
+        return 0, 0
+    count = size = 0
+    for session_dir in root.iterdir():
+        # Writing a chunk renames a file into the dir, which bumps its mtime
+        if not session_dir.is_dir() or session_dir.stat().st_mtime >= cutoff:
+            continue
+        count += 1
+        size += sum(f.stat().st_size for f in session_dir.iterdir() if f.is_file())
+        if not dry_run:
+            shutil.rmtree(session_dir, ignore_errors=True)
+    return count, size
+
+
+async def collect_orphaned_uploads(
+    db: AsyncSession, grace_seconds: Optional[float] = None, dry_run: bool = False
+) -> UploadGcReport:
+    """Delete uploads no job references, once older than the grace period.
+
+    References are looked up in the upload_refs index in batches, so the cost
+    is proportional to the number of old files, never to the number of jobs.
+    The grace period protects files uploaded for a job that hasn't been saved
+    yet; deduplicated re-uploads refresh a file's mtime for the same reason.
+    """
+    if grace_seconds is None:
+        grace_seconds = settings.UPLOAD_GC_GRACE_SECONDS
+    upload_dir = get_upload_path()
+    cutoff = time.time() - grace_seconds
+    report = UploadGcReport(dry_run=dry_run)
+
+    report.scanned_files, candidates = await run_in_threadpool(_old_files, upload_dir, cutoff)
+    for start in range(0, len(candidates), GC_BATCH_SIZE):
+        batch = candidates[start : start + GC_BATCH_SIZE]
+        referenced = await referenced_paths(db, [path for path, _ in batch])
+        orphans = [(path, size) for path, size in batch if path not in referenced]
+        if not orphans:
+            continue
+        if dry_run:
+            report.orphaned_files += len(orphans)
+            report.reclaimed_bytes += sum(size for _, size in orphans)
+            continue
+        # Forget content-addressed entries first: a crash in between leaves an
+        # unlisted file for the next run rather than a listing with no file.
+        # Entries re-uploaded since the scan are kept.
+        await db.execute(
+            delete(UploadBlob).where(
+                UploadBlob.path.in_([path for path, _ in orphans]),
+                UploadBlob.last_uploaded_at < datetime.utcfromtimestamp(cutoff),
+            )
+        )
+        await db.commit()
+        removed, removed_bytes = await run_in_threadpool(
+            _remove_files, upload_dir, orphans, cutoff
+        )
+        report.orphaned_files += removed
+        report.reclaimed_bytes += removed_bytes
+
+    expired, expired_bytes = await run_in_threadpool(
+        _expire_sessions, upload_dir, cutoff, dry_run
+    )
+    report.expired_sessions = expired
+    report.reclaimed_bytes += expired_bytes
+    return report
+
+
+async def run_upload_gc(interval_seconds: float) -> None:
+    """Sweep orphaned uploads every interval_seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with async_session_maker() as db:
+                report = await collect_orphaned_uploads(db)
+            logger.info(
+                "Upload GC removed %d files and %d sessions, reclaiming %d bytes",
+                report.orphaned_files,
+                report.expired_sessions,
+                report.reclaimed_bytes,
+            )
+        except Exception:
+            logger.exception("Upload GC failed")
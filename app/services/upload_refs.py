@@ -0,0 +1,132 @@
+import json
+from posixpath import normpath
+from typing import Any, Iterable, List, Mapping, Optional, Set, Tuple
+from urllib.parse import unquote, urlparse
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.models.upload import UploadRef
+
+# Job fields that may point at files under /uploads
+UPLOAD_FIELDS = ("screenshot_url", "resume_url", "cover_letter_url", "attachments")
+
+_UPLOADS_PREFIX = "/uploads/"
+REBUILD_BATCH_SIZE = 1000
+
+
+def upload_path_from_url(url: Any) -> Optional[str]:
+    """Return the path relative to UPLOAD_DIR for an /uploads URL, else None.
+
+    Accepts both "/uploads/x.pdf" and absolute URLs to this server.
+    """
+    if not isinstance(url, str):
+        return None
+    path = unquote(urlparse(url).path)
+    if not path.startswith(_UPLOADS_PREFIX):
+        return None
+    relative = normpath(path[len(_UPLOADS_PREFIX):])
+    if relative in (".", "") or relative.startswith(".."):
+        return None
+    return relative
+
+
+def _field_paths(field: str, value: Any) -> Set[str]:
+    if field != "attachments":
+        path = upload_path_from_url(value)
+        return {path} if path else set()
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return set()
+    paths = set()
+    for item in value or []:
+        # Attachments are either URL strings or {"name", "url"} objects
+        url = item.get("url") if isinstance(item, dict) else item
+        path = upload_path_from_url(url)
+        if path:
+            paths.add(path)
+    return paths
+
+
+def _ref_rows(job_id: int, values: Mapping[str, Any]) -> List[dict]:
+    return [
+        {"job_id": job_id, "field": field, "path": path}
+        for field in UPLOAD_FIELDS
+        if field in values
+        for path in sorted(_field_paths(field, values[field]))
+    ]
+
+
+def touches_uploads(values: Mapping[str, Any]) -> bool:
+    return any(field in values for field in UPLOAD_FIELDS)
+
+
+def references_uploads(values: Mapping[str, Any]) -> bool:
+    return any(_field_paths(field, values[field]) for field in UPLOAD_FIELDS if field in values)
+
+
+async def add_refs(db: AsyncSession, jobs: Iterable[Tuple[int, Mapping[str, Any]]]) -> None:
+    """Record the uploads referenced by newly created jobs (no-op if none)."""
+    rows = [row for job_id, values in jobs for row in _ref_rows(job_id, values)]
+    if rows:
+        await db.execute(insert(UploadRef), rows)
+
+
+async def replace_refs(
+    db: AsyncSession, jobs: Iterable[Tuple[int, Mapping[str, Any]]]
+) -> None:
+    """Re-point the upload fields present in each job's new values.
+
+    Fields an update didn't touch keep their refs; updates that touch no
+    upload field cost nothing.
+    """
+    jobs = [(job_id, values) for job_id, values in jobs if touches_uploads(values)]
+    if not jobs:
+        return
+    touched = [
+        (job_id, field) for job_id, values in jobs for field in UPLOAD_FIELDS if field in values
+    ]
+    await db.execute(
+        delete(UploadRef).where(tuple_(UploadRef.job_id, UploadRef.field).in_(touched))
+    )
+    await add_refs(db, jobs)
+
+
+async def referenced_paths(db: AsyncSession, paths: List[str]) -> Set[str]:
+    """Which of paths at least one job still references (index lookups only)."""
+    if not paths:
+        return set()
+    result = await db.execute(
+        select(UploadRef.path).where(UploadRef.path.in_(paths)).distinct()
+    )
+    return set(result.scalars().all())
+
+
+def rebuild_refs(conn: Connection) -> int:
+    """Rebuild upload_refs from the jobs table; returns the number of refs.
+
+    This is the one full pass over jobs, for databases created before the index
+    existed. It walks jobs in id order in batches so memory stays flat.
+    """
+    conn.execute(delete(UploadRef))
+    columns = [getattr(Job, field) for field in UPLOAD_FIELDS]
+    last_id = 0
+    total = 0
+    while True:
+        rows = conn.execute(
+            select(Job.id, *columns)
+            .where(Job.id > last_id)
+            .order_by(Job.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return total
+        refs = [ref for row in rows for ref in _ref_rows(row.id, row._asdict())]
+        if refs:
+            conn.execute(insert(UploadRef), refs)
+        total += len(refs)
+        last_id = rows[-1].id
@@ -0,0 +1,158 @@
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.upload import UploadBlob
+from app.utils.file_upload import (
+    SavedUpload,
+    content_addressed_name,
+    get_upload_path,
+    hash_upload_file,
+    place_file,
+    save_upload_file,
+    unique_filename,
+    write_upload_file,
+)
+from app.utils.upload_sessions import (
+    UploadSession,
+    assemble_session,
+    create_session,
+    discard_session,
+    load_session,
+)
+
+
+async def _claim_blob(db: AsyncSession, sha256: str) -> Optional[str]:
+    """Mark a known file as just uploaded and return its path, or None."""
+    result = await db.execute(
+        update(UploadBlob)
+        .where(UploadBlob.sha256 == sha256)
+        .values(last_uploaded_at=datetime.utcnow())
+        .returning(UploadBlob.path)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+def _touch(path: Path) -> bool:
+    """Refresh mtime so the upload GC grace period restarts; False if missing."""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+async def _register_blob(
+    db: AsyncSession, upload_dir: Path, sha256: str, path: str, size: int
+) -> str:
+    """Add a newly written file to the manifest; return the path to serve."""
+    try:
+        await db.execute(
+            insert(UploadBlob).values(sha256=sha256, path=path, size=size)
+        )
+    except IntegrityError:
+        # A concurrent upload of the same content registered it first
+        await db.rollback()
+        existing = await _claim_blob(db, sha256)
+        if existing is not None and existing != path:
+            (upload_dir / path).unlink(missing_ok=True)
+            return existing
+    return path
+
+
+async def _store_content_addressed(
+    db: AsyncSession,
+    upload_dir: Path,
+    sha256: str,
+    size: int,
+    filename: Optional[str],
+    write: Callable[[Path], Awaitable[object]],
+) -> SavedUpload:
+    """Reuse the stored copy of sha256 if there is one, else write(dest) it."""
+    path = await _claim_blob(db, sha256)
+    if path is not None and await run_in_threadpool(_touch, upload_dir / path):
+        await db.commit()
+        return SavedUpload(filename=path, size=size, sha256=sha256, deduplicated=True)
+
+    # New content, or a manifest entry whose file was removed: (re)write it
+    claimed = path is not None
+    if not claimed:
+        path = content_addressed_name(sha256, filename)
+    await write(upload_dir / path)
+    if not claimed:
+        path = await _register_blob(db, upload_dir, sha256, path, size)
+    await db.commit()
+    return SavedUpload(filename=path, size=size, sha256=sha256)
+
+
+async def store_upload(
+    db: AsyncSession, upload_file: UploadFile, max_size: Optional[int] = None
+) -> SavedUpload:
+    """Store an upload, deduplicating by content when UPLOAD_CONTENT_ADDRESSED is on.
+
+    Content-addressed files live at <UPLOAD_DIR>/ab/cd/<sha256><ext>. The upload
+    is hashed first; if the upload_blobs manifest already has that hash, the
+    existing path is returned without touching disk.
+    """
+    upload_dir = get_upload_path()
+    if not settings.UPLOAD_CONTENT_ADDRESSED:
+        return await save_upload_file(upload_file, str(upload_dir), max_size=max_size)
+
+    size, sha256 = await hash_upload_file(upload_file, max_size=max_size)
+    return await _store_content_addressed(
+        db,
+        upload_dir,
+        sha256,
+        size,
+        upload_file.filename,
+        lambda dest: write_upload_file(upload_file, dest, max_size=max_size),
+    )
+
+
+async def create_upload_session(filename: Optional[str], size: int) -> UploadSession:
+    return await run_in_threadpool(create_session, get_upload_path(), filename, size)
+
+
+async def get_upload_session(session_id: str) -> UploadSession:
+    return await run_in_threadpool(load_session, get_upload_path(), session_id)
+
+
+async def cancel_upload_session(session_id: str) -> None:
+    await run_in_threadpool(discard_session, get_upload_path(), session_id)
+
+
+async def finalize_upload_session(db: AsyncSession, session_id: str) -> SavedUpload:
+    """Assemble a complete resumable upload and store it like a regular upload.
+
+    The chunks are concatenated on disk (never in memory) and the result is
+    renamed into UPLOAD_DIR, or dropped in favour of the existing copy when
+    content-addressed storage already has it. The session is removed once the
+    file is stored; on failure it is kept so finalize can be retried.
+    """
+    upload_dir = get_upload_path()
+    session = await run_in_threadpool(load_session, upload_dir, session_id)
+    assembled, size, sha256 = await run_in_threadpool(assemble_session, upload_dir, session)
+    if settings.UPLOAD_CONTENT_ADDRESSED:
+        saved = await _store_content_addressed(
+            db,
+            upload_dir,
+            sha256,
+            size,
+            session.filename,
+            lambda dest: run_in_threadpool(place_file, assembled, dest),
+        )
+    else:
+        path = unique_filename(session.filename)
+        await run_in_threadpool(place_file, assembled, upload_dir / path)
+        saved = SavedUpload(filename=path, size=size, sha256=sha256)
+    await run_in_threadpool(discard_session, upload_dir, session_id)
+    return saved
@@ -0,0 +1,193 @@
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+# Already-compressed or long-lived streams that gain nothing from re-encoding
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/pdf",
+    "application/zip",
+    "application/zstd",
+    "audio/",
+    "image/",
+    "text/event-stream",
+    "video/",
+)
+
+# Chunks at least this large are compressed off the event loop
+THREAD_MINIMUM_SIZE = 256 * 1024
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+class _ZstdEncoder:
+    name = "zstd"
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        flush_mode = (
+            zstandard.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+
+def available_encodings() -> List[str]:
+    """Encodings this process can produce, in server preference order."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, or None."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best: Optional[Tuple[float, str]] = None
+    for coding in available_encodings():
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > 0 and (best is None or q > best[0]):
+            best = (q, coding)
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    """Compress responses with gzip or zstd according to Accept-Encoding.
+
+    Bodies smaller than minimum_size are sent as-is. Streaming responses are
+    compressed chunk by chunk and flushed after each one, so clients receive
+    data as it is produced and nothing is buffered beyond the current chunk.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def make_encoder(self, encoding: str):
+        if encoding == "zstd":
+            return _ZstdEncoder(self.zstd_level)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the start message until the first body chunk decides the headers
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 206, 304)
+                or content_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self._send(message)
+            return
+
+        if message_type == "http.response.pathsend" and self.start_message is not None:
+            # Zero-copy file body: the server sends the file, so leave it as is
+            self.passthrough = True
+            start, self.start_message = self.start_message, None
+            await self._send(start)
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self.encoder = self.middleware.make_encoder(self.encoding)
+            headers["Content-Encoding"] = self.encoding
+            # The encoded bytes differ, so a strong validator no longer holds
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            body = await self._encode(body, final=not more_body)
+            if not more_body:
+                headers["Content-Length"] = str(len(body))
+            await self._send(start)
+        else:
+            body = await self._encode(body, final=not more_body)
+
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+
+    async def _encode(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self.encoder.encode, body, final)
+        return self.encoder.encode(body, final)
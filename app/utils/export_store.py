@@ -0,0 +1,150 @@
+"""On-disk state for background exports.
+
+An export lives under <UPLOAD_DIR>/.exports/ as <id>.json, its state, plus
+<id>.<format>, the finished file. The id is a hash of everything the output
+depends on, so identical requests share one export, across worker processes
+too. Files are written under a temporary name and renamed into place, so
+readers never see a partial state or export file.
+
+The state file's mtime doubles as a heartbeat: the worker generating an
+export touches it periodically, so any worker can tell a live export from one
+whose worker went away.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Optional
+
+EXPORTS_DIRNAME = ".exports"
+_STATE_SUFFIX = ".json"
+_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ExportNotFound(LookupError):
+    pass
+
+
+@dataclass(frozen=True)
+class ExportRecord:
+    id: str
+    format: str
+    # Download name, e.g. saved-jobs-2025-02-20.csv
+    filename: str
+    status: str  # "pending" | "running" | "done" | "failed"
+    created_at: float
+    finished_at: Optional[float] = None
+    rows: Optional[int] = None
+    size: Optional[int] = None
+    error: Optional[str] = None
+
+
+def exports_dir(upload_dir: Path) -> Path:
+    return upload_dir / EXPORTS_DIRNAME
+
+
+def make_export_id(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()[:32]
+
+
+def _state_path(upload_dir: Path, export_id: str) -> Path:
+    if not _ID.match(export_id):
+        raise ExportNotFound(export_id)
+    return exports_dir(upload_dir) / f"{export_id}{_STATE_SUFFIX}"
+
+
+def artifact_path(upload_dir: Path, record: ExportRecord) -> Path:
+    return exports_dir(upload_dir) / f"{record.id}.{record.format}"
+
+
+def _write_temp(upload_dir: Path, record: ExportRecord) -> Path:
+    directory = exports_dir(upload_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    temp_path = directory / f".{uuid.uuid4().hex}.tmp"
+    temp_path.write_text(json.dumps(asdict(record)))
+    return temp_path
+
+
+def create_export(upload_dir: Path, record: ExportRecord) -> bool:
+    """Store a new export's state; False if one with its id already exists."""
+    temp_path = _write_temp(upload_dir, record)
+    try:
+        # link() fails if the target exists, so one of two racing workers wins
+        os.link(temp_path, _state_path(upload_dir, record.id))
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def save_export(upload_dir: Path, record: ExportRecord) -> None:
+    _write_temp(upload_dir, record).replace(_state_path(upload_dir, record.id))
+
+
+_RECORD_FIELDS = {f.name for f in fields(ExportRecord)}
+
+
+def load_export(upload_dir: Path, export_id: str) -> ExportRecord:
+    try:
+        state = json.loads(_state_path(upload_dir, export_id).read_text())
+    except FileNotFoundError:
+        raise ExportNotFound(export_id)
+    # Ignore fields older versions stored
+    return ExportRecord(**{k: v for k, v in state.items() if k in _RECORD_FIELDS})
+
+
+def touch_export(upload_dir: Path, export_id: str) -> None:
+    """Heartbeat: mark the export as still being generated."""
+    try:
+        os.utime(_state_path(upload_dir, export_id))
+    except FileNotFoundError:
+        pass
+
+
+def export_age(upload_dir: Path, export_id: str) -> float:
+    """Seconds since the export's state was last saved or touched."""
+    try:
+        return time.time() - _state_path(upload_dir, export_id).stat().st_mtime
+    except FileNotFoundError:
+        raise ExportNotFound(export_id)
+
+
+def expire_exports(upload_dir: Path, max_age_seconds: float) -> int:
+    """Remove exports whose state hasn't changed in max_age_seconds; return how many.
+
+    An export's file goes with its state file, whatever its own mtime, so a
+    "done" state never outlives its file.
+    """
+    directory = exports_dir(upload_dir)
+    if not directory.is_dir():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    expired = 0
+    for path in directory.iterdir():
+        try:
+            if path.stat().st_mtime >= cutoff:
+                continue
+        except FileNotFoundError:
+            continue
+        if path.name.startswith(".") or path.suffix != _STATE_SUFFIX:
+            # Leftovers of interrupted writes, and files whose state is gone
+            if path.name.startswith(".") or not _state_path(upload_dir, path.stem).exists():
+                path.unlink(missing_ok=True)
+            continue
+        try:
+            record = load_export(upload_dir, path.stem)
+        except (ExportNotFound, ValueError, TypeError):
+            record = None
+        # State first: a crash in between leaves an unlisted file for the next
+        # run rather than a "done" state with no file
+        path.unlink(missing_ok=True)
+        if record is not None:
+            artifact_path(upload_dir, record).unlink(missing_ok=True)
+        expired += 1
+    return expired
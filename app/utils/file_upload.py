@@ -1,12 +1,39 @@
+import hashlib
+import os
 import random
 import string
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
 
 from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
 
 from app.config import settings
 
+# Bytes copied per read/write; bounds memory per upload regardless of file size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised while streaming once an upload exceeds the configured maximum."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(f"File exceeds the maximum upload size of {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass(frozen=True)
+class SavedUpload:
+    # Path relative to the upload dir
+    filename: str
+    size: int
+    sha256: str
+    # True when an identical file was already stored and nothing was written
+    deduplicated: bool = False
+
 
 def get_upload_path() -> Path:
     upload_dir = Path(settings.UPLOAD_DIR).resolve()
@@ -14,19 +41,103 @@ def get_upload_path() -> Path:
     return upload_dir
 
 
-def save_upload_file(upload_file: UploadFile, destination_dir: str) -> str:
+def unique_filename(original: Optional[str]) -> str:
     timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
     random_suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=6))
 
-    extension = Path(upload_file.filename).suffix if upload_file.filename else ""
+    extension = Path(original).suffix if original else ""
+
+    return f"{timestamp}_{random_suffix}{extension}"
+
+
+def content_addressed_name(sha256: str, original: Optional[str]) -> str:
+    """Path relative to the upload dir for a file keyed by its hash.
+
+    Two levels of two-hex-digit shards keep any one directory small.
+    """
+    extension = Path(original).suffix.lower() if original else ""
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def _hash_stream(source: BinaryIO, max_size: Optional[int]) -> Tuple[int, str]:
+    """Return (size, sha256) of source without writing it anywhere, then rewind."""
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise UploadTooLargeError(max_size)
+        digest.update(chunk)
+    source.seek(0)
+    return size, digest.hexdigest()
 
-    unique_filename = f"{timestamp}_{random_suffix}{extension}"
 
-    dest_path = Path(destination_dir) / unique_filename
+def _stream_to_disk(source: BinaryIO, dest_path: Path, max_size: Optional[int]) -> SavedUpload:
+    """Copy source to dest_path chunk by chunk, hashing as it goes.
+
+    Data lands in a temporary ".part" file that is renamed into place only once
+    complete, so a rejected or failed upload never leaves a partial file behind.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    # Unique per writer: identical content-addressed uploads may race here
+    part_path = dest_path.with_name(f"{dest_path.name}.{uuid.uuid4().hex[:8]}.part")
+    try:
+        with open(part_path, "wb") as out:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                out.write(chunk)
+        os.replace(part_path, dest_path)
+    except BaseException:
+        part_path.unlink(missing_ok=True)
+        raise
+    return SavedUpload(filename=dest_path.name, size=size, sha256=digest.hexdigest())
+
+
+def _check_declared_size(upload_file: UploadFile, max_size: Optional[int]) -> None:
+    if max_size is not None and upload_file.size is not None and upload_file.size > max_size:
+        raise UploadTooLargeError(max_size)
+
+
+async def save_upload_file(
+    upload_file: UploadFile,
+    destination_dir: str,
+    max_size: Optional[int] = None,
+) -> SavedUpload:
+    """Stream an upload to destination_dir under a unique name.
+
+    All file I/O runs in the threadpool, so large or concurrent uploads don't
+    block the event loop. Raises UploadTooLargeError past max_size bytes.
+    """
+    _check_declared_size(upload_file, max_size)
+    return await write_upload_file(
+        upload_file, Path(destination_dir) / unique_filename(upload_file.filename), max_size
+    )
+
+
+def place_file(source: Path, dest_path: Path) -> None:
+    """Atomically move an already-written file into the upload dir."""
+    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(source, dest_path)
+
+
+async def write_upload_file(
+    upload_file: UploadFile, dest_path: Path, max_size: Optional[int] = None
+) -> SavedUpload:
+    """Stream an upload to dest_path; SavedUpload.filename is the bare file name."""
     dest_path.parent.mkdir(parents=True, exist_ok=True)
+    return await run_in_threadpool(_stream_to_disk, upload_file.file, dest_path, max_size)
+
 
-    with open(dest_path, "wb") as f:
-        content = upload_file.file.read()
-        f.write(content)
+async def hash_upload_file(
+    upload_file: UploadFile, max_size: Optional[int] = None
+) -> Tuple[int, str]:
+    """Return (size, sha256) of an upload by reading it once, without writing it.
 
-    return unique_filename
+    Lets content-addressed storage skip the disk write for files it already has.
+    """
+    _check_declared_size(upload_file, max_size)
+    return await run_in_threadpool(_hash_stream, upload_file.file, max_size)
@@ -0,0 +1,18 @@
+import base64
+import json
+from typing import Any
+
+
+def encode_token(value: Any) -> str:
+    """Encode a JSON value as an opaque URL-safe token (cursors, feed positions)."""
+    raw = json.dumps(value, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Any:
+    """Decode a token produced by encode_token. Raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid token") from e
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+from typing import Callable
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.file_upload import UploadTooLargeError
+
+# Room for multipart boundaries and part headers on top of the file itself;
+# the file's exact size is still checked when it is written out
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """Cut off request bodies to path once they exceed max_size() bytes.
+
+    Starlette reads a whole multipart body into a spooled temporary file
+    before the endpoint runs, so a check in the endpoint only comes after
+    every byte was received and written out. This one rejects an oversized
+    Content-Length before reading anything and counts the body as it
+    arrives, answering 413 as soon as the limit is passed.
+    """
+
+    def __init__(self, app: ASGIApp, path: str, max_size: Callable[[], int]) -> None:
+        self.app = app
+        self.path = path
+        # Read per request, so a changed setting applies without a restart
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        max_size = self.max_size()
+        limit = max_size + MULTIPART_OVERHEAD_BYTES
+        detail = str(UploadTooLargeError(max_size))
+        declared = Headers(scope=scope).get("content-length", "")
+        if declared.isdigit() and int(declared) > limit:
+            response = JSONResponse(
+                {"detail": detail}, status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+            )
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing as-is
+                    raise HTTPException(
+                        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE, detail=detail
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,211 @@
+"""On-disk state for resumable uploads.
+
+A session is a directory under <UPLOAD_DIR>/.sessions/<id>/ holding a
+session.json with the declared filename and size, plus one file per received
+byte range named "<start>-<end>.chunk" (end exclusive, zero-padded so they sort
+by offset). Chunks are written to a temporary name and renamed into place, so
+parallel PUTs, retries and multiple workers need no locking: progress is just
+the union of the chunk files present.
+"""
+
+import hashlib
+import json
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.utils.file_upload import UPLOAD_CHUNK_SIZE
+
+SESSIONS_DIRNAME = ".sessions"
+_METADATA = "session.json"
+_ASSEMBLED = "assembled.part"
+
+Range = Tuple[int, int]
+
+
+class UploadSessionNotFound(LookupError):
+    pass
+
+
+class UploadSessionError(ValueError):
+    """A chunk or finalize request that doesn't fit the session."""
+
+
+@dataclass(frozen=True)
+class UploadSession:
+    id: str
+    filename: Optional[str]
+    size: int
+    created_at: float
+    # Merged [start, end) ranges received so far
+    received: Tuple[Range, ...] = ()
+
+    @property
+    def offset(self) -> int:
+        """End of the contiguous prefix received; where a serial client resumes."""
+        if self.received and self.received[0][0] == 0:
+            return self.received[0][1]
+        return 0
+
+    @property
+    def complete(self) -> bool:
+        return self.offset == self.size
+
+
+def sessions_dir(upload_dir: Path) -> Path:
+    return upload_dir / SESSIONS_DIRNAME
+
+
+def _session_dir(upload_dir: Path, session_id: str) -> Path:
+    try:
+        canonical = uuid.UUID(hex=session_id).hex
+    except ValueError:
+        raise UploadSessionNotFound(session_id)
+    if canonical != session_id:
+        raise UploadSessionNotFound(session_id)
+    return sessions_dir(upload_dir) / session_id
+
+
+def _chunk_name(start: int, end: int) -> str:
+    return f"{start:020d}-{end:020d}.chunk"
+
+
+def _chunk_ranges(session_dir: Path) -> List[Range]:
+    ranges = []
+    for path in sorted(session_dir.glob("*.chunk")):
+        start, end = path.stem.split("-")
+        ranges.append((int(start), int(end)))
+    return ranges
+
+
+def merge_ranges(ranges: List[Range]) -> Tuple[Range, ...]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+def create_session(upload_dir: Path, filename: Optional[str], size: int) -> UploadSession:
+    session = UploadSession(id=uuid.uuid4().hex, filename=filename, size=size, created_at=time.time())
+    session_dir = _session_dir(upload_dir, session.id)
+    session_dir.mkdir(parents=True)
+    (session_dir / _METADATA).write_text(
+        json.dumps({"filename": filename, "size": size, "created_at": session.created_at})
+    )
+    return session
+
+
+def load_session(upload_dir: Path, session_id: str) -> UploadSession:
+    session_dir = _session_dir(upload_dir, session_id)
+    try:
+        metadata = json.loads((session_dir / _METADATA).read_text())
+    except FileNotFoundError:
+        raise UploadSessionNotFound(session_id)
+    return UploadSession(
+        id=session_id,
+        filename=metadata["filename"],
+        size=metadata["size"],
+        created_at=metadata["created_at"],
+        received=merge_ranges(_chunk_ranges(session_dir)),
+    )
+
+
+def discard_session(upload_dir: Path, session_id: str) -> None:
+    shutil.rmtree(_session_dir(upload_dir, session_id), ignore_errors=True)
+
+
+def parse_content_range(value: Optional[str], size: int) -> Range:
+    """Parse "bytes <first>-<last>/<total>" into a [start, end) range within size."""
+    if not value or not value.startswith("bytes "):
+        raise UploadSessionError("Content-Range header must be 'bytes <first>-<last>/<total>'")
+    try:
+        span, total = value[len("bytes "):].split("/")
+        first, last = (int(part) for part in span.split("-"))
+    except ValueError:
+        raise UploadSessionError(f"Malformed Content-Range: {value}")
+    if total != "*" and total != str(size):
+        raise UploadSessionError(f"Content-Range total {total} does not match size {size}")
+    if first < 0 or last < first or last >= size:
+        raise UploadSessionError(f"Content-Range {first}-{last} is outside 0-{size - 1}")
+    return first, last + 1
+
+
+async def write_chunk(
+    upload_dir: Path, session: UploadSession, start: int, end: int, body: AsyncIterator[bytes]
+) -> None:
+    """Stream a request body into the chunk file for [start, end).
+
+    Memory is bounded to UPLOAD_CHUNK_SIZE; the body must be exactly end - start
+    bytes. A retry of the same range simply replaces the earlier chunk.
+    """
+    session_dir = _session_dir(upload_dir, session.id)
+    temp_path = session_dir / f".{uuid.uuid4().hex}.tmp"
+    expected = end - start
+    written = 0
+    buffer = bytearray()
+    out = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        try:
+            async for data in body:
+                written += len(data)
+                if written > expected:
+                    raise UploadSessionError(f"Body is longer than the {expected} byte range")
+                buffer += data
+                if len(buffer) >= UPLOAD_CHUNK_SIZE:
+                    await run_in_threadpool(out.write, bytes(buffer))
+                    buffer.clear()
+            if buffer:
+                await run_in_threadpool(out.write, bytes(buffer))
+        finally:
+            await run_in_threadpool(out.close)
+        if written != expected:
+            raise UploadSessionError(f"Body has {written} bytes, range expects {expected}")
+        await run_in_threadpool(temp_path.replace, session_dir / _chunk_name(start, end))
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+
+def assemble_session(upload_dir: Path, session: UploadSession) -> Tuple[Path, int, str]:
+    """Concatenate a complete session's chunks in offset order.
+
+    Overlapping bytes from retried or re-split ranges are taken from the first
+    chunk that covers them. Returns (path, size, sha256) of the assembled file,
+    which stays in the session dir on the upload filesystem so it can be renamed
+    into place.
+    """
+    if not session.complete:
+        raise UploadSessionError(
+            f"Upload incomplete: {session.offset} of {session.size} bytes received"
+        )
+    session_dir = _session_dir(upload_dir, session.id)
+    assembled = session_dir / _ASSEMBLED
+    digest = hashlib.sha256()
+    position = 0
+    with open(assembled, "wb") as out:
+        for start, end in _chunk_ranges(session_dir):
+            if end <= position:
+                continue
+            if start > position:
+                raise UploadSessionError(f"Missing bytes {position}-{start - 1}")
+            with open(session_dir / _chunk_name(start, end), "rb") as chunk:
+                chunk.seek(position - start)
+                while position < end:
+                    data = chunk.read(min(UPLOAD_CHUNK_SIZE, end - position))
+                    if not data:
+                        raise UploadSessionError(f"Chunk {start}-{end} is truncated")
+                    digest.update(data)
+                    out.write(data)
+                    position += len(data)
+    if position != session.size:
+        assembled.unlink(missing_ok=True)
+        raise UploadSessionError(f"Assembled {position} bytes, expected {session.size}")
+    return assembled, position, digest.hexdigest()
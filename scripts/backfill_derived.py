@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Recompute the typed columns derived from job text fields (applied_on from
+date_applied; annualized salary_min/salary_max from salary_range and
+salary_frequency). Run it after importing jobs with raw SQL or after changing
+the parsing rules; startup only backfills when the columns are first added.
+Usage: python -m scripts.backfill_derived
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.database import async_engine, init_db
+from app.services.derived_fields import backfill_derived
+
+
+async def main() -> None:
+    argparse.ArgumentParser(description=__doc__).parse_args()
+
+    await init_db()
+    async with async_engine.begin() as conn:
+        updated = await conn.run_sync(backfill_derived)
+    print(f"Updated derived columns on {updated} jobs")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
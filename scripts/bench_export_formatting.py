@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark export formatting inline vs in the format process pool: total time
+and the worst event-loop stall seen by a concurrent 1 ms ticker.
+Usage: python -m scripts.bench_export_formatting [--rows 50000] [--processes 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from app.config import settings
+from app.services import export_service
+from app.services.export_service import iter_csv, iter_json, iter_ndjson
+
+
+def _make_rows(count: int) -> list[dict]:
+    now = datetime(2025, 2, 20, 12, 0, 0)
+    return [
+        {
+            "id": i,
+            "title": f"Backend Engineer {i}",
+            "company": f"Company {i % 500}",
+            "url": f"https://example.com/jobs/{i}",
+            "date_applied": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "status": ("Saved", "Applied", "Interviewing", "Offer")[i % 4],
+            "work_model": ("Remote", "Hybrid", "On-site")[i % 3],
+            "salary_range": "$100k-$150k",
+            "salary_frequency": "Yearly",
+            "tech_stack": ["Python", "FastAPI", "PostgreSQL"],
+            "notes": "Referred by a friend; follow up next week.",
+            "screenshot_url": None,
+            "resume_url": None,
+            "cover_letter_url": None,
+            "attachments": [{"name": "resume.pdf", "url": "/uploads/resume.pdf"}],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+async def _rows(rows: list[dict]):
+    for start in range(0, len(rows), 500):
+        # Stand-in for fetching the next batch from the database
+        await asyncio.sleep(0)
+        for row in rows[start : start + 500]:
+            yield row
+
+
+async def _run(label: str, make_chunks, rows: list[dict]) -> None:
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append(time.perf_counter() - started - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    size = 0
+    async for chunk in make_chunks(_rows(rows)):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick
+    print(
+        f"  {label:<22} {elapsed * 1000:9.1f} ms  worst loop stall {max(stalls) * 1000:6.1f} ms"
+        f"  {size:>12,} chars"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--processes", type=int, default=2)
+    args = parser.parse_args()
+    rows = _make_rows(args.rows)
+    formats = {"csv": iter_csv, "json": iter_json, "ndjson": iter_ndjson}
+
+    for processes in (0, args.processes):
+        settings.EXPORT_FORMAT_PROCESSES = processes
+        export_service.shutdown_format_pool()
+        if processes:
+            # Start the workers before timing
+            await _run("warm-up", iter_ndjson, rows[: export_service.OFFLOAD_MIN_ROWS])
+        print(f"{args.rows:,} rows, {'inline' if not processes else f'{processes} processes'}")
+        for name, make_chunks in formats.items():
+            await _run(name, make_chunks, rows)
+    export_service.shutdown_format_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
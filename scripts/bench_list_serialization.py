@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/jobs serialization: ORM + double Pydantic validation vs the
+column-tuple JSON fast path.
+Usage: python -m scripts.bench_list_serialization [--rows 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.job import Base, Job
+from app.schemas.job import JobResponse
+from app.services.job_service import _job_to_response, _load_jobs_json
+
+# What FastAPI does with response_model=List[JobResponse]
+_response_model = TypeAdapter(List[JobResponse])
+
+
+def _make_rows(count: int) -> list[dict]:
+    now = datetime(2025, 2, 20, 12, 0, 0)
+    return [
+        {
+            "title": f"Backend Engineer {i}",
+            "company": f"Company {i % 500}",
+            "url": f"https://example.com/jobs/{i}",
+            "date_applied": f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}",
+            "status": ("Saved", "Applied", "Interviewing", "Offer")[i % 4],
+            "work_model": ("Remote", "Hybrid", "On-site")[i % 3],
+            "salary_range": "$100k-$150k",
+            "salary_frequency": "Yearly",
+            "tech_stack": ["Python", "FastAPI", "PostgreSQL"],
+            "notes": "Referred by a friend; follow up next week.",
+            "attachments": [{"name": "resume.pdf", "url": "/uploads/resume.pdf"}],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+async def _seed(session_maker, count: int) -> None:
+    rows = _make_rows(count)
+    async with session_maker() as db:
+        for start in range(0, count, 5000):
+            await db.execute(insert(Job), rows[start : start + 5000])
+        await db.commit()
+
+
+async def _time(label: str, count: int, func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await func()
+        best = min(best, time.perf_counter() - started)
+    per_row_us = best / count * 1e6
+    print(f"  {label:<34} {best * 1000:9.1f} ms  {per_row_us:7.2f} us/row  {len(body):>11,} bytes")
+    return per_row_us
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        await _seed(session_maker, args.rows)
+
+        async with session_maker() as db:
+
+            async def before() -> bytes:
+                result = await db.execute(select(Job).order_by(Job.date_applied.desc()))
+                jobs = [_job_to_response(job) for job in result.scalars().all()]
+                return _response_model.dump_json(_response_model.validate_python(jobs))
+
+            async def after() -> bytes:
+                return await _load_jobs_json(db, None)
+
+            print(f"GET /api/jobs serialization, {args.rows:,} rows (best of {args.repeat})")
+            old = await _time("ORM + JobResponse x2 (before)", args.rows, before, args.repeat)
+            new = await _time("row tuples -> JSON bytes (after)", args.rows, after, args.repeat)
+            print(f"  speedup: {old / new:.1f}x")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
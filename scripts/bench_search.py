@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/jobs/search: full-text index vs loading every job and matching
+in Python, at growing table sizes.
+Usage: python -m scripts.bench_search [--sizes 1000,10000,100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.job import Base, Job
+from app.services.job_service import search_jobs_json
+from app.services.search_index import create_search_index
+
+_WORDS = ["python", "rust", "react", "kubernetes", "django", "golang", "kafka", "spark"]
+
+
+def _make_rows(start: int, count: int) -> list[dict]:
+    return [
+        {
+            "title": f"{_WORDS[i % 8].title()} Engineer {i}",
+            "company": f"Company {i % 997}",
+            "date_applied": "2025-02-15",
+            "status": "Applied",
+            # One job in 1000 mentions the rare word we search for
+            "notes": "Needs elixir experience" if i % 1000 == 7 else f"Uses {_WORDS[(i * 3) % 8]}",
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def _best(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        print(f"{'jobs':>8}  {'FTS search':>12}  {'load + scan':>12}")
+        seeded = 0
+        for size in sizes:
+            async with session_maker() as db:
+                for start in range(seeded, size, 5000):
+                    await db.execute(insert(Job), _make_rows(start, min(5000, size - start)))
+                await db.commit()
+            seeded = size
+            async with engine.begin() as conn:
+                await conn.run_sync(create_search_index)
+                await conn.exec_driver_sql("DELETE FROM jobs_fts")
+                await conn.exec_driver_sql(
+                    "INSERT INTO jobs_fts (rowid, title, company, notes) "
+                    "SELECT id, title, company, coalesce(notes, '') FROM jobs"
+                )
+
+            async with session_maker() as db:
+
+                async def indexed() -> bytes:
+                    return await search_jobs_json(db, "elixir", limit=50)
+
+                async def scanned() -> list:
+                    jobs = (await db.execute(select(Job))).scalars().all()
+                    return [job for job in jobs if "elixir" in (job.notes or "").lower()][:50]
+
+                print(f"{size:>8,}  {await _best(indexed):>9.2f} ms  {await _best(scanned, 1):>9.1f} ms")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/jobs/suggest: in-memory prefix index lookups vs a
+GROUP BY ... LIKE query per keystroke, for short and long prefixes.
+Usage: python -m scripts.bench_suggest [--jobs 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.job import Base, Job
+from app.services.suggest_index import PrefixIndex
+
+_NAMES = ["acme", "globex", "initech", "umbrella", "hooli", "stark", "wayne", "wonka"]
+_PREFIXES = ["", "a", "ac", "acme 1", "acme 12", "zz"]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_maker() as db:
+            for start in range(0, args.jobs, 5000):
+                rows = [
+                    {
+                        # Skewed so some companies are much more common than others
+                        "company": f"{rng.choice(_NAMES)} {int(rng.paretovariate(1.2)) % 20000}",
+                        "title": "Engineer",
+                        "date_applied": "2025-02-15",
+                        "status": "Applied",
+                    }
+                    for _ in range(min(5000, args.jobs - start))
+                ]
+                await db.execute(insert(Job), rows)
+            await db.commit()
+
+            started = time.perf_counter()
+            result = await db.execute(select(Job.id, Job.company))
+            index = PrefixIndex(result.all())
+            print(f"Index of {len(index):,} companies loaded in "
+                  f"{(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+            print(f"{'prefix':>10}  {'index':>10}  {'GROUP BY':>10}")
+            for prefix in _PREFIXES:
+                started = time.perf_counter()
+                for _ in range(1000):
+                    index.suggest(prefix, 10)
+                # 1000 lookups, so total ms is us per lookup
+                in_memory = (time.perf_counter() - started) * 1000
+
+                count = func.count().label("count")
+                stmt = (
+                    select(Job.company, count)
+                    .where(Job.company.ilike(f"{prefix}%"))
+                    .group_by(Job.company)
+                    .order_by(count.desc(), Job.company)
+                    .limit(10)
+                )
+                started = time.perf_counter()
+                await db.execute(stmt)
+                queried = (time.perf_counter() - started) * 1000
+                print(f"{prefix!r:>10}  {in_memory:>7.1f} us  {queried:>7.1f} ms")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
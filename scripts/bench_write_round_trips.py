@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Count database round trips per update/delete: the previous SELECT + mutate +
+commit + refresh flow vs single-statement UPDATE/DELETE ... RETURNING.
+Runs on SQLite, where a write also bumps the change counter, and a delete
+clears its FTS5 row and writes its tombstone, as separate statements.
+PostgreSQL folds the counter bump into the write and the tombstone into the
+DELETE, and cascades the rest: one statement fewer per update, three per
+delete.
+Usage: python -m scripts.bench_write_round_trips [--ops 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import enable_foreign_keys
+from app.models.job import Base, Job
+from app.schemas.job import JobUpdate
+from app.services.change_feed import ensure_change_counter
+from app.services.job_service import _job_to_response, delete_job, update_job
+from app.services.search_index import create_search_index
+
+
+async def legacy_update_job(db: AsyncSession, job_id: int, job: JobUpdate):
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    db_job = result.scalar_one_or_none()
+    if db_job is None:
+        return None
+    for field, value in job.model_dump(exclude_unset=True).items():
+        setattr(db_job, field, value)
+    await db.commit()
+    await db.refresh(db_job)
+    return _job_to_response(db_job)
+
+
+async def legacy_delete_job(db: AsyncSession, job_id: int) -> bool:
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if job is None:
+        return False
+    await db.delete(job)
+    await db.commit()
+    return True
+
+
+class RoundTripCounter:
+    """Counts statements, BEGINs and COMMITs sent to the database.
+
+    BEGIN and COMMIT are separate round trips on asyncpg, so they are counted.
+    """
+
+    def __init__(self, engine) -> None:
+        self.count = 0
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._on_event)
+        event.listen(sync_engine, "begin", self._on_event)
+        event.listen(sync_engine, "commit", self._on_event)
+
+    def _on_event(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+async def _seed(session_maker, count: int) -> None:
+    async with session_maker() as db:
+        await db.execute(
+            insert(Job),
+            [
+                {
+                    "title": f"Engineer {i}",
+                    "company": "Acme",
+                    "date_applied": "2025-02-15",
+                    "status": "Applied",
+                    "salary_range": "$5k-6k",
+                    "salary_frequency": "Yearly",
+                    "salary_min": 5000,
+                    "salary_max": 6000,
+                }
+                for i in range(count)
+            ],
+        )
+        await db.commit()
+
+
+async def _measure(label, session_maker, counter, ops, operation) -> float:
+    counter.count = 0
+    started = time.perf_counter()
+    for job_id in range(1, ops + 1):
+        async with session_maker() as db:
+            await operation(db, job_id)
+    elapsed = time.perf_counter() - started
+    per_op = counter.count / ops
+    print(f"  {label:<30} {per_op:5.1f} round trips/op  {elapsed / ops * 1e6:8.1f} us/op")
+    return per_op
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        # As the app's engine: side tables go with their job by ON DELETE CASCADE
+        enable_foreign_keys(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(ensure_change_counter)
+            await conn.run_sync(create_search_index)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        await _seed(session_maker, args.ops * 2)
+        counter = RoundTripCounter(engine)
+        change = JobUpdate(status="Interviewing", notes="Phone screen booked")
+        # Annualized against the row's salary_range inside the UPDATE
+        salary_change = JobUpdate(salary_frequency="Monthly")
+
+        print(f"Round trips per write ({args.ops} ops each, SQLite)")
+        await _measure(
+            "update: SELECT+commit+refresh", session_maker, counter, args.ops,
+            lambda db, job_id: legacy_update_job(db, job_id, change),
+        )
+        await _measure(
+            "update: UPDATE ... RETURNING", session_maker, counter, args.ops,
+            lambda db, job_id: update_job(db, job_id, change),
+        )
+        await _measure(
+            "update: one salary source", session_maker, counter, args.ops,
+            lambda db, job_id: update_job(db, job_id, salary_change),
+        )
+        await _measure(
+            "delete: SELECT+delete+commit", session_maker, counter, args.ops,
+            legacy_delete_job,
+        )
+        await _measure(
+            "delete: DELETE ... RETURNING", session_maker, counter, args.ops,
+            # The legacy run already deleted the first half of the rows
+            lambda db, job_id: delete_job(db, job_id + args.ops),
+        )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Delete files in UPLOAD_DIR that no job references anymore, plus abandoned
+resumable upload sessions, once they are older than the grace period.
+Usage: python -m scripts.gc_uploads [--grace-hours 24] [--dry-run] [--rebuild-index]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.config import settings
+from app.database import async_engine, async_session_maker, init_db
+from app.services.upload_gc import collect_orphaned_uploads
+from app.services.upload_refs import rebuild_refs
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--grace-hours",
+        type=float,
+        default=settings.UPLOAD_GC_GRACE_SECONDS / 3600,
+        help="Only remove files not modified for this long",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report what would be removed"
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Rebuild upload_refs from the jobs table first (full scan)",
+    )
+    args = parser.parse_args()
+
+    await init_db()
+    if args.rebuild_index:
+        async with async_engine.begin() as conn:
+            refs = await conn.run_sync(rebuild_refs)
+        print(f"Rebuilt upload index: {refs} references")
+
+    async with async_session_maker() as db:
+        report = await collect_orphaned_uploads(
+            db, grace_seconds=args.grace_hours * 3600, dry_run=args.dry_run
+        )
+    verb = "Would remove" if report.dry_run else "Removed"
+    print(f"Scanned {report.scanned_files} files in {settings.UPLOAD_DIR}")
+    print(
+        f"{verb} {report.orphaned_files} orphaned files and "
+        f"{report.expired_sessions} expired upload sessions"
+    )
+    print(f"Reclaimed {report.reclaimed_bytes:,} bytes")
+
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,8 +2,38 @@
 from datetime import datetime
 
 import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from app import database
 from app.schemas.job import JobResponse
+from app.services import job_service
+from app.services.cache import LocalCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_job_cache():
+    """Give every test an empty job cache so results never leak between tests."""
+    previous = job_service.job_cache
+    job_service.set_job_cache(LocalCache(max_entries=128, ttl_seconds=60))
+    try:
+        yield job_service.job_cache
+    finally:
+        job_service.set_job_cache(previous)
+
+
+@pytest.fixture
+async def sqlite_db(monkeypatch):
+    """Session on a fresh in-memory SQLite database whose schema init_db created."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    database.enable_foreign_keys(engine)
+    monkeypatch.setattr(database, "async_engine", engine)
+    await database.init_db()
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            yield session
+    finally:
+        await engine.dispose()
 
 
 @pytest.fixture
@@ -1,4 +1,6 @@
-"""Integration tests for GET /api/jobs/export (Tasks 4.4, 4.5)."""
+"""Integration tests for GET /api/jobs/export (Tasks 4.4, 4.5), streaming, filters and NDJSON."""
+import csv
+import json
 from datetime import date
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -8,6 +10,19 @@ from fastapi.testclient import TestClient
 from app.main import app
 
 
+def _stream_of(jobs, calls=None):
+    """Build a stand-in for stream_jobs that yields the given jobs projected to columns."""
+
+    async def _stream(db, columns, filters=None):
+        if calls is not None:
+            calls.append((columns, filters))
+        for job in jobs:
+            data = job.model_dump()
+            yield {column: data[column] for column in columns}
+
+    return _stream
+
+
 async def _mock_get_db():
     """Yield a mock AsyncSession so tests don't need a real DB."""
     yield MagicMock()
@@ -15,11 +30,16 @@ async def _mock_get_db():
 
 @pytest.fixture
 def client():
-    """TestClient for the FastAPI app with get_db overridden to avoid real DB."""
+    """TestClient with get_db overridden and a fixed job-set version for ETags."""
     from app.database import get_db
     app.dependency_overrides[get_db] = _mock_get_db
     try:
-        yield TestClient(app)
+        with patch(
+            "app.api.jobs.get_jobs_version",
+            new_callable=AsyncMock,
+            return_value="1:2025-02-20T12:00:00",
+        ):
+            yield TestClient(app)
     finally:
         app.dependency_overrides.pop(get_db, None)
 
@@ -61,9 +81,8 @@ def test_export_format_csv_200_content_type_and_disposition(
 ):
     """format=csv -> 200, Content-Type contains text/csv, Content-Disposition attachment filename=saved-jobs-YYYY-MM-DD.csv."""
     with patch(
-        "app.api.jobs.get_saved_jobs",
-        new_callable=AsyncMock,
-        return_value=[sample_job_response],
+        "app.api.jobs.stream_jobs",
+        new=_stream_of([sample_job_response]),
     ):
         response = client.get("/api/jobs/export?format=csv")
     assert response.status_code == 200
@@ -79,9 +98,8 @@ def test_export_format_json_200_content_type_and_disposition(
 ):
     """format=json -> 200, Content-Type application/json, Content-Disposition filename=saved-jobs-YYYY-MM-DD.json."""
     with patch(
-        "app.api.jobs.get_saved_jobs",
-        new_callable=AsyncMock,
-        return_value=[sample_job_response],
+        "app.api.jobs.stream_jobs",
+        new=_stream_of([sample_job_response]),
     ):
         response = client.get("/api/jobs/export?format=json")
     assert response.status_code == 200
@@ -95,9 +113,8 @@ def test_export_format_json_200_content_type_and_disposition(
 def test_export_empty_saved_jobs_csv_200_header_only(client):
     """Empty saved jobs: format=csv -> 200, body has header row only."""
     with patch(
-        "app.api.jobs.get_saved_jobs",
-        new_callable=AsyncMock,
-        return_value=[],
+        "app.api.jobs.stream_jobs",
+        new=_stream_of([]),
     ):
         response = client.get("/api/jobs/export?format=csv")
     assert response.status_code == 200
@@ -109,9 +126,8 @@ def test_export_empty_saved_jobs_csv_200_header_only(client):
 def test_export_empty_saved_jobs_json_200_empty_array(client):
     """Empty saved jobs: format=json -> 200, body is '[]'."""
     with patch(
-        "app.api.jobs.get_saved_jobs",
-        new_callable=AsyncMock,
-        return_value=[],
+        "app.api.jobs.stream_jobs",
+        new=_stream_of([]),
     ):
         response = client.get("/api/jobs/export?format=json")
     assert response.status_code == 200
@@ -130,7 +146,7 @@ def test_export_missing_format_400(client):
     assert "format" in data["detail"].lower()
 
 
-@pytest.mark.parametrize("invalid_format", ["xml", "pdf", "txt", ""])
+@pytest.mark.parametrize("invalid_format", ["xml", "pdf", "txt", "", "jsonl"])
 def test_export_invalid_format_400(client, invalid_format):
     """Request with format=xml (or other invalid) -> 400. Response body contains error message about format."""
     response = client.get(f"/api/jobs/export?format={invalid_format}")
@@ -138,3 +154,161 @@ def test_export_invalid_format_400(client, invalid_format):
     data = response.json()
     assert "detail" in data
     assert "format" in data["detail"].lower()
+
+
+# --- Streaming ---
+
+
+def test_export_json_streams_many_rows_as_valid_array(client, sample_job_response):
+    """Rows spanning several chunks still produce one valid JSON array."""
+    jobs = [sample_job_response.model_copy(update={"id": i}) for i in range(1200)]
+    with patch("app.api.jobs.stream_jobs", new=_stream_of(jobs)):
+        response = client.get("/api/jobs/export?format=json")
+    assert response.status_code == 200
+    data = response.json()
+    assert [obj["id"] for obj in data] == list(range(1200))
+
+
+# --- Filters, projection and NDJSON ---
+
+
+def test_export_defaults_to_saved_status(client, sample_job_response):
+    """No status filter keeps the historical Saved-only scope."""
+    calls = []
+    with patch("app.api.jobs.stream_jobs", new=_stream_of([], calls)):
+        client.get("/api/jobs/export?format=csv")
+    _, filters = calls[0]
+    assert filters.status == ["Saved"]
+
+
+def test_export_forwards_filters_and_uses_generic_filename(client, sample_job_response):
+    """Status set, company and date range reach stream_jobs; filename drops 'saved-'."""
+    calls = []
+    with patch("app.api.jobs.stream_jobs", new=_stream_of([sample_job_response], calls)):
+        response = client.get(
+            "/api/jobs/export?format=csv&status=Applied&status=Offer"
+            "&company=Acme+Corp&date_from=2025-01-01&date_to=2025-03-01"
+        )
+    assert response.status_code == 200
+    _, filters = calls[0]
+    assert filters.status == ["Applied", "Offer"]
+    assert filters.company == "Acme Corp"
+    assert (filters.date_from, filters.date_to) == (date(2025, 1, 1), date(2025, 3, 1))
+    today = date.today().isoformat()
+    assert f"filename=jobs-{today}.csv" in response.headers["content-disposition"]
+
+
+def test_export_columns_projection_csv(client, sample_job_response):
+    """columns= limits both the selected columns and the CSV header, in order."""
+    calls = []
+    with patch("app.api.jobs.stream_jobs", new=_stream_of([sample_job_response], calls)):
+        response = client.get("/api/jobs/export?format=csv&columns=company,id,title")
+    assert response.status_code == 200
+    columns, _ = calls[0]
+    assert columns == ["company", "id", "title"]
+    rows = list(csv.reader(response.text.splitlines()))
+    assert rows == [["company", "id", "title"], ["Acme Corp", "1", "Backend Engineer"]]
+
+
+def test_export_unknown_column_400(client):
+    """Unknown column names are rejected before querying."""
+    response = client.get("/api/jobs/export?format=csv&columns=id,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
+
+
+def test_export_ndjson_one_object_per_line(client, sample_job_response):
+    """format=ndjson -> application/x-ndjson with one JSON object per line."""
+    jobs = [sample_job_response.model_copy(update={"id": i}) for i in range(3)]
+    with patch("app.api.jobs.stream_jobs", new=_stream_of(jobs)):
+        response = client.get("/api/jobs/export?format=ndjson&columns=id,tech_stack")
+    assert response.status_code == 200
+    assert "application/x-ndjson" in response.headers["content-type"]
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": i, "tech_stack": ["Python"]} for i in range(3)
+    ]
+
+
+def test_export_304_when_etag_matches(client, sample_job_response):
+    """Exports carry an ETag and honour If-None-Match."""
+    calls = []
+    with patch("app.api.jobs.stream_jobs", new=_stream_of([sample_job_response], calls)):
+        first = client.get("/api/jobs/export?format=csv")
+        second = client.get(
+            "/api/jobs/export?format=csv",
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+    assert second.status_code == 304
+    assert len(calls) == 1
+
+
+# --- Background exports ---
+
+
+def _record(status="pending", **overrides):
+    from app.utils.export_store import ExportRecord
+
+    return ExportRecord(
+        id="ab" * 16,
+        format="csv",
+        filename="saved-jobs-2025-02-20.csv",
+        status=status,
+        created_at=1740052800.0,
+        **overrides,
+    )
+
+
+def test_create_export_accepts_and_points_at_status(client):
+    with patch(
+        "app.api.jobs.start_export", new_callable=AsyncMock, return_value=_record()
+    ) as mock_start:
+        response = client.post("/api/jobs/exports?format=csv&columns=id,title")
+    assert response.status_code == 202
+    assert response.headers["location"] == f"/api/jobs/exports/{'ab' * 16}"
+    assert response.json()["status"] == "pending"
+    assert response.json()["download_url"] is None
+    _, format, columns, filters = mock_start.await_args[0]
+    assert (format, columns, filters.status) == ("csv", ["id", "title"], ["Saved"])
+
+
+def test_create_export_returns_finished_export_and_rejects_when_busy(client):
+    from app.services.export_tasks import ExportQueueFull
+
+    done = _record("done", finished_at=1740052801.0, rows=3, size=120)
+    with patch("app.api.jobs.start_export", new_callable=AsyncMock, return_value=done):
+        response = client.post("/api/jobs/exports?format=csv")
+    assert response.status_code == 200
+    assert response.json()["download_url"] == f"/api/jobs/exports/{'ab' * 16}/download"
+
+    with patch(
+        "app.api.jobs.start_export", new_callable=AsyncMock, side_effect=ExportQueueFull()
+    ):
+        response = client.post("/api/jobs/exports?format=csv")
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    assert client.post("/api/jobs/exports?format=xml").status_code == 400
+
+
+def test_export_status_and_download(client, tmp_path):
+    from app.utils.export_store import ExportNotFound
+
+    artifact = tmp_path / "export.csv"
+    artifact.write_text('"id"\n"1"\n')
+    with patch(
+        "app.api.jobs.get_export", new_callable=AsyncMock, return_value=_record("running")
+    ):
+        assert client.get(f"/api/jobs/exports/{'ab' * 16}").json()["status"] == "running"
+        assert client.get(f"/api/jobs/exports/{'ab' * 16}/download").status_code == 409
+    with patch(
+        "app.api.jobs.get_export", new_callable=AsyncMock, return_value=_record("done")
+    ), patch("app.api.jobs.export_file", return_value=artifact):
+        response = client.get(f"/api/jobs/exports/{'ab' * 16}/download")
+    assert response.status_code == 200
+    assert response.text == '"id"\n"1"\n'
+    assert "text/csv" in response.headers["content-type"]
+    assert "saved-jobs-2025-02-20.csv" in response.headers["content-disposition"]
+    with patch(
+        "app.api.jobs.get_export", new_callable=AsyncMock, side_effect=ExportNotFound()
+    ):
+        assert client.get("/api/jobs/exports/unknown").status_code == 404
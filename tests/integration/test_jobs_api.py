@@ -0,0 +1,347 @@
+"""Integration tests for GET /api/jobs (list, pagination, filters) and conditional GETs."""
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.job import (
+    JobFacets,
+    JobFilters,
+    JobPage,
+    JobStats,
+    StatBucket,
+    Suggestion,
+    TechFacet,
+)
+
+
+def _json_list(*jobs):
+    return ("[" + ",".join(job.model_dump_json() for job in jobs) + "]").encode()
+
+
+async def _mock_get_db():
+    """Yield a mock AsyncSession so tests don't need a real DB."""
+    yield MagicMock()
+
+
+@pytest.fixture
+def client():
+    """TestClient with get_db overridden and a fixed job-set version for ETags."""
+    from app.database import get_db
+    app.dependency_overrides[get_db] = _mock_get_db
+    try:
+        with patch(
+            "app.api.jobs.get_jobs_version",
+            new_callable=AsyncMock,
+            return_value="1:2025-02-20T12:00:00",
+        ):
+            yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+
+def test_list_without_limit_returns_plain_array(client, sample_job_response):
+    """No limit/cursor -> legacy unpaginated JSON array."""
+    with patch(
+        "app.api.jobs.get_jobs_json",
+        new_callable=AsyncMock,
+        return_value=_json_list(sample_job_response),
+    ) as mock_get_jobs:
+        response = client.get("/api/jobs/")
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert data[0]["id"] == sample_job_response.id
+    mock_get_jobs.assert_awaited_once()
+
+
+def test_list_with_limit_returns_page_envelope(client, sample_job_response):
+    """limit=N -> {items, next_cursor}; limit and cursor are forwarded."""
+    page = JobPage(items=[sample_job_response], next_cursor="abc")
+    with patch(
+        "app.api.jobs.get_jobs_page_json",
+        new_callable=AsyncMock,
+        return_value=page.model_dump_json().encode(),
+    ) as mock_page:
+        response = client.get("/api/jobs/?limit=1&cursor=xyz")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["next_cursor"] == "abc"
+    assert data["items"][0]["id"] == sample_job_response.id
+    assert mock_page.await_args[0][1:3] == (1, "xyz")
+
+
+def test_list_with_invalid_cursor_400(client):
+    """A malformed cursor is reported as 400, not 500."""
+    with patch(
+        "app.api.jobs.get_jobs_page_json",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Invalid cursor"),
+    ):
+        response = client.get("/api/jobs/?cursor=garbage")
+    assert response.status_code == 400
+    assert "cursor" in response.json()["detail"].lower()
+
+
+@pytest.mark.parametrize("limit", [0, 501])
+def test_list_limit_out_of_range_422(client, limit):
+    """limit outside [1, 500] is rejected by validation."""
+    response = client.get(f"/api/jobs/?limit={limit}")
+    assert response.status_code == 422
+
+
+def test_list_forwards_query_filters(client):
+    """status (repeatable), work_model, company and date range reach the service."""
+    with patch(
+        "app.api.jobs.get_jobs_json",
+        new_callable=AsyncMock,
+        return_value=b"[]",
+    ) as mock_get_jobs:
+        response = client.get(
+            "/api/jobs/?status=Applied&status=Saved&work_model=Remote"
+            "&company=Acme&date_from=2025-01-01&date_to=2025-01-31"
+        )
+    assert response.status_code == 200
+    filters = mock_get_jobs.await_args[0][1]
+    assert filters == JobFilters(
+        status=["Applied", "Saved"],
+        work_model="Remote",
+        company="Acme",
+        date_from="2025-01-01",
+        date_to="2025-01-31",
+    )
+
+
+# --- ETag / conditional GET ---
+
+
+def test_list_sets_weak_etag_and_returns_304_on_match(client, sample_job_response):
+    """A matching If-None-Match short-circuits before any job is loaded."""
+    with patch(
+        "app.api.jobs.get_jobs_json",
+        new_callable=AsyncMock,
+        return_value=_json_list(sample_job_response),
+    ) as mock_get_jobs:
+        first = client.get("/api/jobs/")
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        second = client.get("/api/jobs/", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    mock_get_jobs.assert_awaited_once()
+
+
+def test_list_etag_differs_per_query_and_version(client):
+    """Different filters or a new version marker produce a different ETag."""
+    with patch("app.api.jobs.get_jobs_json", new_callable=AsyncMock, return_value=b"[]"):
+        plain = client.get("/api/jobs/").headers["etag"]
+        filtered = client.get("/api/jobs/?status=Saved").headers["etag"]
+        with patch(
+            "app.api.jobs.get_jobs_version",
+            new_callable=AsyncMock,
+            return_value="2:2025-02-21T00:00:00",
+        ):
+            bumped = client.get("/api/jobs/").headers["etag"]
+    assert len({plain, filtered, bumped}) == 3
+
+
+def test_get_job_304_when_row_version_matches(client, sample_job_response):
+    with patch(
+        "app.api.jobs.get_job_version",
+        new_callable=AsyncMock,
+        return_value="1:2025-02-20T12:00:00",
+    ), patch(
+        "app.api.jobs.get_job",
+        new_callable=AsyncMock,
+        return_value=sample_job_response,
+    ) as mock_get_job:
+        first = client.get("/api/jobs/1")
+        assert first.status_code == 200
+        second = client.get("/api/jobs/1", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 304
+    mock_get_job.assert_awaited_once()
+
+
+def test_get_job_missing_still_404(client):
+    with patch(
+        "app.api.jobs.get_job_version",
+        new_callable=AsyncMock,
+        return_value=None,
+    ):
+        response = client.get("/api/jobs/99", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+# --- Bulk ---
+
+
+def test_bulk_forwards_request_and_returns_per_item_results(client):
+    from app.schemas.job import BulkItemResult, JobBulkResponse
+
+    result = JobBulkResponse(
+        deleted=[BulkItemResult(index=0, id=5, success=False, error="Job not found")]
+    )
+    with patch(
+        "app.api.jobs.bulk_write", new_callable=AsyncMock, return_value=result
+    ) as mock_bulk:
+        response = client.post("/api/jobs/bulk", json={"delete": [5]})
+    assert response.status_code == 200
+    assert response.json()["deleted"][0]["error"] == "Job not found"
+    assert mock_bulk.await_args[0][1].delete == [5]
+
+
+def test_bulk_over_limit_400(client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    with patch("app.api.jobs.bulk_write", new_callable=AsyncMock) as mock_bulk:
+        response = client.post("/api/jobs/bulk", json={"delete": [1, 2, 3]})
+    assert response.status_code == 400
+    assert "2" in response.json()["detail"]
+    mock_bulk.assert_not_awaited()
+
+
+def test_list_forwards_salary_filters_and_rejects_bad_dates(client):
+    with patch(
+        "app.api.jobs.get_jobs_json",
+        new_callable=AsyncMock,
+        return_value=b"[]",
+    ) as mock_get_jobs:
+        response = client.get("/api/jobs/?salary_min=90000&salary_max=150000")
+    assert response.status_code == 200
+    filters = mock_get_jobs.await_args[0][1]
+    assert (filters.salary_min, filters.salary_max) == (90000, 150000)
+    assert client.get("/api/jobs/?date_from=last-week").status_code == 422
+    assert client.get("/api/jobs/?salary_min=-1").status_code == 422
+
+
+def test_list_forwards_tech_filters(client):
+    """tech is repeatable; tech_match selects any-of or all-of."""
+    with patch(
+        "app.api.jobs.get_jobs_json",
+        new_callable=AsyncMock,
+        return_value=b"[]",
+    ) as mock_get_jobs:
+        response = client.get("/api/jobs/?tech=Python&tech=Go&tech_match=all")
+    assert response.status_code == 200
+    filters = mock_get_jobs.await_args[0][1]
+    assert (filters.tech, filters.tech_match) == (["Python", "Go"], "all")
+    assert client.get("/api/jobs/?tech=Go&tech_match=some").status_code == 422
+
+
+def test_facets_returns_counts_and_forwards_filters(client):
+    facets = JobFacets(tech_stack=[TechFacet(name="Python", count=3)])
+    with patch(
+        "app.api.jobs.get_tech_facets",
+        new_callable=AsyncMock,
+        return_value=facets,
+    ) as mock_facets:
+        response = client.get("/api/jobs/facets?limit=5&status=Applied")
+        etag = response.headers["etag"]
+        cached = client.get("/api/jobs/facets?limit=5&status=Applied", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == {"tech_stack": [{"name": "Python", "count": 3}]}
+    assert cached.status_code == 304
+    _, limit, filters = mock_facets.await_args[0]
+    assert (limit, filters.status) == (5, ["Applied"])
+    assert mock_facets.await_count == 1
+    assert client.get("/api/jobs/facets?limit=0").status_code == 422
+
+
+def test_changes_forwards_token_and_rejects_bad_ones(client):
+    body = b'{"upserted":[],"deleted":[3],"next_token":"WzQsM10","has_more":false}'
+    with patch(
+        "app.api.jobs.get_changes_json", new_callable=AsyncMock, return_value=body
+    ) as mock_changes:
+        response = client.get("/api/jobs/changes?since=WzEsMV0&limit=50")
+    assert response.status_code == 200
+    assert response.json()["deleted"] == [3]
+    assert mock_changes.await_args[0][1:] == ("WzEsMV0", 50)
+
+    with patch(
+        "app.api.jobs.get_changes_json",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Invalid token"),
+    ):
+        response = client.get("/api/jobs/changes?since=bad")
+    assert response.status_code == 400
+
+
+def test_stream_sends_events_and_resumes_from_last_event_id(client):
+    positions = []
+
+    async def events(since=None):
+        positions.append(since)
+        yield b'id: WzIsMl0\nevent: job-deleted\ndata: {"id":2}\n\n'
+
+    with patch("app.api.jobs.job_stream.events", side_effect=events):
+        response = client.get(
+            "/api/jobs/stream?since=WzEsMV0", headers={"Last-Event-ID": "WzQsMl0"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["cache-control"] == "no-cache"
+        assert "event: job-deleted" in response.text
+        assert "content-encoding" not in response.headers
+        assert client.get("/api/jobs/stream").status_code == 200
+    # The EventSource reconnect header wins over the initial since token
+    assert positions == [(4, 2), None]
+
+    response = client.get("/api/jobs/stream", headers={"Last-Event-ID": "junk"})
+    assert response.status_code == 400
+
+
+def test_stats_returns_aggregates_for_date_range(client):
+    stats = JobStats(total=2, by_status=[StatBucket(key="Applied", count=2)])
+    with patch(
+        "app.api.jobs.get_job_stats",
+        new_callable=AsyncMock,
+        return_value=stats,
+    ) as mock_stats:
+        response = client.get("/api/jobs/stats?date_from=2025-01-01&date_to=2025-03-31")
+    assert response.status_code == 200
+    assert response.json()["by_status"] == [{"key": "Applied", "count": 2}]
+    assert "etag" in response.headers
+    filters = mock_stats.await_args[0][1]
+    assert (filters.date_from, filters.date_to) == (date(2025, 1, 1), date(2025, 3, 31))
+
+
+def test_suggest_returns_values_and_validates_field(client):
+    with patch(
+        "app.api.jobs.suggest_values",
+        new_callable=AsyncMock,
+        return_value=[Suggestion(value="Acme Corp", count=4)],
+    ) as mock_suggest:
+        response = client.get("/api/jobs/suggest?field=company&prefix=ac&limit=5")
+    assert response.status_code == 200
+    assert response.json() == [{"value": "Acme Corp", "count": 4}]
+    assert mock_suggest.await_args[0][1:] == ("company", "ac", 5)
+    assert client.get("/api/jobs/suggest?field=notes&prefix=a").status_code == 422
+
+
+def test_search_returns_page_and_forwards_args(client, sample_job_response):
+    page = JobPage(items=[sample_job_response], next_cursor=None)
+    with patch(
+        "app.api.jobs.search_jobs_json",
+        new_callable=AsyncMock,
+        return_value=page.model_dump_json().encode(),
+    ) as mock_search:
+        response = client.get("/api/jobs/search?q=backend&limit=5&status=Saved")
+    assert response.status_code == 200
+    assert response.json()["items"][0]["id"] == sample_job_response.id
+    assert "etag" in response.headers
+    _, q, limit, cursor, filters = mock_search.await_args[0]
+    assert (q, limit, cursor, filters.status) == ("backend", 5, None, ["Saved"])
+
+
+def test_search_requires_query_and_valid_cursor(client):
+    assert client.get("/api/jobs/search").status_code == 422
+    with patch(
+        "app.api.jobs.search_jobs_json",
+        new_callable=AsyncMock,
+        side_effect=ValueError("Invalid cursor"),
+    ):
+        assert client.get("/api/jobs/search?q=x&cursor=bad").status_code == 400
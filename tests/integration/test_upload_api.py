@@ -0,0 +1,102 @@
+"""Integration tests for POST /api/upload."""
+import hashlib
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.utils.upload_limit import MULTIPART_OVERHEAD_BYTES
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient writing uploads into a temporary UPLOAD_DIR."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return TestClient(app)
+
+
+def test_upload_returns_url_size_and_hash(client, tmp_path):
+    data = b"%PDF-1.4 resume"
+    response = client.post("/api/upload", files={"file": ("resume.pdf", data)})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["url"].startswith("/uploads/") and body["url"].endswith(".pdf")
+    assert body["size"] == len(data)
+    assert body["sha256"] == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / body["url"].removeprefix("/uploads/")).read_bytes() == data
+
+
+def test_upload_too_large_413(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 8)
+    response = client.post("/api/upload", files={"file": ("big.bin", b"x" * 9)})
+    assert response.status_code == 413
+    assert "maximum upload size" in response.json()["detail"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_rejected_by_declared_length_before_reading(client, monkeypatch, tmp_path):
+    """A body far past the limit gets its 413 from the Content-Length alone."""
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES", 8)
+    big = b"x" * (MULTIPART_OVERHEAD_BYTES + 100)
+    with patch("app.api.upload.store_upload") as store:
+        response = client.post("/api/upload", files={"file": ("big.bin", big)})
+    assert response.status_code == 413
+    assert "maximum upload size of 8 bytes" in response.json()["detail"]
+    store.assert_not_called()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_upload_empty_file_400(client):
+    response = client.post("/api/upload", files={"file": ("empty.txt", b"")})
+    assert response.status_code == 400
+
+
+def _put_range(client, session_id, data, start, end):
+    return client.put(
+        f"/api/upload/sessions/{session_id}",
+        content=data[start:end],
+        headers={"Content-Range": f"bytes {start}-{end - 1}/{len(data)}"},
+    )
+
+
+def test_resumable_upload_flow(client, tmp_path):
+    data = b"frame" * 1000
+    created = client.post("/api/upload/sessions", json={"filename": "reel.mp4", "size": len(data)})
+    assert created.status_code == 201
+    session_id = created.json()["id"]
+
+    assert _put_range(client, session_id, data, 3000, len(data)).json()["offset"] == 0
+    progress = _put_range(client, session_id, data, 0, 2000).json()
+    assert progress["received"] == [[0, 2000], [3000, len(data)]]
+
+    incomplete = client.post(f"/api/upload/sessions/{session_id}/complete")
+    assert incomplete.status_code == 409
+
+    _put_range(client, session_id, data, 2000, 3000)
+    status = client.get(f"/api/upload/sessions/{session_id}").json()
+    assert status["complete"] and status["offset"] == len(data)
+
+    done = client.post(f"/api/upload/sessions/{session_id}/complete")
+    assert done.status_code == 200
+    body = done.json()
+    assert body["sha256"] == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / body["url"].removeprefix("/uploads/")).read_bytes() == data
+    assert client.get(f"/api/upload/sessions/{session_id}").status_code == 404
+
+
+def test_resumable_upload_errors(client, monkeypatch):
+    monkeypatch.setattr(settings, "RESUMABLE_UPLOAD_MAX_BYTES", 10)
+    assert client.post("/api/upload/sessions", json={"size": 11}).status_code == 413
+    assert client.get("/api/upload/sessions/nope").status_code == 404
+
+    session_id = client.post("/api/upload/sessions", json={"size": 10}).json()["id"]
+    bad_range = client.put(
+        f"/api/upload/sessions/{session_id}",
+        content=b"x" * 5,
+        headers={"Content-Range": "bytes 8-12/10"},
+    )
+    assert bad_range.status_code == 400
+    assert client.delete(f"/api/upload/sessions/{session_id}").status_code == 204
+    assert client.get(f"/api/upload/sessions/{session_id}").status_code == 404
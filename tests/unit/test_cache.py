@@ -0,0 +1,75 @@
+"""Unit tests for services.cache.LocalCache: LRU and byte bounds, TTL and counters."""
+from unittest.mock import patch
+
+from app.services.cache import MISSING, LocalCache, NullCache, create_cache
+
+
+def test_get_set_and_hit_miss_counters():
+    cache = LocalCache(max_entries=4, ttl_seconds=60)
+    assert cache.get("a") is MISSING
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LocalCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats().evictions == 1
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = LocalCache(max_entries=8, ttl_seconds=60, max_bytes=10)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.set("c", b"1234")  # 12 bytes: "a" goes
+    assert cache.get("a") is MISSING
+    stats = cache.stats()
+    assert (stats.size, stats.bytes, stats.evictions) == (2, 8, 1)
+
+    cache.delete("b")
+    cache.set("c", b"12")  # replacing an entry releases its old bytes
+    assert cache.stats().bytes == 2
+
+
+def test_value_over_the_byte_budget_is_not_cached():
+    cache = LocalCache(max_entries=8, ttl_seconds=60, max_bytes=10)
+    cache.set("small", b"1234")
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is MISSING
+    assert cache.get("small") == b"1234"
+    assert cache.stats().evictions == 0
+
+
+def test_entries_expire_after_ttl():
+    cache = LocalCache(max_entries=2, ttl_seconds=10)
+    with patch("app.services.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.services.cache.time.monotonic", return_value=109.0):
+        assert cache.get("a") == 1
+    with patch("app.services.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is MISSING
+    assert cache.stats().expirations == 1
+
+
+def test_delete_and_delete_matching_count_invalidations():
+    cache = LocalCache(max_entries=8, ttl_seconds=60)
+    for key in [("job", 1), ("job", 2), ("list", None)]:
+        cache.set(key, object())
+    cache.delete(("job", 1))
+    assert cache.delete_matching(lambda key: key[0] == "list") == 1
+    assert cache.get(("job", 2)) is not MISSING
+    assert cache.stats().invalidations == 2
+
+
+def test_create_cache_disabled_returns_null_cache():
+    cache = create_cache(max_entries=0, ttl_seconds=30, max_bytes=1024)
+    assert isinstance(cache, NullCache)
+    cache.set("a", 1)
+    assert cache.get("a") is MISSING
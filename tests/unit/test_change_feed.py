@@ -0,0 +1,147 @@
+"""Unit tests for the changes feed: sequence numbers, tombstones and paging."""
+import json
+from collections import namedtuple
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.schemas.job import JobCreate, JobResponse, JobUpdate
+from app.services.change_feed import (
+    add_tombstones,
+    decode_change_token,
+    encode_change_token,
+    ensure_change_counter,
+    next_change_seq,
+)
+from app.services.job_service import create_job, delete_job, get_changes_json, update_job
+
+_FeedRow = namedtuple("_FeedRow", ["change_seq", *JobResponse.model_fields])
+
+
+def _live(job: JobResponse, change_seq: int, job_id: int):
+    return _FeedRow(change_seq, *job.model_copy(update={"id": job_id}).model_dump().values())
+
+
+def _mock_db(high, live_rows, tombstones):
+    counter, live, gone = MagicMock(), MagicMock(), MagicMock()
+    counter.scalar.return_value = high
+    live.all.return_value = live_rows
+    gone.all.return_value = tombstones
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[counter, live, gone])
+    return db
+
+
+def test_change_token_round_trip_and_rejects_garbage():
+    assert decode_change_token(encode_change_token(12, 4)) == (12, 4)
+    for bad in ("", "not-base64!", encode_change_token(1, 2)[:-2]):
+        with pytest.raises(ValueError, match="Invalid token"):
+            decode_change_token(bad)
+
+
+async def test_changes_merge_live_and_deleted_jobs_in_sequence_order(sample_job_response):
+    db = _mock_db(
+        9,
+        [_live(sample_job_response, 3, 1), _live(sample_job_response, 8, 4)],
+        [(5, 2), (6, 4)],
+    )
+
+    page = json.loads(await get_changes_json(db, encode_change_token(2, 0), limit=10))
+
+    assert [job["id"] for job in page["upserted"]] == [1, 4]
+    # Job 4 was deleted at 6 and its id reused at 8: only the later event counts
+    assert page["deleted"] == [2]
+    assert decode_change_token(page["next_token"]) == (8, 4)
+    assert page["has_more"] is False
+    live_sql = str(db.execute.await_args_list[1][0][0]).lower()
+    assert "(jobs.change_seq, jobs.id) >" in live_sql and "jobs.change_seq <=" in live_sql
+    assert "order by jobs.change_seq, jobs.id" in live_sql
+    tombstone_sql = str(db.execute.await_args_list[2][0][0]).lower()
+    assert "from job_tombstones" in tombstone_sql and "job_tombstones.change_seq <=" in tombstone_sql
+
+
+async def test_changes_page_and_keep_token_when_nothing_changed(sample_job_response):
+    db = _mock_db(9, [_live(sample_job_response, 3, 1), _live(sample_job_response, 4, 5)], [(3, 2)])
+    page = json.loads(await get_changes_json(db, None, limit=2))
+    assert ([job["id"] for job in page["upserted"]], page["deleted"]) == ([1], [2])
+    assert page["has_more"] is True
+    assert decode_change_token(page["next_token"]) == (3, 2)
+
+    token = encode_change_token(9, 7)
+    page = json.loads(await get_changes_json(_mock_db(9, [], []), token, limit=2))
+    assert page == {"upserted": [], "deleted": [], "next_token": token, "has_more": False}
+
+
+async def test_next_change_seq_bumps_the_counter_row():
+    result = MagicMock()
+    result.scalar_one.return_value = 42
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    assert await next_change_seq(db) == 42
+    sql = str(db.execute.await_args[0][0]).lower()
+    assert sql.startswith("update job_change_counter set value=(job_change_counter.value +")
+    assert "returning job_change_counter.value" in sql
+
+
+async def test_add_tombstones_one_row_per_job():
+    db = AsyncMock()
+    await add_tombstones(db, [], 3)
+    db.execute.assert_not_awaited()
+
+    await add_tombstones(db, [4, 5], 3)
+    rows = db.execute.await_args[0][1]
+    assert [(row["change_seq"], row["job_id"]) for row in rows] == [(3, 4), (3, 5)]
+
+
+def test_ensure_change_counter_starts_above_existing_sequences():
+    conn = MagicMock()
+    conn.execute.return_value.first.return_value = None
+    conn.execute.return_value.scalar.side_effect = [7, 9]
+
+    ensure_change_counter(conn)
+
+    insert_stmt = conn.execute.call_args_list[-1][0][0]
+    assert insert_stmt.compile().params == {"id": 1, "value": 9}
+
+    conn.reset_mock()
+    conn.execute.return_value.first.return_value = (1,)
+    ensure_change_counter(conn)
+    assert conn.execute.call_count == 1
+
+
+async def _sync(db, token, limit):
+    """Follow the feed from token until has_more is false; one (upserted, deleted) per page."""
+    pages = []
+    while True:
+        page = json.loads(await get_changes_json(db, token, limit))
+        pages.append(([job["id"] for job in page["upserted"]], page["deleted"]))
+        token = page["next_token"]
+        if not page["has_more"]:
+            return pages, token
+
+
+async def test_feed_on_sqlite_orders_writes_and_tombstones_across_pages(sqlite_db):
+    ids = []
+    for n in range(4):
+        job = JobCreate(
+            title=f"Engineer {n}", company="Acme", date_applied="2025-02-15", status="Saved"
+        )
+        ids.append((await create_job(sqlite_db, job)).id)
+    await update_job(sqlite_db, ids[0], JobUpdate(status="Applied"))
+    await delete_job(sqlite_db, ids[1])
+    await delete_job(sqlite_db, ids[3])
+
+    # Job 1 moved past its creation; jobs 2 and 4 left only tombstones
+    pages, token = await _sync(sqlite_db, None, limit=1)
+    assert pages == [([ids[2]], []), ([ids[0]], []), ([], [ids[1]]), ([], [ids[3]])]
+    pages, _ = await _sync(sqlite_db, None, limit=3)
+    assert pages == [([ids[2], ids[0]], [ids[1]]), ([], [ids[3]])]
+
+    # A later sync from the last token sees only what happened since
+    await delete_job(sqlite_db, ids[2])
+    await update_job(sqlite_db, ids[0], JobUpdate(notes="Call back"))
+    pages, _ = await _sync(sqlite_db, token, limit=1)
+    assert pages == [([], [ids[2]]), ([ids[0]], [])]
+    pages, _ = await _sync(sqlite_db, token, limit=10)
+    assert pages == [([ids[0]], [ids[2]])]
@@ -0,0 +1,183 @@
+"""Unit tests for utils.compression: encoding negotiation and CompressionMiddleware."""
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils import compression
+from app.utils.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = "Acme Corp,Applied,Python\n" * 200
+
+
+def _make_client(minimum_size: int = 500) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE_BODY)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(5):
+                yield LARGE_BODY
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    @app.get("/image")
+    async def image():
+        return Response(b"x" * 5000, media_type="image/png")
+
+    return TestClient(app)
+
+
+# --- negotiate_encoding ---
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, deflate, br", "gzip"),
+        ("gzip;q=0", None),
+        ("*", compression.available_encodings()[0]),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_encoding_prefers_higher_q_then_server_order(monkeypatch):
+    """Client q-values win; ties fall back to server preference (zstd first)."""
+    monkeypatch.setattr(compression, "available_encodings", lambda: ["zstd", "gzip"])
+    assert negotiate_encoding("gzip;q=1.0, zstd;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip, zstd") == "zstd"
+
+
+# --- CompressionMiddleware ---
+
+
+def test_small_response_is_not_compressed():
+    response = _make_client().get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "tiny"
+
+
+def test_large_response_is_gzipped_with_vary_and_length():
+    client = _make_client()
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(LARGE_BODY)
+    assert response.text == LARGE_BODY
+
+
+def test_no_accept_encoding_passes_through():
+    response = _make_client().get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE_BODY
+
+
+async def test_streaming_response_is_compressed_incrementally():
+    """Each streamed chunk is sent as soon as it arrives, as a decodable gzip segment."""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/csv")],
+            }
+        )
+        for i in range(5):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": LARGE_BODY.encode(),
+                    "more_body": i < 4,
+                }
+            )
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app, minimum_size=500)(scope, None, send)
+
+    start, *bodies = sent
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+    assert len(bodies) == 5
+    assert [m["more_body"] for m in bodies] == [True, True, True, True, False]
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    # The first chunk decodes on its own thanks to the sync flush
+    assert decoder.decompress(bodies[0]["body"]) == LARGE_BODY.encode()
+    raw = b"".join(m["body"] for m in bodies)
+    assert gzip.decompress(raw) == (LARGE_BODY * 5).encode()
+
+
+def test_excluded_content_type_is_not_compressed():
+    response = _make_client().get("/image", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_zstd_when_available():
+    zstandard = pytest.importorskip("zstandard")
+    client = _make_client()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "zstd"}) as response:
+        assert response.headers["content-encoding"] == "zstd"
+        raw = b"".join(response.iter_raw())
+    decoded = zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+    assert decoded == (LARGE_BODY * 5).encode()
+
+
+async def test_pathsend_file_is_passed_through_untouched():
+    """Zero-copy file responses keep their headers and reach the server as pathsend."""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/plain"), (b"content-length", b"5000")],
+            }
+        )
+        await send({"type": "http.response.pathsend", "path": "/tmp/notes.txt"})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app, minimum_size=500)(scope, None, send)
+
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.pathsend"]
+    assert b"content-encoding" not in dict(sent[0]["headers"])
+
+
+def test_compressed_response_weakens_strong_etag():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=10)
+
+    @app.get("/doc")
+    async def doc():
+        return PlainTextResponse(LARGE_BODY, headers={"ETag": '"abc"'})
+
+    response = TestClient(app).get("/doc", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
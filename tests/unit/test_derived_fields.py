@@ -0,0 +1,163 @@
+"""Unit tests for the typed date/salary columns derived from job text fields."""
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+
+from app.models.job import Job
+from app.schemas.job import JobFilters
+from app.services.derived_fields import (
+    backfill_derived,
+    derived_values,
+    parse_applied_on,
+    parse_salary,
+    salary_expressions,
+)
+from app.services.job_service import _filters_key, _filters_match
+
+
+@pytest.mark.parametrize(
+    "salary_range,frequency,expected",
+    [
+        ("$100k-$150k", "Yearly", (100000, 150000)),
+        ("100-150k", None, (100000, 150000)),
+        ("100,000 - 120,000", "yearly", (100000, 120000)),
+        ("€50.5k – €60k", "Yearly", (50500, 60000)),
+        ("$45/hr", "Hourly", (93600, 93600)),
+        ("5000", "Monthly", (60000, 60000)),
+        ("1.2M", "Yearly", (1200000, 1200000)),
+        ("100k USD to 150k USD", None, (100000, 150000)),
+        # A second amount only counts when a range separator joins it
+        ("$120,000 + 10% bonus", "Yearly", (120000, 120000)),
+        ("100-150k plus 5k signing", None, (100000, 150000)),
+        ("10% equity", None, (None, None)),
+        # Implausible once annualized, and too big for an INTEGER column
+        ("1,200,000", "Hourly", (None, None)),
+        ("Competitive", "Yearly", (None, None)),
+        ("80k", "Fortnightly", (None, None)),
+        (None, "Yearly", (None, None)),
+    ],
+)
+def test_parse_salary_annualizes(salary_range, frequency, expected):
+    assert parse_salary(salary_range, frequency) == expected
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("2025-02-15", date(2025, 2, 15)),
+        ("2025-2-5", date(2025, 2, 5)),
+        ("2025-02-15T10:30:00Z", date(2025, 2, 15)),
+        ("2025/02/15", date(2025, 2, 15)),
+        ("02/15/2025", date(2025, 2, 15)),
+        ("last week", None),
+        (None, None),
+    ],
+)
+def test_parse_applied_on(value, expected):
+    assert parse_applied_on(value) == expected
+
+
+def test_derived_values_only_covers_sources_present():
+    assert derived_values({"status": "Offer"}) == {}
+    assert derived_values({"date_applied": "2025-02-15"}) == {"applied_on": date(2025, 2, 15)}
+    # One salary source without the current row can't be annualized
+    assert derived_values({"salary_frequency": "Monthly"}) == {}
+    assert derived_values(
+        {"salary_frequency": "Monthly"},
+        {"salary_range": "5k", "salary_frequency": "Yearly"},
+    ) == {"salary_min": 60000, "salary_max": 60000}
+
+
+@pytest.mark.parametrize(
+    "old,values,exact",
+    [
+        (("40-50", "Hourly"), {"salary_frequency": "Yearly"}, True),
+        (("$5k - 6k", "Monthly"), {"salary_frequency": " weekly "}, True),
+        (("90k", "Yearly"), {"salary_frequency": "Fortnightly"}, True),
+        (("90k", "Monthly"), {"salary_range": "$100-120"}, True),
+        (("90k", "Fortnightly"), {"salary_range": "$100-120"}, True),
+        (("90k", None), {"salary_range": "Competitive"}, True),
+        (("500k", "Yearly"), {"salary_frequency": "Hourly"}, True),
+        # Rounded when it was annualized, or nothing to rescale from
+        (("45.01", "Yearly"), {"salary_frequency": "Hourly"}, False),
+        (("90k", "Fortnightly"), {"salary_frequency": "Yearly"}, False),
+    ],
+)
+def test_salary_expressions_in_sqlite_match_parse_salary_where_exact(old, values, exact):
+    engine = create_engine("sqlite://")
+    Job.__table__.create(engine)
+    salary_range, frequency = old
+    low, high = parse_salary(salary_range, frequency)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Job).values(
+                id=1, title="Eng", company="Acme", date_applied="2025-02-15",
+                status="Saved", salary_range=salary_range, salary_frequency=frequency,
+                salary_min=low, salary_max=high,
+            )
+        )
+        conn.execute(update(Job).values(**values, **salary_expressions(values)))
+        row = conn.execute(select(Job.salary_min, Job.salary_max)).one()
+    expected = parse_salary(
+        values.get("salary_range", salary_range), values.get("salary_frequency", frequency)
+    )
+    assert (tuple(row) == expected) is exact
+
+
+def test_salary_expressions_only_for_one_source():
+    assert salary_expressions({"status": "Offer"}) == {}
+    assert salary_expressions({"salary_range": "5k", "salary_frequency": "Yearly"}) == {}
+    assert salary_expressions({"salary_frequency": "Fortnightly"}) == {
+        "salary_min": None,
+        "salary_max": None,
+    }
+
+
+def test_filters_match_uses_parsed_dates_and_salary_overlap():
+    job = {
+        "status": "Applied",
+        "work_model": None,
+        "company": "Acme",
+        "date_applied": "2025-2-5",
+        "salary_range": "$100k-$150k",
+        "salary_frequency": "Yearly",
+    }
+    assert _filters_match(_filters_key(JobFilters(date_from="2025-02-01")), job)
+    assert not _filters_match(_filters_key(JobFilters(date_to="2025-02-04")), job)
+    assert _filters_match(_filters_key(JobFilters(salary_min=140000)), job)
+    assert not _filters_match(_filters_key(JobFilters(salary_min=160000)), job)
+    assert not _filters_match(_filters_key(JobFilters(salary_max=90000)), job)
+    assert not _filters_match(
+        _filters_key(JobFilters(salary_min=1)), {**job, "salary_range": "DOE"}
+    )
+
+
+def test_backfill_updates_only_rows_whose_derived_values_changed():
+    def _row(**values):
+        row = MagicMock(id=values["id"])
+        row._asdict.return_value = values
+        return row
+
+    stale = _row(
+        id=1, date_applied="2025-02-15", salary_range="90k", salary_frequency="Yearly",
+        applied_on=None, salary_min=None, salary_max=None,
+    )
+    current = _row(
+        id=2, date_applied="2025-02-16", salary_range=None, salary_frequency="Yearly",
+        applied_on=date(2025, 2, 16), salary_min=None, salary_max=None,
+    )
+    batches = [MagicMock(), MagicMock(), MagicMock()]
+    batches[0].all.return_value = [stale, current]
+    batches[2].all.return_value = []
+    conn = MagicMock()
+    conn.execute.side_effect = batches
+
+    assert backfill_derived(conn) == 1
+    update_stmt, rows = conn.execute.call_args_list[1][0]
+    assert str(update_stmt).startswith("UPDATE jobs SET applied_on=")
+    assert rows == [
+        {"job_id": 1, "applied_on": date(2025, 2, 15), "salary_min": 90000, "salary_max": 90000}
+    ]
+    assert "jobs.id >" in str(conn.execute.call_args_list[2][0][0])
@@ -0,0 +1,69 @@
+"""Unit tests for services.events: JobChange encoding, ChangeBus and the Unix-socket transport."""
+import asyncio
+
+from app.services.events import ChangeBus, JobChange, UnixSocketTransport
+
+
+def test_job_change_round_trips_and_keeps_only_event_fields():
+    change = JobChange.from_rows(
+        7, "updated", [{"status": "Saved", "company": "Acme", "notes": "secret"}], change_seq=12
+    )
+    assert "notes" not in change.rows[0]
+    assert JobChange.from_bytes(change.to_bytes()) == change
+
+
+def test_publish_delivers_to_local_listeners_and_isolates_failures():
+    bus = ChangeBus()
+    received = []
+
+    def broken(change):
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(received.append)
+    change = JobChange(job_id=1, kind="created")
+    bus.publish(change)
+    assert received == [change]
+
+
+async def _wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def test_unix_socket_transport_fans_out_to_other_workers(tmp_path):
+    """A change published on one bus reaches listeners on every other bus."""
+    bus_a, bus_b, bus_c = ChangeBus(), ChangeBus(), ChangeBus()
+    received_a, received_b, received_c = [], [], []
+    bus_a.subscribe(received_a.append)
+    bus_b.subscribe(received_b.append)
+    bus_c.subscribe(received_c.append)
+    await bus_a.start(UnixSocketTransport(str(tmp_path), name="a"))
+    await bus_b.start(UnixSocketTransport(str(tmp_path), name="b"))
+    await bus_c.start(UnixSocketTransport(str(tmp_path), name="c"))
+    try:
+        # Pretend the change came from another process so the origin check passes
+        change = JobChange(job_id=5, kind="deleted", origin=-1)
+        bus_a.publish(change)
+        await _wait_for(lambda: received_b and received_c)
+        assert received_a == [change]  # local delivery, exactly once
+        assert received_b == [change] and received_c == [change]
+    finally:
+        await bus_a.stop()
+        await bus_b.stop()
+        await bus_c.stop()
+    assert not list(tmp_path.glob("*.sock"))
+
+
+async def test_send_removes_sockets_of_dead_workers(tmp_path):
+    bus = ChangeBus()
+    await bus.start(UnixSocketTransport(str(tmp_path), name="live"))
+    stale = tmp_path / "dead.sock"
+    stale.touch()
+    try:
+        bus.publish(JobChange(job_id=1, kind="created"))
+    finally:
+        await bus.stop()
+    assert not stale.exists()
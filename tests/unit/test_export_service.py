@@ -1,11 +1,21 @@
-"""Unit tests for export_service: generate_csv (4.2) and generate_json (4.3)."""
+"""Unit tests for export_service: generate_csv (4.2), generate_json (4.3) and streaming."""
 import csv
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
+from app.config import settings
 from app.schemas.job import JobResponse
-from app.services.export_service import generate_csv, generate_json
+from app.services import export_service
+from app.services.export_service import (
+    generate_csv,
+    generate_json,
+    iter_csv,
+    iter_json,
+    iter_ndjson,
+    parse_columns,
+)
 
 
 # --- 4.2 generate_csv ---
@@ -162,3 +172,137 @@ def test_generate_json_preserves_tech_stack_and_attachments_as_arrays(
     assert data2[0]["attachments"] == [
         {"name": "resume.pdf", "url": "/uploads/resume.pdf"}
     ]
+
+
+# --- Streaming iter_csv / iter_json ---
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+async def test_iter_csv_matches_generate_csv(sample_job_response, count):
+    """Streaming CSV output is byte-identical to generate_csv."""
+    jobs = [sample_job_response.model_copy(update={"id": i}) for i in range(count)]
+    chunks = await _collect(iter_csv(_aiter([j.model_dump() for j in jobs]), chunk_rows=2))
+    assert "".join(chunks) == generate_csv(jobs)
+
+
+@pytest.mark.parametrize("count", [0, 1, 5])
+async def test_iter_json_matches_generate_json(sample_job_response_with_nested, count):
+    """Streaming JSON output is identical to generate_json, including empty '[]'."""
+    jobs = [
+        sample_job_response_with_nested.model_copy(update={"id": i})
+        for i in range(count)
+    ]
+    chunks = await _collect(iter_json(_aiter([j.model_dump() for j in jobs]), chunk_rows=2))
+    assert "".join(chunks) == generate_json(jobs)
+
+
+async def test_iter_csv_emits_bounded_chunks(sample_job_response):
+    """Rows are flushed every chunk_rows rows rather than buffered to the end."""
+    rows = [sample_job_response.model_dump() for _ in range(5)]
+    chunks = await _collect(iter_csv(_aiter(rows), chunk_rows=2))
+    # header+2 rows, 2 rows, 1 row
+    assert [len(list(csv.reader(c.splitlines()))) for c in chunks] == [3, 2, 1]
+
+
+# --- Projection and NDJSON ---
+
+
+def test_parse_columns_defaults_and_preserves_order():
+    """Empty value -> all columns; explicit list keeps order and drops duplicates."""
+    assert parse_columns(None) == EXPECTED_CSV_HEADERS
+    assert parse_columns("title, id,title") == ["title", "id"]
+
+
+@pytest.mark.parametrize("value", ["nope", "id,nope", ",,"])
+def test_parse_columns_rejects_unknown_or_empty(value):
+    with pytest.raises(ValueError):
+        parse_columns(value)
+
+
+async def test_iter_csv_with_projection_writes_only_selected_columns(sample_job_response):
+    rows = [{"title": sample_job_response.title, "id": sample_job_response.id}]
+    content = "".join(await _collect(iter_csv(_aiter(rows), ["title", "id"])))
+    assert list(csv.reader(content.splitlines())) == [
+        ["title", "id"],
+        ["Backend Engineer", "1"],
+    ]
+
+
+async def test_iter_ndjson_one_compact_object_per_line(sample_job_response_with_nested):
+    rows = [sample_job_response_with_nested.model_dump() for _ in range(3)]
+    content = "".join(await _collect(iter_ndjson(_aiter(rows), chunk_rows=2)))
+    lines = content.split("\n")
+    assert lines[-1] == ""
+    parsed = [json.loads(line) for line in lines[:-1]]
+    assert len(parsed) == 3
+    assert parsed[0]["attachments"] == [{"name": "resume.pdf", "url": "/uploads/resume.pdf"}]
+    assert parsed[0]["created_at"] == "2025-02-20T12:00:00"
+
+
+async def test_iter_ndjson_empty_stream_yields_nothing():
+    assert "".join(await _collect(iter_ndjson(_aiter([])))) == ""
+
+
+# --- Formatting in the process pool ---
+
+
+class _CountingPool(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.batches = 0
+
+    def submit(self, fn, *args, **kwargs):
+        self.batches += 1
+        return super().submit(fn, *args, **kwargs)
+
+
+@pytest.fixture
+def format_pool(monkeypatch):
+    """Offload every batch of 2+ rows to a 2-worker pool that counts submissions."""
+    pool = _CountingPool()
+    monkeypatch.setattr(settings, "EXPORT_FORMAT_PROCESSES", 2)
+    monkeypatch.setattr(export_service, "OFFLOAD_MIN_ROWS", 2)
+    monkeypatch.setattr(export_service, "_format_pool", pool)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.parametrize("format", ["csv", "json", "ndjson"])
+async def test_offloaded_batches_are_stitched_in_order(
+    format_pool, monkeypatch, sample_job_response_with_nested, format
+):
+    rows = [
+        sample_job_response_with_nested.model_copy(update={"id": i}).model_dump()
+        for i in range(7)
+    ]
+    make_chunks = {"csv": iter_csv, "json": iter_json, "ndjson": iter_ndjson}[format]
+    offloaded = await _collect(make_chunks(_aiter(rows), chunk_rows=2))
+    # 3 full batches go to the pool; the 1-row tail is below OFFLOAD_MIN_ROWS
+    assert format_pool.batches == 3
+
+    monkeypatch.setattr(settings, "EXPORT_FORMAT_PROCESSES", 0)
+    monkeypatch.setattr(export_service, "_format_pool", None)
+    assert "".join(offloaded) == "".join(await _collect(make_chunks(_aiter(rows), chunk_rows=2)))
+
+
+async def test_format_process_pool_round_trips_rows(monkeypatch, sample_job_response):
+    """Batches and formatters pickle into real worker processes."""
+    monkeypatch.setattr(settings, "EXPORT_FORMAT_PROCESSES", 1)
+    monkeypatch.setattr(export_service, "OFFLOAD_MIN_ROWS", 1)
+    monkeypatch.setattr(export_service, "_format_pool", None)
+    try:
+        content = "".join(
+            await _collect(iter_csv(_aiter([sample_job_response.model_dump()]), ["id", "title"]))
+        )
+    finally:
+        export_service.shutdown_format_pool()
+    assert list(csv.reader(content.splitlines())) == [["id", "title"], ["1", "Backend Engineer"]]
@@ -0,0 +1,235 @@
+"""Unit tests for background exports: state files, reuse and the bounded runner."""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import settings
+from app.schemas.job import JobFilters
+from app.services import export_tasks
+from app.services.export_tasks import ExportQueueFull, ExportRunner, get_export, start_export
+from app.utils.export_store import (
+    ExportNotFound,
+    ExportRecord,
+    artifact_path,
+    create_export,
+    expire_exports,
+    exports_dir,
+    load_export,
+    save_export,
+)
+
+SAVED = JobFilters(status=["Saved"])
+
+
+@asynccontextmanager
+async def _session():
+    yield MagicMock()
+
+
+@pytest.fixture
+def exports(tmp_path, monkeypatch):
+    """Exports under tmp_path, a one-slot runner and two jobs to export."""
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(export_tasks, "export_runner", ExportRunner(1, 1))
+    monkeypatch.setattr(export_tasks, "async_session_maker", _session)
+    monkeypatch.setattr(
+        export_tasks, "current_position", AsyncMock(return_value=(5, 0))
+    )
+    calls = []
+
+    async def stream_jobs(db, columns, filters=None):
+        calls.append(filters)
+        for job_id in (1, 2):
+            yield {"id": job_id, "title": f"Job {job_id}"}
+
+    monkeypatch.setattr(export_tasks, "stream_jobs", stream_jobs)
+    return calls
+
+
+async def _finished(export_id):
+    for _ in range(200):
+        record = await get_export(export_id)
+        if record.status in ("done", "failed"):
+            return record
+        await asyncio.sleep(0.01)
+    raise AssertionError("export did not finish")
+
+
+async def test_export_runs_in_background_and_writes_its_file(exports, tmp_path):
+    record = await start_export(MagicMock(), "ndjson", ["id", "title"], SAVED)
+    assert record.status == "pending"
+    assert record.filename.startswith("saved-jobs-") and record.filename.endswith(".ndjson")
+
+    done = await _finished(record.id)
+    assert (done.status, done.rows) == ("done", 2)
+    path = exports_dir(tmp_path) / f"{record.id}.ndjson"
+    lines = path.read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+    assert done.size == path.stat().st_size
+    assert not list(exports_dir(tmp_path).glob(".*"))  # no temporary files left
+
+
+async def test_identical_request_reuses_export_until_jobs_change(exports):
+    first = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    again = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    assert again.id == first.id
+    await _finished(first.id)
+    assert (await start_export(MagicMock(), "csv", ["id"], SAVED)).status == "done"
+    assert len(exports) == 1
+
+    other = await start_export(MagicMock(), "csv", ["id", "title"], SAVED)
+    assert other.id != first.id
+    export_tasks.current_position.return_value = (6, 0)  # a job was written
+    assert (await start_export(MagicMock(), "csv", ["id"], SAVED)).id != first.id
+
+
+async def test_failed_export_is_reported_and_retried(exports, monkeypatch):
+    async def broken(db, columns, filters=None):
+        raise RuntimeError("database went away")
+        yield
+
+    working = export_tasks.stream_jobs
+    monkeypatch.setattr(export_tasks, "stream_jobs", broken)
+    record = await start_export(MagicMock(), "json", ["id"], SAVED)
+    failed = await _finished(record.id)
+    assert (failed.status, failed.error) == ("failed", "database went away")
+
+    monkeypatch.setattr(export_tasks, "stream_jobs", working)
+    retried = await start_export(MagicMock(), "json", ["id"], SAVED)
+    assert (retried.id, retried.status) == (record.id, "pending")
+    assert (await _finished(record.id)).status == "done"
+
+
+async def test_runner_rejects_exports_beyond_its_bounds(exports, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow(db, columns, filters=None):
+        await release.wait()
+        yield {"id": 1}
+
+    monkeypatch.setattr(export_tasks, "stream_jobs", slow)
+    running = await start_export(MagicMock(), "csv", ["id"], JobFilters(status=["A"]))
+    queued = await start_export(MagicMock(), "csv", ["id"], JobFilters(status=["B"]))
+    with pytest.raises(ExportQueueFull):
+        await start_export(MagicMock(), "csv", ["id"], JobFilters(status=["C"]))
+    # Exports already accepted are still returned
+    assert (await start_export(MagicMock(), "csv", ["id"], JobFilters(status=["A"]))).id == running.id
+
+    release.set()
+    assert (await _finished(running.id)).status == "done"
+    assert (await _finished(queued.id)).status == "done"
+    while queued.id in export_tasks.export_runner:
+        await asyncio.sleep(0.01)
+    await start_export(MagicMock(), "csv", ["id"], JobFilters(status=["C"]))
+
+
+def _stuck(tmp_path, export_id, age):
+    """Leave a running export whose state was last touched age seconds ago."""
+    stuck = ExportRecord(
+        id=export_id, format="csv", filename="x.csv", status="running", created_at=0
+    )
+    path = exports_dir(tmp_path) / f"{export_id}.json"
+    # Written by an older version, which also stored the worker's pid
+    path.write_text(json.dumps({**stuck.__dict__, "pid": 1}))
+    mtime = path.stat().st_mtime - age
+    os.utime(path, (mtime, mtime))
+
+
+async def test_abandoned_export_is_restarted(exports, tmp_path):
+    """An unfinished export whose heartbeat stopped (e.g. after a restart) starts over."""
+    record = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    await _finished(record.id)
+    _stuck(tmp_path, record.id, settings.EXPORT_HEARTBEAT_SECONDS * 3 + 1)
+
+    restarted = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    assert (restarted.id, restarted.status) == (record.id, "pending")
+    assert (await _finished(record.id)).status == "done"
+
+
+async def test_export_with_a_live_heartbeat_is_left_to_its_worker(exports, tmp_path):
+    """Another worker touched the state recently: it is still generating the export."""
+    record = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    await _finished(record.id)
+    _stuck(tmp_path, record.id, settings.EXPORT_HEARTBEAT_SECONDS)
+
+    again = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    assert again.status == "running"
+    assert record.id not in export_tasks.export_runner
+
+
+async def test_heartbeat_touches_state_until_the_export_finishes(exports, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_HEARTBEAT_SECONDS", 0.01)
+    release = asyncio.Event()
+
+    async def slow(db, columns, filters=None):
+        await release.wait()
+        yield {"id": 1}
+
+    monkeypatch.setattr(export_tasks, "stream_jobs", slow)
+    record = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    path = exports_dir(tmp_path) / f"{record.id}.json"
+    os.utime(path, (0, 0))
+    await asyncio.sleep(0.05)
+    assert path.stat().st_mtime > 0
+
+    release.set()
+    await _finished(record.id)
+    while record.id in export_tasks.export_runner:
+        await asyncio.sleep(0.01)
+    os.utime(path, (0, 0))
+    await asyncio.sleep(0.05)
+    assert path.stat().st_mtime == 0
+
+
+async def test_finished_export_whose_file_is_gone_is_regenerated(exports, tmp_path):
+    record = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    done = await _finished(record.id)
+    artifact_path(tmp_path, done).unlink()
+
+    again = await start_export(MagicMock(), "csv", ["id"], SAVED)
+    assert (again.id, again.status) == (record.id, "pending")
+    assert (await _finished(record.id)).status == "done"
+    assert artifact_path(tmp_path, done).is_file()
+
+
+def test_store_creates_once_and_rejects_bad_ids(tmp_path):
+    record = ExportRecord(
+        id="a" * 32, format="csv", filename="jobs.csv", status="pending", created_at=1.0
+    )
+    assert create_export(tmp_path, record) is True
+    assert create_export(tmp_path, record) is False
+    assert load_export(tmp_path, record.id) == record
+    for bad in ("../../etc/passwd", "A" * 32, "a" * 31):
+        with pytest.raises(ExportNotFound):
+            load_export(tmp_path, bad)
+
+    assert expire_exports(tmp_path, 3600) == 0
+    assert expire_exports(tmp_path, -1) == 1
+    with pytest.raises(ExportNotFound):
+        load_export(tmp_path, record.id)
+
+
+def test_export_file_expires_with_its_state(tmp_path):
+    """The file goes when its state does, even if it is newer, and never before."""
+    old, fresh = (
+        ExportRecord(
+            id=c * 32, format="csv", filename="jobs.csv", status="done", created_at=1.0
+        )
+        for c in "ab"
+    )
+    for record in (old, fresh):
+        save_export(tmp_path, record)
+        artifact_path(tmp_path, record).write_text("id\n")
+    directory = exports_dir(tmp_path)
+    os.utime(directory / f"{old.id}.json", (0, 0))
+    # Older than its state: still kept while the state is
+    os.utime(artifact_path(tmp_path, fresh), (0, 0))
+    (directory / ".leftover.part").write_text("")
+    os.utime(directory / ".leftover.part", (0, 0))
+
+    assert expire_exports(tmp_path, 3600) == 1
+    assert sorted(p.name for p in directory.iterdir()) == [f"{fresh.id}.csv", f"{fresh.id}.json"]
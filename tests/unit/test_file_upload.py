@@ -0,0 +1,64 @@
+"""Unit tests for utils.file_upload: chunked, hashed, size-limited saves."""
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.utils import file_upload
+from app.utils.file_upload import UploadTooLargeError, save_upload_file
+
+
+def _upload(data: bytes, filename: str = "resume.pdf", size=None) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename, size=size)
+
+
+class _CountingReader(io.BytesIO):
+    """BytesIO that records the size of every read call."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.reads = []
+
+    def read(self, size=-1):
+        self.reads.append(size)
+        return super().read(size)
+
+
+async def test_save_streams_in_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_upload, "UPLOAD_CHUNK_SIZE", 4)
+    data = b"0123456789"
+    source = _CountingReader(data)
+
+    saved = await save_upload_file(UploadFile(file=source, filename="a.txt"), str(tmp_path))
+
+    assert all(size == 4 for size in source.reads)  # never read(-1)
+    assert saved.filename.endswith(".txt")
+    assert saved.size == len(data)
+    assert saved.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / saved.filename).read_bytes() == data
+    assert not list(tmp_path.glob("*.part"))
+
+
+async def test_save_rejects_oversized_stream_and_cleans_up(tmp_path, monkeypatch):
+    """Size is enforced while streaming even when the client didn't declare it."""
+    monkeypatch.setattr(file_upload, "UPLOAD_CHUNK_SIZE", 4)
+
+    with pytest.raises(UploadTooLargeError):
+        await save_upload_file(_upload(b"x" * 20), str(tmp_path), max_size=10)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_save_rejects_declared_oversized_upload_before_reading(tmp_path):
+    source = _CountingReader(b"x" * 20)
+    with pytest.raises(UploadTooLargeError):
+        await save_upload_file(
+            UploadFile(file=source, filename="a.bin", size=20), str(tmp_path), max_size=10
+        )
+    assert source.reads == []
+
+
+async def test_save_at_exact_limit_succeeds(tmp_path):
+    saved = await save_upload_file(_upload(b"x" * 10), str(tmp_path), max_size=10)
+    assert saved.size == 10
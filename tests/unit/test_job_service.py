@@ -1,11 +1,41 @@
-"""Unit tests for job_service.get_saved_jobs (Task 4.1)."""
-from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock
+"""Unit tests for job_service: get_saved_jobs (Task 4.1), filters, pagination, caching and JSON fast path."""
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from unittest.mock import ANY, AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
+
 from app.models.job import Job
 from app.schemas.job import JobResponse
-from app.services.job_service import get_saved_jobs
+from app.schemas.job import (
+    JobBulkRequest,
+    JobBulkUpdate,
+    JobCreate,
+    JobFilters,
+    JobStats,
+    JobUpdate,
+    StatBucket,
+)
+from app.services.cache import MISSING
+from app.services.job_service import (
+    _decode_cursor,
+    _encode_cursor,
+    _week_start,
+    bulk_write,
+    create_job,
+    delete_job,
+    get_job,
+    get_job_version,
+    get_jobs_json,
+    get_jobs_page_json,
+    get_job_stats,
+    get_jobs_version,
+    get_saved_jobs,
+    stream_jobs,
+    update_job,
+)
 
 
 @pytest.mark.asyncio
@@ -76,3 +106,657 @@ async def test_get_saved_jobs_returns_empty_list_when_no_saved_jobs():
 
     assert result == []
     assert mock_db.execute.await_count == 1
+
+
+# --- Keyset pagination ---
+
+
+def _make_mock_job(job_id: int, date_applied: str) -> MagicMock:
+    now = datetime(2025, 2, 20, 12, 0, 0)
+    mock_job = MagicMock(spec=Job)
+    mock_job.id = job_id
+    mock_job.title = f"Engineer {job_id}"
+    mock_job.company = "Acme"
+    mock_job.url = None
+    mock_job.date_applied = date_applied
+    mock_job.status = "Applied"
+    mock_job.work_model = None
+    mock_job.salary_range = None
+    mock_job.salary_frequency = "Yearly"
+    mock_job.tech_stack = []
+    mock_job.notes = None
+    mock_job.screenshot_url = None
+    mock_job.resume_url = None
+    mock_job.cover_letter_url = None
+    mock_job.attachments = []
+    mock_job.created_at = now
+    mock_job.updated_at = now
+    return mock_job
+
+
+def test_cursor_round_trip():
+    """_decode_cursor inverts _encode_cursor."""
+    token = _encode_cursor("2025-02-15", 42)
+    assert _decode_cursor(token) == ("2025-02-15", 42)
+
+
+@pytest.mark.parametrize("bad", ["not-a-cursor", "", "WzEsMl0"])
+def test_decode_cursor_rejects_malformed_tokens(bad):
+    """Garbage or wrongly-typed payloads raise ValueError."""
+    with pytest.raises(ValueError):
+        _decode_cursor(bad)
+
+
+async def test_get_jobs_page_json_last_page_has_no_cursor_and_seeks_after_cursor(
+    sample_job_response,
+):
+    """Passing a cursor adds a (date_applied, id) seek predicate."""
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        _named_row(_response_row(sample_job_response, id=1, date_applied="2025-02-13"))
+    ]
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    data = json.loads(
+        await get_jobs_page_json(mock_db, limit=2, cursor=_encode_cursor("2025-02-14", 2))
+    )
+
+    assert data["next_cursor"] is None
+    assert [item["id"] for item in data["items"]] == [1]
+    statement = mock_db.execute.await_args[0][0]
+    stmt_str = str(statement).lower()
+    assert "(jobs.date_applied, jobs.id) <" in stmt_str
+    params = statement.compile().params.values()
+    assert "2025-02-14" in params and 2 in params
+
+
+# --- Server-side filters ---
+
+
+async def test_get_jobs_json_pushes_filters_into_where_clause():
+    """Every JobFilters field becomes a SQL predicate with bound params."""
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    filters = JobFilters(
+        status=["Applied", "Interviewing"],
+        work_model="Remote",
+        company="Acme",
+        date_from="2025-01-01",
+        date_to="2025-01-31",
+        salary_min=90000,
+        salary_max=150000,
+    )
+    await get_jobs_json(mock_db, filters)
+
+    statement = mock_db.execute.await_args[0][0]
+    stmt_str = str(statement).lower()
+    assert "jobs.status in" in stmt_str
+    assert "jobs.work_model =" in stmt_str
+    assert "jobs.company =" in stmt_str
+    # Date and salary ranges use the typed columns derived on write
+    assert "jobs.applied_on >=" in stmt_str
+    assert "jobs.applied_on <=" in stmt_str
+    assert "jobs.salary_max >=" in stmt_str
+    assert "jobs.salary_min <=" in stmt_str
+    params = statement.compile(compile_kwargs={"render_postcompile": True}).params
+    for value in (
+        "Applied", "Interviewing", "Remote", "Acme",
+        date(2025, 1, 1), date(2025, 1, 31), 90000, 150000,
+    ):
+        assert value in params.values()
+
+
+async def test_get_jobs_json_without_filters_has_no_where_clause():
+    """Empty filters leave the query unconstrained."""
+    mock_result = MagicMock()
+    mock_result.all.return_value = []
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await get_jobs_json(mock_db, JobFilters())
+
+    statement = mock_db.execute.await_args[0][0]
+    assert "where" not in str(statement).lower()
+
+
+# --- Dashboard stats ---
+
+
+async def test_get_job_stats_runs_one_group_by_per_dimension(fresh_job_cache):
+    results = []
+    for rows in (
+        [("Applied", 3), ("Saved", 1)],
+        [("Remote", 2), (None, 2)],
+        [("2025-02-10", 1), ("2025-02-17", 3)],
+    ):
+        result = MagicMock()
+        result.all.return_value = rows
+        results.append(result)
+    mock_db = AsyncMock()
+    mock_db.bind = MagicMock()
+    mock_db.bind.dialect.name = "sqlite"
+    mock_db.execute = AsyncMock(side_effect=results)
+
+    filters = JobFilters(date_from="2025-02-01")
+    stats = await get_job_stats(mock_db, filters)
+
+    assert stats == JobStats(
+        total=4,
+        by_status=[StatBucket(key="Applied", count=3), StatBucket(key="Saved", count=1)],
+        by_work_model=[StatBucket(key="Remote", count=2), StatBucket(key=None, count=2)],
+        per_week=[StatBucket(key="2025-02-10", count=1), StatBucket(key="2025-02-17", count=3)],
+    )
+    statements = [str(call[0][0]).lower() for call in mock_db.execute.await_args_list]
+    assert all("group by anon_1.key" in sql for sql in statements)
+    assert all("jobs.applied_on >=" in sql for sql in statements)
+    assert "date(jobs.applied_on" in statements[2]
+    assert "anon_1.key is not null" in statements[2]
+
+    # Served from the cache until a write touches a matching job
+    assert await get_job_stats(mock_db, filters) == stats
+    assert mock_db.execute.await_count == 3
+
+
+async def test_get_job_stats_on_sqlite_buckets_weeks_from_monday(sqlite_db):
+    for date_applied, status, work_model in [
+        ("2025-02-09", "Applied", "Remote"),  # a Sunday: the week of 2025-02-03
+        ("2025-02-10", "Applied", None),  # a Monday starts its own week
+        ("2025/02/16", "Saved", "Remote"),
+        ("02/17/2025", "Offer", "Hybrid"),
+        ("someday", "Saved", None),  # counted, but in no week
+    ]:
+        await create_job(
+            sqlite_db,
+            JobCreate(
+                title="Engineer", company="Acme", date_applied=date_applied,
+                status=status, work_model=work_model,
+            ),
+        )
+
+    stats = await get_job_stats(sqlite_db)
+
+    assert stats.total == 5
+    assert stats.by_status == [
+        StatBucket(key="Applied", count=2),
+        StatBucket(key="Saved", count=2),
+        StatBucket(key="Offer", count=1),
+    ]
+    assert stats.by_work_model == [
+        StatBucket(key=None, count=2),
+        StatBucket(key="Remote", count=2),
+        StatBucket(key="Hybrid", count=1),
+    ]
+    assert stats.per_week == [
+        StatBucket(key="2025-02-03", count=1),
+        StatBucket(key="2025-02-10", count=2),
+        StatBucket(key="2025-02-17", count=1),
+    ]
+    filtered = await get_job_stats(sqlite_db, JobFilters(date_from="2025-02-10"))
+    assert [bucket.key for bucket in filtered.per_week] == ["2025-02-10", "2025-02-17"]
+
+
+def test_week_start_on_postgres_truncates_applied_on():
+    sql = str(_week_start("postgresql").compile(dialect=postgresql.dialect()))
+    assert sql.startswith("to_char(date_trunc(")
+    assert "jobs.applied_on" in sql
+
+
+# --- Streaming ---
+
+
+async def test_stream_jobs_selects_only_requested_columns_with_server_side_cursor():
+    """stream_jobs projects the SELECT, streams with yield_per and parses JSON fields."""
+    Row = namedtuple("Row", ["id", "tech_stack"])
+
+    async def _rows():
+        yield Row(2, '["Rust"]')
+        yield Row(1, None)
+
+    mock_db = AsyncMock()
+    mock_db.stream = AsyncMock(return_value=_rows())
+
+    rows = [
+        row
+        async for row in stream_jobs(
+            mock_db, ["id", "tech_stack"], JobFilters(status=["Saved"])
+        )
+    ]
+
+    assert rows == [{"id": 2, "tech_stack": ["Rust"]}, {"id": 1, "tech_stack": []}]
+    statement = mock_db.stream.await_args[0][0]
+    assert statement.get_execution_options()["yield_per"] > 0
+    select_clause = str(statement).lower().split("from")[0]
+    assert "jobs.notes" not in select_clause
+    assert "jobs.id" in select_clause and "jobs.tech_stack" in select_clause
+    assert "Saved" in statement.compile(compile_kwargs={"render_postcompile": True}).params.values()
+
+
+# --- Version markers and updated_at ---
+
+
+async def test_get_jobs_version_reads_the_change_counter():
+    mock_result = MagicMock()
+    mock_result.scalar.return_value = 42
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    assert await get_jobs_version(mock_db) == "42"
+    stmt_str = str(mock_db.execute.await_args[0][0]).lower()
+    assert "from job_change_counter" in stmt_str and "jobs." not in stmt_str
+
+
+async def test_get_job_version_none_for_missing_row():
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = None
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    assert await get_job_version(mock_db, 42) is None
+
+
+async def test_update_job_is_one_update_returning_that_bumps_updated_at():
+    """update_job issues a single UPDATE ... RETURNING with a fresh updated_at.
+
+    The statement stamps the change sequence number it claims; on SQLite the
+    counter is bumped right before commit.
+    """
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = _returned_row(
+        _make_mock_job(1, "2025-02-15"), status="Offer"
+    )
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    before = datetime.utcnow()
+    response = await update_job(mock_db, 1, JobUpdate(status="Offer"))
+
+    assert mock_db.execute.await_count == 2
+    mock_db.commit.assert_awaited_once()
+    mock_db.refresh.assert_not_awaited()
+    statement = mock_db.execute.await_args_list[0][0][0]
+    stmt_str = str(statement).lower()
+    assert stmt_str.startswith("update jobs set") and "returning jobs.change_seq" in stmt_str
+    assert "change_seq=(select job_change_counter.value +" in stmt_str
+    params = statement.compile().params
+    assert params["status"] == "Offer"
+    assert params["updated_at"] >= before
+    seq_stmt = str(mock_db.execute.await_args_list[1][0][0]).lower()
+    assert seq_stmt.startswith("update job_change_counter set value=")
+    assert response.status == "Offer"
+
+
+async def test_update_job_on_postgres_claims_its_sequence_in_the_same_statement():
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = _returned_row(_make_mock_job(1, "2025-02-15"))
+    mock_db = AsyncMock()
+    mock_db.bind.dialect.name = "postgresql"
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await update_job(mock_db, 1, JobUpdate(status="Offer"))
+
+    assert mock_db.execute.await_count == 1
+    statement = str(mock_db.execute.await_args[0][0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("WITH change_seq AS \n(UPDATE job_change_counter")
+    assert "change_seq=(SELECT change_seq.value" in statement
+
+
+async def test_update_job_writes_derived_columns_in_the_same_statement():
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = _returned_row(_make_mock_job(1, "2025-03-01"))
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await update_job(
+        mock_db,
+        1,
+        JobUpdate(date_applied="2025-03-01", salary_range="$90k", salary_frequency="Yearly"),
+    )
+
+    assert mock_db.execute.await_count == 2
+    params = mock_db.execute.await_args_list[0][0][0].compile().params
+    assert params["applied_on"] == date(2025, 3, 1)
+    assert (params["salary_min"], params["salary_max"]) == (90000, 90000)
+
+
+async def test_update_job_with_one_salary_source_derives_salary_in_the_same_statement():
+    """The UPDATE combines salary_frequency with the row's salary_range itself."""
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = _returned_row(
+        _make_mock_job(1, "2025-02-15"),
+        salary=(83200, 104000),
+        salary_range="40-50",
+        salary_frequency="Hourly",
+    )
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await update_job(mock_db, 1, JobUpdate(salary_frequency="Hourly"))
+
+    # The UPDATE and the counter bump; the returned salary was right
+    assert mock_db.execute.await_count == 2
+    statement = str(mock_db.execute.await_args_list[0][0][0]).lower()
+    assert "salary_min=case when (round(" in statement and "salary_max=case when (round(" in statement
+
+
+async def test_update_job_corrects_a_salary_sql_could_not_rescale():
+    """An old frequency that didn't parse leaves nothing to rescale from."""
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = _returned_row(
+        _make_mock_job(1, "2025-02-15"), salary_range="40-50", salary_frequency="Hourly"
+    )
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await update_job(mock_db, 1, JobUpdate(salary_frequency="Hourly"))
+
+    assert mock_db.execute.await_count == 3
+    params = mock_db.execute.await_args_list[1][0][0].compile().params
+    assert (params["salary_min"], params["salary_max"]) == (83200, 104000)
+
+
+async def test_update_job_unknown_id_returns_none_without_commit():
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = None
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    assert await update_job(mock_db, 99, JobUpdate(notes="x")) is None
+    mock_db.commit.assert_not_awaited()
+
+
+async def test_delete_job_is_one_delete_returning():
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        namedtuple("R", ["id", "status", "change_seq"])(1, "Saved", 4)
+    ]
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    assert await delete_job(mock_db, 1) is True
+    # DELETE ... RETURNING; upload refs and tech rows go by ON DELETE CASCADE.
+    # SQLite then clears FTS5, writes the tombstone and bumps the counter.
+    statements = [str(call[0][0]).lower() for call in mock_db.execute.await_args_list]
+    assert statements[0].startswith("delete from jobs") and "returning jobs.id" in statements[0]
+    assert [stmt.split()[2] for stmt in statements[1:3]] == ["jobs_fts", "job_tombstones"]
+    assert mock_db.execute.await_args_list[2][0][1][0]["change_seq"] == 4
+    assert statements[3].startswith("update job_change_counter")
+    mock_db.commit.assert_awaited_once()
+
+    mock_result.all.return_value = []
+    assert await delete_job(mock_db, 2) is False
+
+
+async def test_delete_job_on_postgres_writes_tombstone_in_the_same_statement():
+    mock_result = MagicMock()
+    mock_result.all.return_value = [
+        namedtuple("R", ["id", "status", "change_seq"])(1, "Saved", 4)
+    ]
+    mock_db = AsyncMock()
+    mock_db.bind.dialect.name = "postgresql"
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    assert await delete_job(mock_db, 1) is True
+    # One statement claims the sequence number, deletes and writes the tombstone
+    assert mock_db.execute.await_count == 1
+    statement = str(mock_db.execute.await_args[0][0].compile(dialect=postgresql.dialect()))
+    assert statement.startswith("WITH change_seq AS \n(UPDATE job_change_counter")
+    assert "deleted AS \n(DELETE FROM jobs" in statement
+    assert "INSERT INTO job_tombstones" in statement
+
+
+# --- Read-through cache ---
+
+
+_ResponseRow = namedtuple("_ResponseRow", list(JobResponse.model_fields))
+_ReturnedRow = namedtuple(
+    "_ReturnedRow", ["change_seq", "salary_min", "salary_max", *JobResponse.model_fields]
+)
+
+
+def _returned_row(mock_job, change_seq=4, salary=(None, None), **overrides):
+    """What UPDATE ... RETURNING hands back for mock_job."""
+    values = {name: getattr(mock_job, name) for name in JobResponse.model_fields}
+    return _ReturnedRow(change_seq, *salary, **{**values, **overrides})
+
+
+def _mock_db_returning(jobs, **returning_overrides):
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = jobs
+    mock_result.scalar_one_or_none.return_value = jobs[0] if jobs else None
+    mock_result.one_or_none.return_value = (
+        _returned_row(jobs[0], **returning_overrides) if jobs else None
+    )
+    mock_result.all.return_value = (
+        [_returned_row(jobs[0], **returning_overrides)] if jobs else []
+    )
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.add = MagicMock()
+    return mock_db
+
+
+async def test_get_job_is_cached_until_the_job_is_updated(fresh_job_cache):
+    db_job = _make_mock_job(1, "2025-02-15")
+    mock_db = _mock_db_returning([db_job], notes="changed")
+
+    first = await get_job(mock_db, 1)
+    second = await get_job(mock_db, 1)
+    assert second is first
+    assert mock_db.execute.await_count == 1
+
+    await update_job(mock_db, 1, JobUpdate(notes="changed"))
+    db_job.notes = "changed"  # what the next SELECT will see
+    calls_before = mock_db.execute.await_count
+    refreshed = await get_job(mock_db, 1)
+    assert mock_db.execute.await_count == calls_before + 1
+    assert refreshed.notes == "changed"
+    stats = fresh_job_cache.stats()
+    assert stats.hits == 1 and stats.invalidations >= 1
+
+
+async def test_cached_job_is_only_served_under_its_own_version(fresh_job_cache):
+    """A write this process never heard of moves the version, which misses the old entry."""
+    db_job = _make_mock_job(1, "2025-02-15")
+    mock_db = _mock_db_returning([db_job])
+
+    first = await get_job(mock_db, 1, version="1:a")
+    db_job.status = "Offer"  # written by another worker, no invalidation here
+    assert await get_job(mock_db, 1, version="1:a") is first
+    refreshed = await get_job(mock_db, 1, version="1:b")
+    assert refreshed.status == "Offer"
+    assert mock_db.execute.await_count == 2
+
+    await delete_job(mock_db, 1)
+    assert fresh_job_cache.stats().size == 0
+
+
+async def test_write_only_invalidates_lists_whose_filters_match(fresh_job_cache):
+    """Updating an Applied job keeps a cached Offer-only list."""
+    mock_db = _mock_db_returning([_make_mock_job(1, "2025-02-15")])
+    await get_jobs_json(mock_db, JobFilters(status=["Offer"]))
+    await get_jobs_json(mock_db, JobFilters(status=["Applied"]))
+    await get_jobs_json(mock_db)
+
+    await update_job(mock_db, 1, JobUpdate(notes="x"))  # status stays Applied
+
+    mock_db.execute.reset_mock()
+    await get_jobs_json(mock_db, JobFilters(status=["Offer"]))
+    assert mock_db.execute.await_count == 0
+    await get_jobs_json(mock_db, JobFilters(status=["Applied"]))
+    await get_jobs_json(mock_db)
+    assert mock_db.execute.await_count == 2
+
+
+async def test_status_change_invalidates_both_old_and_new_lists(fresh_job_cache):
+    """Old values are unknown after UPDATE ... RETURNING, so every list is dropped."""
+    mock_db = _mock_db_returning([_make_mock_job(1, "2025-02-15")], status="Offer")
+    await get_jobs_json(mock_db, JobFilters(status=["Offer"]))
+    await get_jobs_json(mock_db, JobFilters(status=["Applied"]))
+
+    await update_job(mock_db, 1, JobUpdate(status="Offer"))
+
+    mock_db.execute.reset_mock()
+    await get_jobs_json(mock_db, JobFilters(status=["Offer"]))
+    await get_jobs_json(mock_db, JobFilters(status=["Applied"]))
+    assert mock_db.execute.await_count == 2
+
+
+async def test_delete_invalidates_cached_job(fresh_job_cache):
+    mock_db = _mock_db_returning([_make_mock_job(1, "2025-02-15")])
+    await get_job(mock_db, 1)
+    await delete_job(mock_db, 1)
+    assert fresh_job_cache.get(("job", 1, None)) is MISSING
+
+
+async def test_writes_publish_job_changes(monkeypatch):
+    """update/delete publish their change on the bus for other workers."""
+    from app.services import job_service
+
+    published = []
+    monkeypatch.setattr(job_service.change_bus, "_transport", None)
+    monkeypatch.setattr(
+        job_service.change_bus, "_listeners", [published.append]
+    )
+    mock_db = _mock_db_returning([_make_mock_job(1, "2025-02-15")], status="Offer")
+
+    await update_job(mock_db, 1, JobUpdate(status="Offer"))
+    await delete_job(mock_db, 1)
+
+    assert [(c.job_id, c.kind) for c in published] == [(1, "updated"), (1, "deleted")]
+    assert [row["status"] for row in published[0].rows] == ["Offer"]
+    assert published[0].changed_fields == ("status",)
+    assert [c.change_seq for c in published] == [4, 4]
+
+
+# --- JSON fast path ---
+
+
+def _response_row(job: JobResponse, **overrides):
+    """Column tuple in JobResponse field order, as the fast path selects it."""
+    data = {**job.model_dump(), **overrides}
+    return tuple(data[name] for name in JobResponse.model_fields)
+
+
+async def test_get_jobs_json_matches_response_model_serialization(
+    sample_job_response_with_nested,
+):
+    """Bytes from the fast path decode to exactly what JobResponse would produce."""
+    row = _response_row(sample_job_response_with_nested)
+    legacy_row = _response_row(
+        sample_job_response_with_nested, tech_stack='["React", "TypeScript"]', attachments=None
+    )
+    mock_result = MagicMock()
+    mock_result.all.return_value = [row, legacy_row]
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    content = await get_jobs_json(mock_db)
+
+    data = json.loads(content)
+    expected = sample_job_response_with_nested.model_dump(mode="json")
+    assert data[0] == expected
+    assert list(data[0]) == list(expected)
+    assert data[1] == {**expected, "attachments": []}
+    select_clause = str(mock_db.execute.await_args[0][0]).lower().split("from")[0]
+    assert "jobs.notes" in select_clause
+
+
+async def test_get_jobs_page_json_sets_next_cursor(sample_job_response):
+    rows = [
+        _response_row(sample_job_response, id=3, date_applied="2025-02-15"),
+        _response_row(sample_job_response, id=2, date_applied="2025-02-14"),
+        _response_row(sample_job_response, id=1, date_applied="2025-02-13"),
+    ]
+    mock_result = MagicMock()
+    mock_result.all.return_value = [_named_row(row) for row in rows]
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    data = json.loads(await get_jobs_page_json(mock_db, limit=2))
+
+    assert [item["id"] for item in data["items"]] == [3, 2]
+    assert _decode_cursor(data["next_cursor"]) == ("2025-02-14", 2)
+    statement = mock_db.execute.await_args[0][0]
+    assert 3 in statement.compile().params.values()  # limit + 1
+
+
+def _named_row(row):
+    return _ResponseRow(*row)
+
+
+# --- Bulk writes ---
+
+
+async def test_bulk_write_uses_one_statement_per_kind_and_one_commit():
+    """Creates, updates and deletes run as multi-row statements in one transaction."""
+    existing_rows = MagicMock()
+    existing_rows.all.return_value = [
+        namedtuple("R", ["id", "title", "company", "status", "work_model", "date_applied"])(
+            1, "Engineer", "Acme", "Applied", None, "2025-02-15"
+        ),
+        namedtuple("R", ["id", "title", "company", "status", "work_model", "date_applied"])(
+            2, "Engineer", "Acme", "Saved", None, "2025-02-14"
+        ),
+    ]
+    inserted_ids = MagicMock()
+    inserted_ids.scalars.return_value.all.return_value = [10, 11]
+    claimed_seq = MagicMock()
+    claimed_seq.scalar_one.return_value = 7
+    deleted_rows = MagicMock()
+    deleted_rows.all.return_value = [namedtuple("R", ["id", "change_seq"])(2, 7)]
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(
+        side_effect=[existing_rows, claimed_seq, inserted_ids, MagicMock(), MagicMock()]
+        + [deleted_rows, MagicMock(), MagicMock()]
+    )
+
+    create = JobCreate(title="New", company="Beta", date_applied="2025-03-01", status="Saved")
+    response = await bulk_write(
+        mock_db,
+        JobBulkRequest(
+            create=[create, create],
+            update=[JobBulkUpdate(id=1, status="Offer"), JobBulkUpdate(id=99, notes="x")],
+            delete=[2, 98],
+        ),
+    )
+
+    # lookup, sequence claim, INSERT + search index, UPDATE (no indexed field),
+    # DELETE (side tables cascade) + search index + tombstones on SQLite
+    assert mock_db.execute.await_count == 8
+    mock_db.commit.assert_awaited_once()
+    insert_stmt, insert_params = mock_db.execute.await_args_list[2][0]
+    assert "returning" in str(insert_stmt).lower()
+    assert len(insert_params) == 2
+    assert {row["change_seq"] for row in insert_params} == {7}
+    assert mock_db.execute.await_args_list[3][0][1] == {"ids": [10, 11]}
+    update_params = mock_db.execute.await_args_list[4][0][1]
+    assert update_params[0]["id"] == 1 and update_params[0]["status"] == "Offer"
+    assert update_params[0]["change_seq"] == 7
+    assert "updated_at" in update_params[0] and "notes" not in update_params[0]
+    delete_stmt = mock_db.execute.await_args_list[5][0][0]
+    assert "delete from jobs" in str(delete_stmt).lower()
+    assert mock_db.execute.await_args_list[7][0][1] == [
+        {"change_seq": 7, "job_id": 2, "deleted_at": ANY}
+    ]
+
+    assert [(r.id, r.success) for r in response.created] == [(10, True), (11, True)]
+    assert [(r.index, r.id, r.success) for r in response.updated] == [
+        (0, 1, True),
+        (1, 99, False),
+    ]
+    assert response.updated[1].error == "Job not found"
+    assert [(r.id, r.success) for r in response.deleted] == [(2, True), (98, False)]
+
+
+async def test_bulk_write_skips_statements_for_empty_sections():
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock()
+
+    response = await bulk_write(mock_db, JobBulkRequest())
+
+    assert mock_db.execute.await_count == 0
+    assert response.created == response.updated == response.deleted == []
@@ -0,0 +1,117 @@
+"""Unit tests for the Server-Sent Events fan-out of job changes."""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import job_stream as job_stream_module
+from app.services.change_feed import encode_change_token
+from app.services.events import JobChange
+from app.services.job_stream import HEARTBEAT_FRAME, JobStream, format_event
+
+
+class _Feed:
+    """In-memory stand-in for the changes feed: (change_seq, id, job) entries."""
+
+    def __init__(self, *entries):
+        self.entries = list(entries)
+
+    async def read(self, db, position, limit):
+        after = [entry for entry in self.entries if entry[:2] > position]
+        return after[:limit], len(after) > limit
+
+    async def head(self, db):
+        return max((entry[0] for entry in self.entries), default=0) + 1, 0
+
+
+@asynccontextmanager
+async def _session():
+    yield MagicMock()
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    feed = _Feed((1, 1, {"id": 1}), (2, 2, {"id": 2}))
+    monkeypatch.setattr(job_stream_module, "read_changes", feed.read)
+    monkeypatch.setattr(job_stream_module, "current_position", feed.head)
+    return feed
+
+
+async def _subscribe(stream, since=None):
+    """Start a client's stream; returns its generator and the pending first frame."""
+    subscribed = len(stream)
+    events = stream.events(since)
+    first = asyncio.ensure_future(events.__anext__())
+    while not first.done() and len(stream) == subscribed:
+        await asyncio.sleep(0)
+    return events, first
+
+
+def _frame_id(frame):
+    return frame.split(b"\n")[0].decode()
+
+
+def test_format_event_uses_the_feed_token_as_id():
+    frame = format_event(3, 7, {"id": 7, "title": "Dev"}, "created")
+    assert frame == (
+        b"id: " + encode_change_token(3, 7).encode()
+        + b'\nevent: job-created\ndata: {"id":7,"title":"Dev"}\n\n'
+    )
+    assert b"event: job-updated\n" in format_event(3, 7, {"id": 7})
+    assert format_event(4, 7, None).endswith(b'event: job-deleted\ndata: {"id":7}\n\n')
+
+
+async def test_live_changes_reach_every_subscriber_once(feed):
+    stream = JobStream(queue_size=8, heartbeat_seconds=60, session_factory=_session)
+    events_a, first_a = await _subscribe(stream)
+    events_b, first_b = await _subscribe(stream)
+    assert len(stream) == 2
+
+    feed.entries.append((3, 1, {"id": 1, "status": "Offer"}))
+    stream.on_change(JobChange(job_id=1, kind="updated", change_seq=3))
+    feed.entries.append((4, 5, {"id": 5}))
+    stream.on_change(JobChange(job_id=5, kind="created", change_seq=4))
+
+    for first, events in ((first_a, events_a), (first_b, events_b)):
+        frame = await asyncio.wait_for(first, 1)
+        assert _frame_id(frame) == "id: " + encode_change_token(3, 1)
+        assert b"event: job-updated" in frame
+        assert b"event: job-created" in await asyncio.wait_for(events.__anext__(), 1)
+
+    await events_a.aclose()
+    assert len(stream) == 1
+    await events_b.aclose()
+    assert stream._pump is None
+
+
+async def test_reconnect_replays_missed_changes_before_live_ones(feed):
+    stream = JobStream(queue_size=8, heartbeat_seconds=60, session_factory=_session)
+    events, first = await _subscribe(stream, since=(1, 1))
+
+    replayed = await asyncio.wait_for(first, 1)
+    assert _frame_id(replayed) == "id: " + encode_change_token(2, 2)
+    feed.entries.append((3, 2, None))
+    stream.on_change(JobChange(job_id=2, kind="deleted", change_seq=3))
+    live = await asyncio.wait_for(events.__anext__(), 1)
+    assert live.endswith(b'data: {"id":2}\n\n')
+    await events.aclose()
+
+
+async def test_subscriber_that_falls_behind_is_closed(feed):
+    """Frames beyond queue_size end the stream; the client resumes via Last-Event-ID."""
+    stream = JobStream(queue_size=1, heartbeat_seconds=60, session_factory=_session)
+    events, first = await _subscribe(stream)
+    feed.entries += [(3, 3, {"id": 3}), (4, 4, {"id": 4})]
+    stream.on_change(JobChange(job_id=4, kind="created", change_seq=4))
+
+    with pytest.raises(StopAsyncIteration):
+        await asyncio.wait_for(first, 1)
+    assert len(stream) == 0 and stream._pump is None
+
+
+async def test_idle_streams_get_heartbeats(feed):
+    stream = JobStream(queue_size=8, heartbeat_seconds=0.01, session_factory=_session)
+    events, first = await _subscribe(stream)
+    assert await asyncio.wait_for(first, 1) == HEARTBEAT_FRAME
+    await events.aclose()
@@ -0,0 +1,126 @@
+"""Unit tests for the full-text search index and search_jobs_json."""
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.schemas.job import JobCreate, JobFilters, JobUpdate
+from app.services.job_service import (
+    _RESPONSE_COLUMNS,
+    create_job,
+    delete_job,
+    search_jobs_json,
+    update_job,
+)
+from app.services.search_index import fts5_query, search_statement
+
+
+@pytest.mark.parametrize(
+    "q,expected",
+    [
+        ("python", '"python"*'),
+        ("Senior  Python-dev", '"senior" "python" "dev"*'),
+        ('"*AND(', '"and"*'),
+        ("!?", ""),
+        ("NEAR(a b) OR c", '"near" "a" "b" "or" "c"*'),
+    ],
+)
+def test_fts5_query_quotes_every_word(q, expected):
+    assert fts5_query(q) == expected
+
+
+def test_sqlite_statement_uses_fts5_match_and_bm25():
+    stmt = search_statement("sqlite", "python", _RESPONSE_COLUMNS)
+    sql = str(stmt.compile(dialect=sqlite.dialect()))
+    assert "FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid" in sql
+    assert "jobs_fts MATCH" in sql
+    assert "ORDER BY bm25(jobs_fts" in sql
+
+
+def test_postgres_statement_uses_tsquery_and_rank():
+    stmt = search_statement("postgresql", "python", _RESPONSE_COLUMNS)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "job_search.document @@ websearch_to_tsquery" in sql
+    assert "ORDER BY ts_rank_cd(job_search.document" in sql
+
+
+def test_no_searchable_words_gives_no_statement():
+    assert search_statement("sqlite", "!!!", _RESPONSE_COLUMNS) is None
+
+
+def _mock_db(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    db = AsyncMock()
+    db.bind = MagicMock()
+    db.bind.dialect.name = "sqlite"
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+async def test_search_jobs_json_pages_by_offset(sample_job_response):
+    row = tuple(sample_job_response.model_dump().values())
+    db = _mock_db([row, row, row])
+
+    first = json.loads(await search_jobs_json(db, "backend", limit=2))
+
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    stmt = db.execute.await_args[0][0]
+    params = stmt.compile().params
+    assert params["param_1"] == 3 and params["param_2"] == 0  # limit + 1, offset
+
+    db = _mock_db([row])
+    second = json.loads(
+        await search_jobs_json(
+            db, "backend", limit=2, cursor=first["next_cursor"], filters=JobFilters(company="Acme")
+        )
+    )
+    assert second["next_cursor"] is None
+    stmt = db.execute.await_args[0][0]
+    assert stmt.compile().params["param_2"] == 2
+    assert "jobs.company =" in str(stmt)
+
+
+async def test_search_jobs_json_without_words_skips_query():
+    db = _mock_db([])
+    assert json.loads(await search_jobs_json(db, "?!", limit=10)) == {
+        "items": [],
+        "next_cursor": None,
+    }
+    db.execute.assert_not_awaited()
+
+
+async def test_search_jobs_json_rejects_bad_cursor():
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await search_jobs_json(_mock_db([]), "x", limit=10, cursor="not-a-cursor")
+
+
+async def test_search_on_sqlite_ranks_and_follows_writes(sqlite_db):
+    async def add(title, company, notes=None):
+        job = JobCreate(
+            title=title, company=company, notes=notes, date_applied="2025-02-15", status="Saved"
+        )
+        return (await create_job(sqlite_db, job)).id
+
+    async def search(q, **kwargs):
+        page = json.loads(await search_jobs_json(sqlite_db, q, limit=10, **kwargs))
+        return [item["id"] for item in page["items"]]
+
+    in_notes = await add("Engineer", "Beta", notes="Mostly Python services")
+    in_title = await add("Python Developer", "Acme")
+    in_company = await add("Go Developer", "Pythia Labs")
+    other = await add("Designer", "Gamma")
+
+    # Title matches rank above notes; only the last word matches as a prefix
+    assert await search("python") == [in_title, in_notes]
+    assert set(await search("pyth")) == {in_title, in_company, in_notes}
+    assert await search("developer pyth") == [in_title, in_company]
+    assert await search("pyth developer") == []
+    assert await search("python", filters=JobFilters(company="Beta")) == [in_notes]
+
+    # Writes keep the index in step with the rows
+    await update_job(sqlite_db, other, JobUpdate(notes="python tooling"))
+    await delete_job(sqlite_db, in_title)
+    assert set(await search("python")) == {in_notes, other}
+    assert await search("developer") == [in_company]
@@ -0,0 +1,128 @@
+"""Unit tests for the in-memory autocomplete prefix indexes."""
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import suggest_index
+from app.services.events import JobChange
+from app.services.suggest_index import PrefixIndex, SuggestIndexes
+
+
+def _index():
+    return PrefixIndex(
+        [(1, "Acme"), (2, "acme labs"), (3, "Acme"), (4, "Globex"), (5, None), (6, "ACME")]
+    )
+
+
+def test_suggest_is_case_insensitive_and_most_used_first():
+    index = _index()
+    assert index.suggest("ac", 10) == [("Acme", 2), ("ACME", 1), ("acme labs", 1)]
+    assert index.suggest("ACME L", 10) == [("acme labs", 1)]
+    assert index.suggest("", 1) == [("Acme", 2)]
+    assert index.suggest("z", 10) == []
+    assert len(index) == 4
+
+
+def test_wide_prefix_walks_values_by_count(monkeypatch):
+    monkeypatch.setattr(suggest_index, "_RANK_RANGE_MAX", 1)
+    index = _index()
+    assert index.suggest("a", 2) == [("Acme", 2), ("ACME", 1)]
+    # Fewer matches than limit still returns all of them
+    assert index.suggest("acme ", 5) == [("acme labs", 1)]
+
+
+def test_set_job_moves_counts_and_drops_unused_values():
+    index = _index()
+    index.set_job(1, "Globex")
+    assert index.suggest("", 10) == [
+        ("Globex", 2), ("ACME", 1), ("Acme", 1), ("acme labs", 1)
+    ]
+    index.set_job(2, "Initech")
+    index.drop_job(6)
+    assert index.suggest("ac", 10) == [("Acme", 1)]
+    assert index.suggest("in", 10) == [("Initech", 1)]
+    index.set_job(7, "")
+    assert len(index) == 3
+
+
+def _mock_db(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+async def test_indexes_load_once_and_follow_changes():
+    indexes = SuggestIndexes(refresh_seconds=0)
+    db = _mock_db([(1, "Acme"), (2, "Acme")])
+
+    assert (await indexes.get(db, "company")).suggest("a", 5) == [("Acme", 2)]
+    # A single-statement update only reports the new values
+    indexes.apply(
+        JobChange.from_rows(1, "updated", [{"company": "Hooli"}], ("company",))
+    )
+    indexes.apply(JobChange.from_rows(3, "created", [{"company": "Acme"}]))
+    indexes.apply(JobChange.from_rows(2, "deleted", [{"company": "Acme"}]))
+
+    index = await indexes.get(db, "company")
+    assert index.suggest("", 5) == [("Acme", 1), ("Hooli", 1)]
+    assert db.execute.await_count == 1
+
+
+async def test_load_that_races_a_change_is_not_kept():
+    indexes = SuggestIndexes(refresh_seconds=0)
+    db = _mock_db([(1, "Acme")])
+
+    async def execute_during_write(stmt):
+        indexes.apply(JobChange.from_rows(2, "created", [{"company": "Acme"}]))
+        return db.execute.return_value
+
+    db.execute.side_effect = execute_during_write
+    assert (await indexes.get(db, "company")).suggest("", 5) == [("Acme", 1)]
+    await indexes.get(db, "company")
+    assert db.execute.await_count == 2
+
+
+def test_zero_refresh_seconds_never_goes_stale():
+    indexes = SuggestIndexes(refresh_seconds=0)
+    indexes._loaded_at["title"] = 0.0
+    assert not indexes._stale("title")
+
+
+async def test_stale_index_is_served_while_it_refreshes_in_the_background(monkeypatch):
+    indexes = SuggestIndexes(refresh_seconds=1e-9)
+    db = _mock_db([(1, "Acme")])
+    background = _mock_db([(1, "Acme"), (2, "Hooli")])
+
+    @asynccontextmanager
+    async def session():
+        yield background
+
+    monkeypatch.setattr(suggest_index, "async_session_maker", session)
+    first = await indexes.get(db, "title")
+    # Stale: the old index answers at once and one refresh starts
+    assert await indexes.get(db, "title") is first
+    assert await indexes.get(db, "title") is first
+    assert db.execute.await_count == 1
+    await asyncio.gather(*indexes._refreshes.values())
+
+    assert background.execute.await_count == 1
+    assert indexes._indexes["title"].suggest("", 5) == [("Acme", 1), ("Hooli", 1)]
+
+
+async def test_failed_refresh_keeps_the_old_index(monkeypatch):
+    indexes = SuggestIndexes(refresh_seconds=1e-9)
+    db = _mock_db([(1, "Acme")])
+
+    @asynccontextmanager
+    async def session():
+        raise RuntimeError("database went away")
+        yield
+
+    monkeypatch.setattr(suggest_index, "async_session_maker", session)
+    first = await indexes.get(db, "title")
+    await indexes.get(db, "title")
+    await asyncio.gather(*indexes._refreshes.values())
+    assert indexes._indexes["title"] is first
+    assert not indexes._refreshes
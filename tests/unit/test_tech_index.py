@@ -0,0 +1,115 @@
+"""Unit tests for tech-stack filters, the job_tech index and facet counts."""
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.models.job import Job
+from app.schemas.job import JobFacets, JobFilters, TechFacet
+from app.services.job_service import _filters_key, _filters_match, get_tech_facets
+from app.services.tech_index import (
+    TechMatch,
+    add_techs,
+    drop_techs,
+    replace_techs,
+    tech_list,
+)
+
+
+def _compile(clause, dialect) -> str:
+    return str(select(Job.id).where(clause).compile(dialect=dialect))
+
+
+def test_tech_list_dedupes_and_parses_json():
+    assert tech_list(["Go", "Python", "Go", "", None]) == ["Go", "Python"]
+    assert tech_list('["Rust"]') == ["Rust"]
+    assert tech_list("not json") == []
+    assert tech_list(None) == []
+
+
+def test_sqlite_tech_match_uses_job_tech_subquery():
+    any_of = _compile(TechMatch(["Python", "Go"], match_all=False), sqlite.dialect())
+    assert "jobs.id IN (SELECT job_tech.job_id" in any_of
+    assert "job_tech.tech IN (__[POSTCOMPILE_tech_1])" in any_of
+    assert "HAVING" not in any_of
+
+    all_of = _compile(TechMatch(["Python", "Go"], match_all=True), sqlite.dialect())
+    assert "GROUP BY job_tech.job_id \nHAVING count(*) = ?)" in all_of
+    assert all_of.endswith(")")
+
+
+def test_postgres_tech_match_uses_gin_operators():
+    dialect = postgresql.dialect()
+    assert "jobs.tech_stack @>" in _compile(TechMatch(["Python"], match_all=True), dialect)
+    assert "jobs.tech_stack ?|" in _compile(TechMatch(["Python"], match_all=False), dialect)
+
+
+async def test_add_techs_inserts_one_row_per_distinct_tech():
+    db = AsyncMock()
+    await add_techs(db, [(1, {"tech_stack": ["Go", "Go", "SQL"]}), (2, {"tech_stack": []})])
+    rows = db.execute.await_args[0][1]
+    assert rows == [{"tech": "Go", "job_id": 1}, {"tech": "SQL", "job_id": 1}]
+
+    db.execute.reset_mock()
+    await add_techs(db, [(3, {"title": "x"})])
+    db.execute.assert_not_awaited()
+
+
+async def test_replace_techs_only_touches_jobs_updating_tech_stack():
+    db = AsyncMock()
+    await replace_techs(db, [(1, {"status": "Applied"})])
+    db.execute.assert_not_awaited()
+
+    await replace_techs(db, [(1, {"tech_stack": ["Go"]}), (2, {"notes": "n"})])
+    delete_stmt, insert_rows = (call[0] for call in db.execute.await_args_list)
+    assert delete_stmt[0].table.name == "job_tech"
+    assert delete_stmt[0].compile().params == {"job_id_1": [1]}
+    assert insert_rows[1] == [{"tech": "Go", "job_id": 1}]
+
+
+async def test_drop_techs_skips_empty_ids():
+    db = AsyncMock()
+    await drop_techs(db, [])
+    db.execute.assert_not_awaited()
+    await drop_techs(db, [4, 5])
+    assert db.execute.await_args[0][0].table.name == "job_tech"
+
+
+def test_filters_match_tech_any_and_all():
+    job = {"status": "Applied", "tech_stack": ["Python", "Go"]}
+    assert _filters_match(_filters_key(JobFilters(tech=["Go", "Rust"])), job)
+    assert not _filters_match(
+        _filters_key(JobFilters(tech=["Go", "Rust"], tech_match="all")), job
+    )
+    assert _filters_match(_filters_key(JobFilters(tech=["Go"], tech_match="all")), job)
+    assert not _filters_match(_filters_key(JobFilters(tech=["Rust"])), {"tech_stack": None})
+
+
+async def test_get_tech_facets_groups_and_caches():
+    result = MagicMock()
+    result.all.return_value = [("Python", 3), ("Go", 1)]
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    facets = await get_tech_facets(db, 10, None)
+    assert facets == JobFacets(
+        tech_stack=[TechFacet(name="Python", count=3), TechFacet(name="Go", count=1)]
+    )
+    sql = str(db.execute.await_args[0][0])
+    assert "GROUP BY job_tech.tech" in sql
+    assert "JOIN jobs" not in sql
+
+    await get_tech_facets(db, 10, None)
+    assert db.execute.await_count == 1
+
+
+async def test_get_tech_facets_joins_jobs_when_filtered():
+    result = MagicMock()
+    result.all.return_value = []
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=result)
+
+    await get_tech_facets(db, 5, JobFilters(status=["Applied"]))
+    sql = str(db.execute.await_args[0][0])
+    assert "JOIN jobs ON jobs.id = job_tech.job_id" in sql
+    assert "jobs.status IN" in sql
@@ -0,0 +1,16 @@
+"""Unit tests for utils.tokens: opaque URL-safe tokens."""
+import pytest
+
+from app.utils.tokens import decode_token, encode_token
+
+
+def test_token_round_trip_is_url_safe_and_unpadded():
+    token = encode_token(["2025-02-15", 42])
+    assert decode_token(token) == ["2025-02-15", 42]
+    assert "=" not in token and "/" not in token and "+" not in token
+
+
+@pytest.mark.parametrize("bad", ["", "not-base64!", encode_token([1, 2])[:-2]])
+def test_decode_token_rejects_malformed_tokens(bad):
+    with pytest.raises(ValueError, match="Invalid token"):
+        decode_token(bad)
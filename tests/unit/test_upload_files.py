@@ -0,0 +1,82 @@
+"""Unit tests for the /uploads handler: cache headers, validators, ranges, hiding."""
+import hashlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.file_upload import content_addressed_name
+from app.utils.upload_files import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    UploadFiles,
+)
+
+DATA = b"%PDF-1.4 " + bytes(range(256)) * 8
+SHA = hashlib.sha256(DATA).hexdigest()
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    path = tmp_path / content_addressed_name(SHA, "cv.pdf")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(DATA)
+    (tmp_path / "20250101120000_abc123.png").write_bytes(b"png")
+    (tmp_path / ".sessions" / ("a" * 32)).mkdir(parents=True)
+    (tmp_path / ".sessions" / ("a" * 32) / "session.json").write_text("{}")
+    (tmp_path / "half.pdf.1234abcd.part").write_bytes(b"partial")
+    return tmp_path
+
+
+@pytest.fixture
+def client(upload_dir):
+    app = FastAPI()
+    app.mount("/uploads", UploadFiles(directory=upload_dir), name="uploads")
+    return TestClient(app)
+
+
+CA_URL = f"/uploads/{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf"
+
+
+def test_content_addressed_file_is_immutable_with_hash_etag(client):
+    response = client.get(CA_URL)
+    assert response.status_code == 200
+    assert response.content == DATA
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{SHA}"'
+    assert response.headers["accept-ranges"] == "bytes"
+
+
+def test_other_uploads_must_revalidate(client):
+    response = client.get("/uploads/20250101120000_abc123.png")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_conditional_requests_return_304(client):
+    first = client.get("/uploads/20250101120000_abc123.png")
+    by_etag = client.get(CA_URL, headers={"If-None-Match": f'W/"{SHA}"'})
+    assert by_etag.status_code == 304
+    assert by_etag.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    by_date = client.get(
+        "/uploads/20250101120000_abc123.png",
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert by_date.status_code == 304
+
+
+def test_range_request_returns_partial_content(client):
+    response = client.get(CA_URL, headers={"Range": "bytes=9-18", "If-Range": f'"{SHA}"'})
+    assert response.status_code == 206
+    assert response.content == DATA[9:19]
+    assert response.headers["content-range"] == f"bytes 9-18/{len(DATA)}"
+
+    stale = client.get(CA_URL, headers={"Range": "bytes=9-18", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == DATA
+
+
+@pytest.mark.parametrize(
+    "path", [f"/uploads/.sessions/{'a' * 32}/session.json", "/uploads/half.pdf.1234abcd.part"]
+)
+def test_sessions_and_partial_files_are_hidden(client, path):
+    assert client.get(path).status_code == 404
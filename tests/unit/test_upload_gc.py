@@ -0,0 +1,109 @@
+"""Unit tests for the orphaned-upload garbage collector."""
+import os
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import settings
+from app.services.upload_gc import collect_orphaned_uploads
+
+OLD = time.time() - 3 * 24 * 3600
+
+
+def _write(root, relative, data, mtime=OLD):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _mock_db(referenced):
+    """AsyncSession whose upload_refs lookups report `referenced` as in use."""
+
+    async def execute(stmt, *args):
+        result = MagicMock()
+        params = stmt.compile().params
+        asked = next((v for v in params.values() if isinstance(v, list)), [])
+        result.scalars.return_value.all.return_value = [p for p in asked if p in referenced]
+        return result
+
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=execute)
+    db.commit = AsyncMock()
+    return db
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+async def test_removes_only_old_unreferenced_files(upload_dir):
+    _write(upload_dir, "kept.pdf", b"kept")
+    _write(upload_dir, "ab/cd/orphan.pdf", b"orphan!")
+    _write(upload_dir, "fresh.pdf", b"new", mtime=time.time())
+    db = _mock_db({"kept.pdf"})
+
+    report = await collect_orphaned_uploads(db, grace_seconds=24 * 3600)
+
+    assert report.scanned_files == 3
+    assert report.orphaned_files == 1
+    assert report.reclaimed_bytes == len(b"orphan!")
+    assert (upload_dir / "kept.pdf").exists() and (upload_dir / "fresh.pdf").exists()
+    assert not (upload_dir / "ab").exists()  # emptied shard dirs are removed
+    # The content-addressed manifest entry is dropped too
+    manifest_delete = db.execute.await_args_list[-1][0][0]
+    assert str(manifest_delete).lower().startswith("delete from upload_blobs")
+
+
+async def test_dry_run_reports_without_deleting(upload_dir):
+    _write(upload_dir, "orphan.pdf", b"12345")
+    db = _mock_db(set())
+
+    report = await collect_orphaned_uploads(db, grace_seconds=60, dry_run=True)
+
+    assert report.dry_run and report.orphaned_files == 1 and report.reclaimed_bytes == 5
+    assert (upload_dir / "orphan.pdf").exists()
+    db.commit.assert_not_awaited()
+
+
+async def test_expires_stale_upload_sessions(upload_dir):
+    stale = upload_dir / ".sessions" / ("a" * 32)
+    _write(upload_dir, f".sessions/{'a' * 32}/00-10.chunk", b"x" * 10)
+    os.utime(stale, (OLD, OLD))
+    _write(upload_dir, f".sessions/{'b' * 32}/00-10.chunk", b"y" * 10, mtime=time.time())
+    db = _mock_db(set())
+
+    report = await collect_orphaned_uploads(db, grace_seconds=60)
+
+    assert report.scanned_files == 0  # session chunks are never GC candidates
+    assert report.expired_sessions == 1 and report.reclaimed_bytes == 10
+    assert not stale.exists()
+    assert (upload_dir / ".sessions" / ("b" * 32)).exists()
+
+
+async def test_file_reuploaded_after_the_scan_is_kept(upload_dir, monkeypatch):
+    """A deduplicated re-upload between scan and delete touches the file; it survives."""
+    from app.services import upload_gc
+
+    reused = _write(upload_dir, "ab/cd/reused.pdf", b"reused")
+    _write(upload_dir, "orphan.pdf", b"orphan")
+    db = _mock_db(set())
+    scan = upload_gc._old_files
+
+    def scan_then_reupload(root, cutoff):
+        found = scan(root, cutoff)
+        os.utime(reused)  # what upload_service._touch does
+        return found
+
+    monkeypatch.setattr(upload_gc, "_old_files", scan_then_reupload)
+
+    report = await collect_orphaned_uploads(db, grace_seconds=60)
+
+    assert reused.exists() and not (upload_dir / "orphan.pdf").exists()
+    assert report.orphaned_files == 1 and report.reclaimed_bytes == len(b"orphan")
+    manifest_delete = db.execute.await_args_list[-1][0][0]
+    assert "upload_blobs.last_uploaded_at <" in str(manifest_delete)
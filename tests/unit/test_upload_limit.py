@@ -0,0 +1,85 @@
+"""Unit tests for utils.upload_limit: UploadSizeLimitMiddleware."""
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from app.utils.upload_limit import MULTIPART_OVERHEAD_BYTES, UploadSizeLimitMiddleware
+
+MAX_SIZE = 1024
+
+
+def _make_client():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, path="/upload", max_size=lambda: MAX_SIZE)
+    calls = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await file.read())}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app), calls
+
+
+def test_body_within_limit_passes_through():
+    client, calls = _make_client()
+    response = client.post("/upload", files={"file": ("a.txt", b"x" * MAX_SIZE)})
+    assert response.json() == {"size": MAX_SIZE}
+    assert calls == ["a.txt"]
+
+
+def test_declared_length_over_limit_is_rejected_before_the_body_is_read():
+    client, calls = _make_client()
+    response = client.post(
+        "/upload",
+        files={"file": ("big.bin", b"x" * (MAX_SIZE + MULTIPART_OVERHEAD_BYTES + 1))},
+    )
+    assert response.status_code == 413
+    assert "maximum upload size of 1024 bytes" in response.json()["detail"]
+    assert calls == []
+
+
+async def test_streamed_body_is_cut_off_once_it_passes_the_limit():
+    """Without a Content-Length the body is counted as it arrives, and reading stops."""
+    client, calls = _make_client()
+    pulled = 0
+    sent = []
+
+    async def receive():
+        nonlocal pulled
+        pulled += 1
+        body = b"x" * 16 * 1024
+        if pulled == 1:
+            body = (
+                b'--b\r\nContent-Disposition: form-data; name="file"; filename="a.bin"'
+                b"\r\n\r\n" + body
+            )
+        return {"type": "http.request", "body": body, "more_body": True}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "raw_path": b"/upload",
+        "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=b")],
+    }
+    await client.app(scope, receive, send)
+
+    assert sent[0]["status"] == 413
+    assert calls == []
+    # Just past MAX_SIZE + MULTIPART_OVERHEAD_BYTES, not the endless body
+    assert pulled == (MAX_SIZE + MULTIPART_OVERHEAD_BYTES) // (16 * 1024) + 1
+
+
+def test_other_paths_are_not_limited():
+    client, _ = _make_client()
+    size = MAX_SIZE + MULTIPART_OVERHEAD_BYTES + 1
+    response = client.post("/other", files={"file": ("big.bin", b"x" * size)})
+    assert response.json() == {"size": size}
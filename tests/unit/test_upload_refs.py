@@ -0,0 +1,114 @@
+"""Unit tests for the upload -> job reference index kept by the job write paths."""
+from collections import namedtuple
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.schemas.job import JobCreate, JobResponse, JobUpdate
+from app.services.job_service import create_job, update_job
+from app.services.upload_refs import (
+    add_refs,
+    replace_refs,
+    upload_path_from_url,
+)
+
+# What create_job's INSERT ... RETURNING hands back
+_CreatedRow = namedtuple("_CreatedRow", ["change_seq", *JobResponse.model_fields])
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("/uploads/resume.pdf", "resume.pdf"),
+        ("/uploads/ab/cd/abcd.pdf", "ab/cd/abcd.pdf"),
+        ("https://api.example.com/uploads/a%20b.png", "a b.png"),
+        ("/uploads/../jobs.db", None),
+        ("/uploads/", None),
+        ("https://example.com/resume.pdf", None),
+        (None, None),
+    ],
+)
+def test_upload_path_from_url(url, expected):
+    assert upload_path_from_url(url) == expected
+
+
+async def test_add_refs_covers_url_fields_and_attachments():
+    db = AsyncMock()
+    await add_refs(
+        db,
+        [
+            (
+                7,
+                {
+                    "resume_url": "/uploads/cv.pdf",
+                    "screenshot_url": "https://elsewhere/x.png",
+                    "attachments": ["/uploads/a.png", {"name": "b", "url": "/uploads/b.png"}],
+                },
+            )
+        ],
+    )
+    _, rows = db.execute.await_args[0]
+    assert rows == [
+        {"job_id": 7, "field": "resume_url", "path": "cv.pdf"},
+        {"job_id": 7, "field": "attachments", "path": "a.png"},
+        {"job_id": 7, "field": "attachments", "path": "b.png"},
+    ]
+
+
+async def test_add_refs_without_uploads_is_free():
+    db = AsyncMock()
+    await add_refs(db, [(1, {"resume_url": None, "attachments": []})])
+    db.execute.assert_not_awaited()
+
+
+async def test_replace_refs_only_touches_updated_fields():
+    db = AsyncMock()
+    await replace_refs(db, [(3, {"resume_url": "/uploads/new.pdf", "status": "Offer"})])
+    delete_stmt = db.execute.await_args_list[0][0][0]
+    assert str(delete_stmt).lower().startswith("delete from upload_refs")
+    assert delete_stmt.compile().params == {"param_1": [(3, "resume_url")]}
+    assert db.execute.await_args_list[1][0][1] == [
+        {"job_id": 3, "field": "resume_url", "path": "new.pdf"}
+    ]
+
+
+async def test_replace_refs_skips_when_nothing_to_do():
+    db = AsyncMock()
+    await replace_refs(db, [(3, {"status": "Offer"})])
+    db.execute.assert_not_awaited()
+
+
+async def test_update_job_without_upload_fields_adds_no_statement():
+    mock_result = MagicMock()
+    mock_result.one_or_none.return_value = None
+    db = AsyncMock()
+    db.execute = AsyncMock(return_value=mock_result)
+    await update_job(db, 1, JobUpdate(status="Offer"))
+    # Just the UPDATE, which claims its own sequence number
+    assert db.execute.await_count == 1
+
+
+async def test_create_job_with_upload_records_ref_for_the_returned_id():
+    job = JobCreate(
+        title="Eng", company="Acme", date_applied="2025-01-01", status="Saved",
+        resume_url="/uploads/cv.pdf",
+    )
+    now = datetime(2025, 1, 1)
+    inserted = MagicMock()
+    inserted.one.return_value = _CreatedRow(
+        change_seq=3, **job.model_dump(), id=5, created_at=now, updated_at=now
+    )
+    db = AsyncMock()
+    db.execute = AsyncMock(side_effect=[inserted, MagicMock(), MagicMock(), MagicMock()])
+
+    created = await create_job(db, job)
+
+    assert created.id == 5
+    insert_call, refs_call, search_call, seq_call = db.execute.await_args_list
+    assert str(insert_call[0][0]).lower().startswith("insert into jobs")
+    assert refs_call[0][1] == [{"job_id": 5, "field": "resume_url", "path": "cv.pdf"}]
+    assert search_call[0][1] == {"ids": [5]}
+    assert str(seq_call[0][0]).lower().startswith("update job_change_counter")
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
@@ -0,0 +1,133 @@
+"""Unit tests for upload_service: content-addressed storage and deduplication."""
+import hashlib
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.services.upload_service import store_upload
+from app.utils.file_upload import content_addressed_name
+
+DATA = b"%PDF-1.4 same resume"
+SHA = hashlib.sha256(DATA).hexdigest()
+
+
+def _upload(data: bytes = DATA, filename: str = "Resume.PDF") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def _result(path):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = path
+    return result
+
+
+def _mock_db(*claimed_paths):
+    """AsyncSession whose UPDATE ... RETURNING calls yield claimed_paths in turn."""
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=[_result(p) for p in claimed_paths] + [MagicMock()])
+    db.commit = AsyncMock()
+    db.rollback = AsyncMock()
+    return db
+
+
+@pytest.fixture
+def content_addressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_CONTENT_ADDRESSED", True)
+    return tmp_path
+
+
+def test_content_addressed_name_is_sharded_by_hash():
+    assert content_addressed_name("abcdef" + "0" * 58, "cv.PDF") == f"ab/cd/abcdef{'0' * 58}.pdf"
+    assert content_addressed_name("abcd", None) == "ab/cd/abcd"
+
+
+async def test_new_content_is_written_and_registered(content_addressed):
+    db = _mock_db(None)
+
+    saved = await store_upload(db, _upload())
+
+    assert saved.filename == f"{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf"
+    assert saved.sha256 == SHA and saved.size == len(DATA)
+    assert not saved.deduplicated
+    assert (content_addressed / saved.filename).read_bytes() == DATA
+    assert db.execute.await_count == 2  # claim miss, then INSERT
+    db.commit.assert_awaited_once()
+
+
+async def test_duplicate_content_returns_existing_path_without_writing(content_addressed):
+    existing = f"{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf"
+    (content_addressed / existing).parent.mkdir(parents=True)
+    (content_addressed / existing).write_bytes(DATA)
+    before = (content_addressed / existing).stat().st_ino
+    db = _mock_db(existing)
+
+    saved = await store_upload(db, _upload(filename="other-name.pdf"))
+
+    assert saved.filename == existing
+    assert saved.deduplicated
+    assert db.execute.await_count == 1  # only the manifest lookup
+    assert (content_addressed / existing).stat().st_ino == before  # not rewritten
+    assert sorted(p.name for p in content_addressed.rglob("*") if p.is_file()) == [f"{SHA}.pdf"]
+
+
+async def test_manifest_entry_with_missing_file_is_rewritten(content_addressed):
+    existing = f"{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf"
+    db = _mock_db(existing)
+
+    saved = await store_upload(db, _upload())
+
+    assert saved.filename == existing and not saved.deduplicated
+    assert (content_addressed / existing).read_bytes() == DATA
+    assert db.execute.await_count == 1  # already counted; no INSERT
+
+
+async def test_concurrent_registration_falls_back_to_winner(content_addressed):
+    winner = f"{SHA[:2]}/{SHA[2:4]}/{SHA}.txt"
+    db = _mock_db(None)
+    db.execute = AsyncMock(
+        side_effect=[_result(None), IntegrityError("INSERT", {}, Exception()), _result(winner)]
+    )
+
+    saved = await store_upload(db, _upload())
+
+    assert saved.filename == winner
+    db.rollback.assert_awaited_once()
+    # Our copy under the other extension was removed
+    assert not (content_addressed / f"{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf").exists()
+
+
+async def test_disabled_keeps_unique_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "UPLOAD_CONTENT_ADDRESSED", False)
+    db = _mock_db()
+
+    first = await store_upload(db, _upload())
+    second = await store_upload(db, _upload())
+
+    assert first.filename != second.filename
+    db.execute.assert_not_awaited()
+
+
+async def test_finalize_session_deduplicates_and_discards_chunks(content_addressed):
+    from app.services.upload_service import create_upload_session, finalize_upload_session
+    from app.utils.upload_sessions import write_chunk
+
+    async def body():
+        yield DATA
+
+    existing = f"{SHA[:2]}/{SHA[2:4]}/{SHA}.pdf"
+    (content_addressed / existing).parent.mkdir(parents=True)
+    (content_addressed / existing).write_bytes(DATA)
+    session = await create_upload_session("resume.pdf", len(DATA))
+    await write_chunk(content_addressed, session, 0, len(DATA), body())
+    db = _mock_db(existing)
+
+    saved = await finalize_upload_session(db, session.id)
+
+    assert saved.filename == existing and saved.deduplicated
+    assert not (content_addressed / ".sessions" / session.id).exists()
@@ -0,0 +1,91 @@
+"""Unit tests for utils.upload_sessions: chunk storage, progress and reassembly."""
+import hashlib
+
+import pytest
+
+from app.utils import upload_sessions
+from app.utils.upload_sessions import (
+    UploadSessionError,
+    UploadSessionNotFound,
+    assemble_session,
+    create_session,
+    load_session,
+    merge_ranges,
+    parse_content_range,
+    write_chunk,
+)
+
+DATA = bytes(range(256)) * 4  # 1024 bytes
+
+
+async def _body(*parts):
+    for part in parts:
+        yield part
+
+
+async def _put(tmp_path, session, start, end):
+    await write_chunk(tmp_path, session, start, end, _body(DATA[start:end]))
+    return load_session(tmp_path, session.id)
+
+
+def test_merge_ranges_joins_adjacent_and_overlapping():
+    assert merge_ranges([(10, 20), (0, 5), (5, 10), (30, 40), (35, 50)]) == ((0, 20), (30, 50))
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [("bytes 0-99/1024", (0, 100)), ("bytes 1000-1023/*", (1000, 1024))],
+)
+def test_parse_content_range(header, expected):
+    assert parse_content_range(header, 1024) == expected
+
+
+@pytest.mark.parametrize(
+    "header", [None, "0-99/1024", "bytes 0-99/2048", "bytes 100-99/1024", "bytes 0-1024/1024", "bytes a-b/1"]
+)
+def test_parse_content_range_rejects_bad_headers(header):
+    with pytest.raises(UploadSessionError):
+        parse_content_range(header, 1024)
+
+
+def test_unknown_or_malformed_session_id(tmp_path):
+    with pytest.raises(UploadSessionNotFound):
+        load_session(tmp_path, "0" * 32)
+    with pytest.raises(UploadSessionNotFound):
+        load_session(tmp_path, "../../etc")
+
+
+async def test_out_of_order_chunks_report_progress_and_assemble(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_sessions, "UPLOAD_CHUNK_SIZE", 64)
+    session = create_session(tmp_path, "reel.mp4", len(DATA))
+
+    session = await _put(tmp_path, session, 512, 1024)
+    assert session.received == ((512, 1024),)
+    assert session.offset == 0 and not session.complete
+
+    session = await _put(tmp_path, session, 0, 300)
+    assert session.offset == 300
+    # Retried range overlapping both neighbours
+    session = await _put(tmp_path, session, 200, 600)
+    assert session.received == ((0, 1024),) and session.complete
+
+    path, size, sha256 = assemble_session(tmp_path, session)
+    assert path.read_bytes() == DATA
+    assert size == len(DATA)
+    assert sha256 == hashlib.sha256(DATA).hexdigest()
+
+
+async def test_assemble_incomplete_session_fails(tmp_path):
+    session = create_session(tmp_path, None, len(DATA))
+    session = await _put(tmp_path, session, 0, 100)
+    with pytest.raises(UploadSessionError, match="100 of 1024"):
+        assemble_session(tmp_path, session)
+
+
+@pytest.mark.parametrize("body", [DATA[:99], DATA[:101]])
+async def test_write_chunk_rejects_body_of_wrong_length(tmp_path, body):
+    session = create_session(tmp_path, None, len(DATA))
+    with pytest.raises(UploadSessionError):
+        await write_chunk(tmp_path, session, 0, 100, _body(body[:50], body[50:]))
+    assert load_session(tmp_path, session.id).received == ()
+    assert [p.name for p in (tmp_path / ".sessions" / session.id).iterdir()] == ["session.json"]